@@ -8,6 +8,7 @@ import asyncio
 from app.core.config import settings
 from app.db.base import Base
 from app.models import User, Project, Status, Task
+from app.db.search import SQLITE_FTS_TABLE
 
 config = context.config
 # Escape % characters for ConfigParser
@@ -19,11 +20,18 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+def include_object(obj, name, type_, reflected, compare_to):
+    # The SQLite FTS5 search table and its shadow tables are managed by raw DDL, not the models
+    if type_ == "table" and reflected and name.startswith(SQLITE_FTS_TABLE):
+        return False
+    return True
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -32,7 +40,7 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,41 @@
+"""Project task counters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('task_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('done_task_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill the counters for existing projects
+    op.execute("""
+        UPDATE projects SET
+            task_count = (
+                SELECT COUNT(*) FROM tasks
+                WHERE tasks.project_id = projects.id AND tasks.deleted_at IS NULL
+            ),
+            done_task_count = (
+                SELECT COUNT(*) FROM tasks
+                JOIN statuses ON statuses.id = tasks.status_id
+                WHERE tasks.project_id = projects.id
+                  AND tasks.deleted_at IS NULL
+                  AND statuses.name = 'Done'
+            )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'done_task_count')
+    op.drop_column('projects', 'task_count')
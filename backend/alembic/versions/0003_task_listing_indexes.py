@@ -0,0 +1,35 @@
+"""Task listing indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_project_status', 'tasks', ['project_id', 'status_id'], unique=False)
+    op.create_index('ix_tasks_project_assignee', 'tasks', ['project_id', 'assigned_to'], unique=False)
+    # Live tasks only, in keyset order, for cursor pagination of a project's tasks
+    op.create_index(
+        'ix_tasks_project_live',
+        'tasks',
+        ['project_id', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+        sqlite_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_project_live', table_name='tasks')
+    op.drop_index('ix_tasks_project_assignee', table_name='tasks')
+    op.drop_index('ix_tasks_project_status', table_name='tasks')
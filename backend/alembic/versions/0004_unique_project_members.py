@@ -0,0 +1,32 @@
+"""Unique project membership
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Drop duplicate memberships, keeping the oldest row for each (project, user)
+    op.execute("""
+        DELETE FROM project_members
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM project_members GROUP BY project_id, user_id
+        )
+    """)
+    with op.batch_alter_table('project_members') as batch_op:
+        batch_op.create_unique_constraint('uq_project_members_project_user', ['project_id', 'user_id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_members') as batch_op:
+        batch_op.drop_constraint('uq_project_members_project_user', type_='unique')
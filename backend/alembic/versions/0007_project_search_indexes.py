@@ -0,0 +1,37 @@
+"""Project search indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # Trigram GIN indexes let ILIKE '%term%' use an index
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_projects_title_trgm', 'projects', ['title'],
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+        )
+        op.create_index(
+            'ix_projects_technology_stack_trgm', 'projects', ['technology_stack'],
+            postgresql_using='gin', postgresql_ops={'technology_stack': 'gin_trgm_ops'},
+        )
+    else:
+        op.create_index('ix_projects_title_trgm', 'projects', ['title'])
+        op.create_index('ix_projects_technology_stack_trgm', 'projects', ['technology_stack'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_technology_stack_trgm', table_name='projects')
+    op.drop_index('ix_projects_title_trgm', table_name='projects')
@@ -0,0 +1,73 @@
+"""Fractional ranks for statuses and tasks
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from itertools import groupby
+from uuid import uuid4
+from alembic import op
+import sqlalchemy as sa
+from app.core.ranking import spread_ranks
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Byte-wise comparison on PostgreSQL, matching app.db.dialect.RankString
+RANK_TYPE = sa.String().with_variant(sa.String(collation='C'), 'postgresql')
+
+
+def _backfill_ranks(table: str, scope: str) -> None:
+    """Give each list evenly spaced ranks in id order (the old UUID positions carried no order)"""
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(f"SELECT id, {scope} FROM {table} ORDER BY {scope}, id")).all()
+    params = []
+    for _, group in groupby(rows, key=lambda row: row[1]):
+        ids = [row[0] for row in group]
+        params.extend({"id": row_id, "rank": rank} for row_id, rank in zip(ids, spread_ranks(len(ids))))
+    if params:
+        conn.execute(sa.text(f"UPDATE {table} SET rank = :rank WHERE id = :id"), params)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('statuses') as batch_op:
+        batch_op.add_column(sa.Column('rank', RANK_TYPE, nullable=True))
+    _backfill_ranks('statuses', 'project_id')
+    with op.batch_alter_table('statuses') as batch_op:
+        batch_op.alter_column('rank', existing_type=RANK_TYPE, nullable=False)
+        batch_op.drop_column('position')
+    op.create_index('ix_statuses_project_rank', 'statuses', ['project_id', 'rank'], unique=False)
+
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.add_column(sa.Column('rank', RANK_TYPE, nullable=True))
+    _backfill_ranks('tasks', 'status_id')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('rank', existing_type=RANK_TYPE, nullable=False)
+    op.create_index('ix_tasks_status_rank', 'tasks', ['status_id', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_rank', table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('rank')
+
+    op.drop_index('ix_statuses_project_rank', table_name='statuses')
+    with op.batch_alter_table('statuses') as batch_op:
+        batch_op.add_column(sa.Column('position', sa.Uuid(), nullable=True))
+    conn = op.get_bind()
+    ids = conn.execute(sa.text("SELECT id FROM statuses")).scalars().all()
+    statuses = sa.table('statuses', sa.column('id', sa.Integer()), sa.column('position', sa.Uuid()))
+    if ids:
+        conn.execute(
+            sa.update(statuses)
+            .where(statuses.c.id == sa.bindparam('status_id'))
+            .values(position=sa.bindparam('new_position')),
+            [{"status_id": status_id, "new_position": uuid4()} for status_id in ids]
+        )
+    with op.batch_alter_table('statuses') as batch_op:
+        batch_op.alter_column('position', existing_type=sa.Uuid(), nullable=False)
+        batch_op.drop_column('rank')
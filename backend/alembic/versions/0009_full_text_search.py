@@ -0,0 +1,42 @@
+"""Full-text search indexes
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 09:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.db.search import (
+    TASK_SEARCH_DOCUMENT, COMMENT_SEARCH_DOCUMENT,
+    SQLITE_SEARCH_DDL, SQLITE_SEARCH_BACKFILL, SQLITE_SEARCH_DROP,
+)
+
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index(
+            'ix_tasks_search', 'tasks', [sa.text(f'({TASK_SEARCH_DOCUMENT})')], postgresql_using='gin'
+        )
+        op.create_index(
+            'ix_task_comments_search', 'task_comments', [sa.text(f'({COMMENT_SEARCH_DOCUMENT})')],
+            postgresql_using='gin'
+        )
+    elif op.get_bind().dialect.name == 'sqlite':
+        for statement in SQLITE_SEARCH_DDL + SQLITE_SEARCH_BACKFILL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_task_comments_search', table_name='task_comments')
+        op.drop_index('ix_tasks_search', table_name='tasks')
+    elif op.get_bind().dialect.name == 'sqlite':
+        for statement in SQLITE_SEARCH_DROP:
+            op.execute(statement)
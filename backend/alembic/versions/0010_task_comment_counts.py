@@ -0,0 +1,42 @@
+"""Task comment counts and newest-first comment index
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 09:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.db.search import SQLITE_SEARCH_DDL
+
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE tasks SET comment_count = (
+            SELECT COUNT(*) FROM task_comments WHERE task_comments.task_id = tasks.id
+        )
+    """)
+    op.create_index(
+        'ix_task_comments_task_created',
+        'task_comments',
+        ['task_id', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_comments_task_created', table_name='task_comments')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('comment_count')
+    if op.get_bind().dialect.name == 'sqlite':
+        # Recreating the table in batch mode drops its search triggers
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
@@ -0,0 +1,130 @@
+"""Live-row partial indexes and archive tables for soft-deleted rows
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# Byte-wise comparison on PostgreSQL, matching app.db.dialect.RankString
+RANK_TYPE = sa.String().with_variant(sa.String(collation='C'), 'postgresql')
+LIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+def _timestamps() -> list:
+    return [
+        sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=False),
+        sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), autoincrement=False, nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    # Partial indexes: the hot queries only ever read live rows, and the archiver only deleted ones
+    op.create_index('ix_tasks_board_live', 'tasks', ['project_id', 'status_id', 'rank'], unique=False,
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.create_index('ix_tasks_deleted_at', 'tasks', ['deleted_at'], unique=False,
+                    postgresql_where=DELETED, sqlite_where=DELETED)
+    op.create_index('ix_projects_owner_live', 'projects', ['owner_id'], unique=False,
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.create_index('ix_projects_deleted_at', 'projects', ['deleted_at'], unique=False,
+                    postgresql_where=DELETED, sqlite_where=DELETED)
+
+    # Archive tables mirror their source columns, without foreign keys
+    op.create_table('projects_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(), autoincrement=False, nullable=False),
+    sa.Column('description', sa.String(), autoincrement=False, nullable=True),
+    sa.Column('start_date', sa.Date(), autoincrement=False, nullable=True),
+    sa.Column('end_date', sa.Date(), autoincrement=False, nullable=True),
+    sa.Column('technology_stack', sa.Text(), autoincrement=False, nullable=True),
+    sa.Column('team_size', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('task_count', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('done_task_count', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('owner_id', sa.Integer(), autoincrement=False, nullable=False),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_projects_archive_owner_id', 'projects_archive', ['owner_id'], unique=False)
+    op.create_table('statuses_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(), autoincrement=False, nullable=False),
+    sa.Column('rank', RANK_TYPE, autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_statuses_archive_project_id', 'statuses_archive', ['project_id'], unique=False)
+    op.create_table('project_members_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('role', sa.String(), autoincrement=False, nullable=True),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_project_members_archive_project_id', 'project_members_archive', ['project_id'], unique=False)
+    op.create_table('access_requests_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('requester_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('approver_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('request_type', sa.String(), autoincrement=False, nullable=True),
+    sa.Column('reason', sa.Text(), autoincrement=False, nullable=True),
+    sa.Column('status', sa.String(), autoincrement=False, nullable=True),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_access_requests_archive_project_id', 'access_requests_archive', ['project_id'], unique=False)
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(), autoincrement=False, nullable=False),
+    sa.Column('description', sa.String(), autoincrement=False, nullable=True),
+    sa.Column('priority', sa.String(), autoincrement=False, nullable=True),
+    sa.Column('due_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('status_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('rank', RANK_TYPE, autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('assigned_to', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('comment_count', sa.Integer(), autoincrement=False, nullable=False),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_project_id', 'tasks_archive', ['project_id'], unique=False)
+    op.create_table('task_comments_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('comment', sa.Text(), autoincrement=False, nullable=False),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_comments_archive_task_id', 'task_comments_archive', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    for table, column in (
+        ('task_comments_archive', 'task_id'),
+        ('tasks_archive', 'project_id'),
+        ('access_requests_archive', 'project_id'),
+        ('project_members_archive', 'project_id'),
+        ('statuses_archive', 'project_id'),
+        ('projects_archive', 'owner_id'),
+    ):
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
+        op.drop_table(table)
+    op.drop_index('ix_projects_deleted_at', table_name='projects')
+    op.drop_index('ix_projects_owner_live', table_name='projects')
+    op.drop_index('ix_tasks_deleted_at', table_name='tasks')
+    op.drop_index('ix_tasks_board_live', table_name='tasks')
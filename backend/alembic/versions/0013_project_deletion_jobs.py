@@ -0,0 +1,64 @@
+"""Background cascade jobs for project soft-delete
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('project_deletion_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('requested_by', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), server_default='pending', nullable=False),
+    sa.Column('phase', sa.String(), server_default='comments', nullable=False),
+    sa.Column('comments_deleted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('tasks_deleted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('statuses_deleted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('members_deleted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('batches', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('failures', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_project_deletion_jobs_id'), 'project_deletion_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_project_deletion_jobs_project_id'), 'project_deletion_jobs', ['project_id'], unique=False)
+    op.create_index(
+        'ix_project_deletion_jobs_unfinished',
+        'project_deletion_jobs',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('finished_at IS NULL'),
+        sqlite_where=sa.text('finished_at IS NULL'),
+    )
+    # Projects deleted before the cascade existed still have live children; queue them too
+    op.get_bind().execute(
+        sa.text(
+            "INSERT INTO project_deletion_jobs (project_id, requested_by, created_at, updated_at) "
+            "SELECT id, owner_id, :now, :now FROM projects WHERE deleted_at IS NOT NULL ORDER BY id"
+        ),
+        {"now": datetime.utcnow()},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_deletion_jobs_unfinished', table_name='project_deletion_jobs')
+    op.drop_index(op.f('ix_project_deletion_jobs_project_id'), table_name='project_deletion_jobs')
+    op.drop_index(op.f('ix_project_deletion_jobs_id'), table_name='project_deletion_jobs')
+    op.drop_table('project_deletion_jobs')
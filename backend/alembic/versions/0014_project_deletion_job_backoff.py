@@ -0,0 +1,43 @@
+"""Back off and eventually fail project deletion jobs that keep failing
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0014'
+down_revision = '0013'
+branch_labels = None
+depends_on = None
+
+UNFINISHED = sa.text('finished_at IS NULL')
+
+
+def upgrade() -> None:
+    op.add_column('project_deletion_jobs', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.drop_index('ix_project_deletion_jobs_unfinished', table_name='project_deletion_jobs')
+    op.create_index(
+        'ix_project_deletion_jobs_unfinished',
+        'project_deletion_jobs',
+        ['next_attempt_at', 'id'],
+        unique=False,
+        postgresql_where=UNFINISHED,
+        sqlite_where=UNFINISHED,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_deletion_jobs_unfinished', table_name='project_deletion_jobs')
+    op.create_index(
+        'ix_project_deletion_jobs_unfinished',
+        'project_deletion_jobs',
+        ['id'],
+        unique=False,
+        postgresql_where=UNFINISHED,
+        sqlite_where=UNFINISHED,
+    )
+    op.drop_column('project_deletion_jobs', 'next_attempt_at')
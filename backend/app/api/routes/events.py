@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.services import realtime_service
+from app.security.dependencies import get_current_user_for_stream
+from app.models.user import User
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    current_user: User = Depends(get_current_user_for_stream)
+):
+    """Server-sent events: `unread_count` and `task_created` / `task_moved` / `task_deleted` for the user's projects"""
+    return StreamingResponse(
+        realtime_service.event_stream(request, current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
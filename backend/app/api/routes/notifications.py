@@ -1,18 +1,19 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.schemas.notification import NotificationResponse
 from app.crud import notification as notification_crud
 from app.security.dependencies import get_current_user
 from app.models.user import User
+from app.services import realtime_service
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 @router.get("", response_model=List[NotificationResponse])
 async def get_notifications(
     unread_only: bool = False,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user's notifications"""
@@ -20,7 +21,7 @@ async def get_notifications(
 
 @router.get("/unread-count")
 async def get_unread_count(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get count of unread notifications"""
@@ -36,6 +37,7 @@ async def mark_notification_read(
     """Mark a notification as read"""
     await notification_crud.mark_as_read(db, notification_id)
     await db.commit()
+    await realtime_service.publish_unread_counts(db, [current_user.id])
     return {"message": "Notification marked as read"}
 
 @router.post("/mark-all-read")
@@ -46,4 +48,5 @@ async def mark_all_read(
     """Mark all notifications as read"""
     await notification_crud.mark_all_as_read(db, current_user.id)
     await db.commit()
+    await realtime_service.publish_unread_counts(db, [current_user.id])
     return {"message": "All notifications marked as read"}
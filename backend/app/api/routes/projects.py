@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.db.base import get_db
-from app.schemas.project import ProjectCreate, ProjectResponse, AddTeamMembersRequest
-from app.services import project_service
+from typing import List, Optional
+from app.db.base import get_db, get_read_db
+from app.schemas.project import (
+    ProjectCreate, ProjectResponse, AddTeamMembersRequest, ProjectDeletionResponse, ProjectDeletionJobResponse
+)
+from app.schemas.project_transfer import ProjectImportResult
+from app.services import project_service, project_transfer_service
 from app.security.dependencies import get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.etag import set_etag, not_modified
 from app.models.user import User
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
@@ -19,19 +25,53 @@ async def create_project(
 
 @router.get("", response_model=List[ProjectResponse])
 async def get_projects(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     return await project_service.get_user_projects(db, current_user)
 
-@router.delete("/{project_id}")
+@router.post("/import", response_model=ProjectImportResult)
+async def import_project(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create a project owned by the caller from an export body (NDJSON, optionally gzipped), read as a stream"""
+    return await project_transfer_service.import_project(db, request.stream(), current_user)
+
+@router.get("/{project_id}/export")
+async def export_project(
+    project_id: int,
+    compress: bool = Query(False, alias="gzip", description="Gzip the NDJSON on the fly"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the project's statuses, members, tasks and comments as NDJSON"""
+    await project_transfer_service.authorize_export(db, project_id, current_user)
+    filename = f"project-{project_id}.ndjson" + (".gz" if compress else "")
+    return StreamingResponse(
+        project_transfer_service.export_project(project_id, compress),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.delete("/{project_id}", response_model=ProjectDeletionResponse, status_code=202)
 async def delete_project(
     project_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    """Delete the project now and queue its tasks, comments, statuses and members for background deletion"""
     return await project_service.delete_project(db, project_id, current_user)
 
+@router.get("/deletion-jobs/{job_id}", response_model=ProjectDeletionJobResponse)
+async def get_deletion_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await project_service.get_deletion_job(db, job_id, current_user)
+
 @router.post("/{project_id}/members")
 async def add_team_members(
     project_id: int,
@@ -44,17 +84,32 @@ async def add_team_members(
 @router.get("/{project_id}/members")
 async def get_project_members(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all members of a project including the owner"""
-    return await project_service.get_project_members(db, project_id, current_user)
+    """Get all members of a project including the owner; 304 when If-None-Match holds the current ETag"""
+    members, etag = await project_service.get_project_members(
+        db, project_id, current_user, request.headers.get("If-None-Match")
+    )
+    if members is None:
+        return not_modified(etag)
+    set_etag(response, etag)
+    return members
 
 
 @router.get("/available")
 async def get_available_projects(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    q: Optional[str] = Query(None, description="Substring to match in the title or technology stack"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all projects that the user is NOT a member of"""
-    return await project_service.get_available_projects(db, current_user)
+    """Get projects that the user is NOT a member of, a page at a time"""
+    projects, next_cursor = await project_service.get_available_projects(db, current_user, q, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return projects
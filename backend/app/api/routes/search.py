@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.base import get_read_db
+from app.schemas.search import SearchResult
+from app.services import search_service
+from app.security.dependencies import get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.user import User
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("", response_model=List[SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[int] = Query(None, description="Limit to one project; defaults to all accessible projects"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Full-text search over task titles, descriptions and comments, best matches first"""
+    results, next_cursor = await search_service.search(db, current_user, q, project_id, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return results
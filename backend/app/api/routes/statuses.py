@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.base import get_db
-from app.schemas.status import StatusCreate, StatusUpdate, StatusResponse
+from app.db.base import get_db, get_read_db
+from app.schemas.status import StatusCreate, StatusUpdate, StatusMove, StatusResponse
 from app.services import status_service
 from app.security.dependencies import get_current_user
+from app.core.etag import set_etag, not_modified
 from app.models.user import User
 
 router = APIRouter(prefix="/statuses", tags=["Statuses"])
@@ -12,10 +13,11 @@ router = APIRouter(prefix="/statuses", tags=["Statuses"])
 @router.post("", response_model=StatusResponse)
 async def create_status(
     status: StatusCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await status_service.create_status(db, status, current_user)
+    return await status_service.create_status(db, status, current_user, background_tasks)
 
 @router.patch("/{status_id}", response_model=StatusResponse)
 async def update_status(
@@ -26,10 +28,30 @@ async def update_status(
 ):
     return await status_service.update_status(db, status_id, status_update, current_user)
 
+@router.patch("/{status_id}/move", response_model=StatusResponse)
+async def move_status(
+    status_id: int,
+    status_move: StatusMove,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Place a column after `after_status_id` and/or before `before_status_id`"""
+    return await status_service.move_status(db, status_id, status_move, current_user, background_tasks)
+
 @router.get("/project/{project_id}", response_model=List[StatusResponse])
 async def get_project_statuses(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await status_service.get_project_statuses(db, project_id, current_user)
+    """Project columns in rank order; answers 304 when If-None-Match holds the current ETag"""
+    statuses, etag = await status_service.get_project_statuses(
+        db, project_id, current_user, request.headers.get("If-None-Match")
+    )
+    if statuses is None:
+        return not_modified(etag)
+    set_etag(response, etag)
+    return statuses
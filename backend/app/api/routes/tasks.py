@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.base import get_db
-from app.schemas.task import TaskCreate, TaskResponse, TaskMove
+from app.db.base import get_db, get_read_db
+from app.schemas.task import TaskCreate, TaskResponse, TaskMove, TaskBatchRequest, TaskBatchResponse
 from app.schemas.task_comment import TaskCommentCreate, TaskCommentResponse
 from app.services import task_service
 from app.crud import task_comment as task_comment_crud
 from app.security.dependencies import get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.etag import set_etag, not_modified
 from app.models.user import User
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
@@ -14,19 +16,21 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
 @router.post("", response_model=TaskResponse)
 async def create_task(
     task: TaskCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await task_service.create_task(db, task, current_user)
+    return await task_service.create_task(db, task, current_user, background_tasks)
 
 @router.patch("/{task_id}/move", response_model=TaskResponse)
 async def move_task(
     task_id: int,
     task_move: TaskMove,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await task_service.move_task(db, task_id, task_move, current_user)
+    return await task_service.move_task(db, task_id, task_move, current_user, background_tasks)
 
 @router.delete("/{task_id}")
 async def delete_task(
@@ -36,28 +40,53 @@ async def delete_task(
 ):
     return await task_service.delete_task(db, task_id, current_user)
 
+@router.post("/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create, update, move and delete many tasks in one transaction with per-item results"""
+    return await task_service.batch_tasks(db, batch, current_user, background_tasks)
+
 @router.get("/project/{project_id}", response_model=List[TaskResponse])
 async def get_project_tasks(
     project_id: int,
+    response: Response,
     status_id: Optional[int] = Query(None),
     priority: Optional[str] = Query(None),
     assigned_to: Optional[int] = Query(None),
-    limit: int = Query(100),
-    offset: int = Query(0),
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await task_service.get_project_tasks(
-        db, project_id, current_user, status_id, priority, assigned_to, limit, offset
+    """List tasks ordered by id; pass X-Next-Cursor back as `cursor` for stable keyset paging"""
+    tasks, next_cursor = await task_service.get_project_tasks(
+        db, project_id, current_user, status_id, priority, assigned_to, limit, offset, cursor
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return tasks
 
 @router.get("/board/{project_id}")
 async def get_kanban_board(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await task_service.get_kanban_board(db, project_id, current_user)
+    """Board columns with their tasks; answers 304 when If-None-Match holds the current ETag"""
+    board, etag = await task_service.get_kanban_board(
+        db, project_id, current_user, request.headers.get("If-None-Match")
+    )
+    if board is None:
+        return not_modified(etag)
+    set_etag(response, etag)
+    return board
 
 @router.post("/{task_id}/comments", response_model=TaskCommentResponse)
 async def add_task_comment(
@@ -81,10 +110,17 @@ async def add_task_comment(
     )
     return comment_response
 
-@router.get("/{task_id}/comments")
+@router.get("/{task_id}/comments", response_model=List[TaskCommentResponse])
 async def get_task_comments(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await task_comment_crud.get_task_comments(db, task_id)
+    """Newest comments first; pass X-Next-Cursor back as `cursor` for older ones"""
+    comments, next_cursor = await task_service.get_task_comments(db, task_id, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return comments
@@ -0,0 +1,30 @@
+"""Move soft-deleted rows past the retention period into the *_archive tables now.
+
+The API runs the same archiver in the background every ARCHIVE_INTERVAL_SECONDS; this
+runs one pass on demand, e.g. after a large cleanup or with a shorter retention.
+
+Usage:
+    python -m app.cli.archive_deleted
+    python -m app.cli.archive_deleted --retention-days 7 --batch-size 1000
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal, dispose_engines
+from app.services.archive_worker import ArchiveWorker
+
+async def main(retention_days: int, batch_size: int):
+    worker = ArchiveWorker(
+        AsyncSessionLocal, timedelta(days=retention_days), batch_size, settings.ARCHIVE_INTERVAL_SECONDS
+    )
+    moved = await worker.run_once()
+    await dispose_engines()
+    print(f"Archived {moved['projects']} projects, {moved['tasks']} tasks and {moved['comments']} comments")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive soft-deleted rows past the retention period")
+    parser.add_argument("--retention-days", type=int, default=settings.ARCHIVE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.retention_days, args.batch_size))
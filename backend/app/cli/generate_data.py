@@ -0,0 +1,309 @@
+"""Generate large synthetic datasets for scale testing.
+
+Rows are generated a block of projects at a time and written with Core bulk inserts, or
+COPY on PostgreSQL (asyncpg), so millions of rows need neither the ORM nor much memory.
+The same seed and options produce the same rows. Ids continue after the highest existing
+ones, so runs can be stacked on a database that already has data.
+
+Distributions are given as fixed:N, uniform:MIN,MAX, poisson:MEAN or lognormal:MEDIAN,SIGMA.
+
+Usage:
+    python -m app.cli.generate_data --users 100000 --projects 20000 --seed 7
+    python -m app.cli.generate_data --projects 5000 --tasks-per-project lognormal:120,1.0 \\
+        --comments-per-task poisson:3 --assignee-skew 1.2
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Optional
+from sqlalchemy import insert, select, func, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.ranking import spread_ranks
+from app.crud.status import DONE_STATUS_NAME
+from app.db.base import get_engine, dispose_engines
+from app.models import User, Project, ProjectMember, Status, Task, TaskComment, Notification, NotificationCounter
+from app.security.auth import get_password_hash
+
+STATUS_NAMES = ("Todo", "In Progress", DONE_STATUS_NAME)
+PRIORITIES = ("low", "medium", "high")
+TECHNOLOGIES = ("React", "FastAPI", "Django", "Vue", "Go", "Rust", "Kotlin", "Flutter")
+
+# Parents before children, so every flush satisfies the foreign keys
+TABLE_ORDER = (User, NotificationCounter, Notification, Project, ProjectMember, Status, Task, TaskComment)
+
+class Distribution:
+    """Non-negative integer distribution parsed from a spec such as poisson:3"""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        try:
+            values = [float(value) for value in params.split(",")] if params else []
+        except ValueError:
+            raise ValueError(f"Invalid distribution parameters in {spec!r}")
+        arity = {"fixed": 1, "uniform": 2, "poisson": 1, "lognormal": 2}
+        if kind not in arity or len(values) != arity[kind] or any(value < 0 for value in values):
+            raise ValueError(f"Invalid distribution {spec!r}; use fixed:N, uniform:MIN,MAX, poisson:MEAN or lognormal:MEDIAN,SIGMA")
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng: random.Random) -> int:
+        if self.kind == "fixed":
+            return int(self.values[0])
+        if self.kind == "uniform":
+            return rng.randint(int(self.values[0]), int(self.values[1]))
+        if self.kind == "lognormal":
+            median, sigma = self.values
+            return int(round(median * math.exp(rng.gauss(0.0, sigma)))) if median else 0
+        mean = self.values[0]
+        if mean > 50:
+            # Normal approximation; Knuth's method below is linear in the mean
+            return max(0, int(round(rng.gauss(mean, math.sqrt(mean)))))
+        threshold, count, product = math.exp(-mean), 0, rng.random()
+        while product > threshold:
+            count += 1
+            product *= rng.random()
+        return count
+
+    def __str__(self):
+        return self.spec
+
+@dataclass
+class GeneratorConfig:
+    users: int = 1000
+    projects: int = 200
+    members_per_project: Distribution = field(default_factory=lambda: Distribution("uniform:3,12"))
+    tasks_per_project: Distribution = field(default_factory=lambda: Distribution("lognormal:100,0.8"))
+    comments_per_task: Distribution = field(default_factory=lambda: Distribution("poisson:2"))
+    notifications_per_user: Distribution = field(default_factory=lambda: Distribution("poisson:20"))
+    unassigned_ratio: float = 0.2
+    assignee_skew: float = 1.0  # Zipf exponent over a project's members; 0 spreads tasks evenly
+    read_ratio: float = 0.6
+    password: str = "password123"
+    email_domain: str = "example.test"
+    as_of: datetime = datetime(2026, 1, 1)  # fixed, so timestamps are reproducible too
+    seed: int = 1
+    chunk_size: int = 10000
+
+class _Writer:
+    """Buffers rows per table and writes them in foreign-key order, by COPY where available"""
+
+    def __init__(self, conn, chunk_size: int):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg"
+        self.buffers = {model: [] for model in TABLE_ORDER}
+        self.counts = {model.__tablename__: 0 for model in TABLE_ORDER}
+
+    def add(self, model, row: dict):
+        self.buffers[model].append(row)
+
+    def full(self) -> bool:
+        return any(len(rows) >= self.chunk_size for rows in self.buffers.values())
+
+    async def flush(self):
+        for model in TABLE_ORDER:
+            rows = self.buffers[model]
+            if not rows:
+                continue
+            table = model.__table__
+            if self.use_copy:
+                columns = list(rows[0])
+                raw = await self.conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    table.name, records=[tuple(row[column] for column in columns) for row in rows], columns=columns
+                )
+            else:
+                await self.conn.execute(insert(table), rows)
+            self.counts[table.name] += len(rows)
+            self.buffers[model] = []
+        # One transaction per flush keeps locks and WAL bounded; an interrupted run keeps what it wrote
+        await self.conn.commit()
+
+class DataGenerator:
+    def __init__(self, conn, config: GeneratorConfig):
+        self.conn = conn
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.writer = _Writer(conn, config.chunk_size)
+        self._skew_weights = {}
+
+    async def _next_ids(self) -> dict:
+        next_ids = {}
+        for model in TABLE_ORDER:
+            if model is NotificationCounter:
+                continue
+            next_ids[model] = (await self.conn.scalar(select(func.coalesce(func.max(model.id), 0)))) + 1
+        return next_ids
+
+    def _pick_weighted(self, members: list[int]) -> int:
+        # First-listed members get the most work: weight 1 / rank ** skew
+        weights = self._skew_weights.get(len(members))
+        if weights is None:
+            weights = self._skew_weights[len(members)] = list(accumulate(
+                1 / (rank ** self.config.assignee_skew) for rank in range(1, len(members) + 1)
+            ))
+        return self.rng.choices(members, cum_weights=weights)[0]
+
+    def _timestamp(self, max_days_ago: int) -> datetime:
+        return self.config.as_of - timedelta(seconds=self.rng.randint(0, max_days_ago * 86400))
+
+    def _later(self, start: datetime, min_seconds: int, max_seconds: int) -> datetime:
+        # Somewhere in [start + min_seconds, start + max_seconds], but never after as_of
+        room = max(0, int((self.config.as_of - start).total_seconds()))
+        high = min(max_seconds, room)
+        return start + timedelta(seconds=self.rng.randint(min(min_seconds, high), high))
+
+    async def run(self, progress=print) -> dict:
+        config, rng, writer = self.config, self.rng, self.writer
+        ids = await self._next_ids()
+        first_user = ids[User]
+        last_user = first_user + config.users - 1
+        first_project = ids[Project]
+        last_project = first_project + config.projects - 1
+        password_hash = get_password_hash(config.password)
+
+        for user_id in range(first_user, last_user + 1):
+            created_at = self._timestamp(365)
+            writer.add(User, {
+                "id": user_id, "name": f"User {user_id}", "email": f"user{user_id}@{config.email_domain}",
+                "hashed_password": password_hash, "role": "user", "can_create_projects": True,
+                "created_at": created_at, "updated_at": created_at
+            })
+            unread = 0
+            for _ in range(config.notifications_per_user.sample(rng)):
+                is_read = rng.random() < config.read_ratio
+                unread += not is_read
+                notified_at = self._timestamp(90)
+                related_id = rng.randint(first_project, last_project) if config.projects else None
+                writer.add(Notification, {
+                    "id": ids[Notification], "user_id": user_id, "message": f"You have been added to project 'Project {related_id}'",
+                    "type": "project_assigned", "is_read": is_read, "related_id": related_id,
+                    "created_at": notified_at, "updated_at": notified_at
+                })
+                ids[Notification] += 1
+            writer.add(NotificationCounter, {"user_id": user_id, "unread_count": unread})
+            if writer.full():
+                await writer.flush()
+                progress(f"users: {user_id - first_user + 1}/{config.users}")
+
+        for project_id in range(first_project, last_project + 1):
+            self._add_project(project_id, first_user, last_user, ids)
+            if writer.full():
+                await writer.flush()
+                progress(f"projects: {project_id - first_project + 1}/{config.projects}")
+
+        await writer.flush()
+        if self.conn.dialect.name == "postgresql":
+            await self._reset_sequences()
+        return writer.counts
+
+    def _add_project(self, project_id: int, first_user: int, last_user: int, ids: dict):
+        config, rng, writer = self.config, self.rng, self.writer
+        created_at = self._timestamp(365)
+        owner_id = rng.randint(first_user, last_user)
+        size = min(max(config.members_per_project.sample(rng), 1), config.users)
+        others = [user_id for user_id in rng.sample(range(first_user, last_user + 1), size) if user_id != owner_id]
+        members = [owner_id] + others[:size - 1]
+
+        for user_id in members:
+            writer.add(ProjectMember, {
+                "id": ids[ProjectMember], "project_id": project_id, "user_id": user_id,
+                "role": "leader" if user_id == owner_id else "member", "created_at": created_at, "updated_at": created_at
+            })
+            ids[ProjectMember] += 1
+
+        status_ids = []
+        for name, rank in zip(STATUS_NAMES, spread_ranks(len(STATUS_NAMES))):
+            status_ids.append(ids[Status])
+            writer.add(Status, {
+                "id": ids[Status], "project_id": project_id, "name": name, "rank": rank,
+                "created_at": created_at, "updated_at": created_at
+            })
+            ids[Status] += 1
+
+        task_count = config.tasks_per_project.sample(rng)
+        task_statuses = [rng.choice(status_ids) for _ in range(task_count)]
+        column_ranks = {
+            status_id: iter(spread_ranks(task_statuses.count(status_id))) for status_id in status_ids
+        }
+        for task_status in task_statuses:
+            task_id = ids[Task]
+            ids[Task] += 1
+            task_created = self._later(created_at, 0, 180 * 86400)
+            comment_count = config.comments_per_task.sample(rng)
+            writer.add(Task, {
+                "id": task_id, "title": f"Task {task_id}", "description": f"Synthetic task {task_id} in project {project_id}",
+                "priority": rng.choice(PRIORITIES),
+                "due_date": task_created + timedelta(days=rng.randint(1, 60)) if rng.random() < 0.5 else None,
+                "status_id": task_status, "rank": next(column_ranks[task_status]), "project_id": project_id,
+                "assigned_to": None if rng.random() < config.unassigned_ratio else self._pick_weighted(members),
+                "comment_count": comment_count, "created_at": task_created, "updated_at": task_created
+            })
+            for _ in range(comment_count):
+                commented_at = self._later(task_created, 60, 30 * 86400)
+                writer.add(TaskComment, {
+                    "id": ids[TaskComment], "task_id": task_id, "user_id": self._pick_weighted(members),
+                    "comment": f"Comment {ids[TaskComment]} on task {task_id}",
+                    "created_at": commented_at, "updated_at": commented_at
+                })
+                ids[TaskComment] += 1
+
+        writer.add(Project, {
+            "id": project_id, "title": f"Project {project_id}", "description": f"Synthetic project {project_id}",
+            "technology_stack": rng.choice(TECHNOLOGIES), "team_size": len(members), "owner_id": owner_id,
+            "task_count": task_count, "done_task_count": task_statuses.count(status_ids[-1]),
+            "created_at": created_at, "updated_at": created_at
+        })
+
+    async def _reset_sequences(self):
+        # Ids were assigned here, so serial sequences must catch up before the app inserts
+        for model in TABLE_ORDER:
+            if model is NotificationCounter:
+                continue
+            name = model.__tablename__
+            await self.conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), coalesce(max(id), 0) + 1, false) FROM {name}"
+            ))
+        await self.conn.commit()
+
+async def generate(config: GeneratorConfig, engine: Optional[AsyncEngine] = None, progress=print) -> dict:
+    """Write a synthetic dataset into an already migrated database (default: the app's); returns rows written per table"""
+    async with (engine or get_engine()).connect() as conn:
+        return await DataGenerator(conn, config).run(progress)
+
+async def main(config: GeneratorConfig):
+    started = time.perf_counter()
+    counts = await generate(config)
+    await dispose_engines()
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    for table, count in counts.items():
+        print(f"{table:<24}{count:>12}")
+    print(f"{total} rows in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} rows/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-generate synthetic data for scale testing")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--members-per-project", type=Distribution, default="uniform:3,12")
+    parser.add_argument("--tasks-per-project", type=Distribution, default="lognormal:100,0.8")
+    parser.add_argument("--comments-per-task", type=Distribution, default="poisson:2")
+    parser.add_argument("--notifications-per-user", type=Distribution, default="poisson:20")
+    parser.add_argument("--unassigned-ratio", type=float, default=0.2, help="Share of tasks with no assignee")
+    parser.add_argument("--assignee-skew", type=float, default=1.0, help="Zipf exponent for assignees and commenters; 0 is uniform")
+    parser.add_argument("--read-ratio", type=float, default=0.6, help="Share of notifications already read")
+    parser.add_argument("--password", default="password123", help="Password shared by every generated user")
+    parser.add_argument("--email-domain", default="example.test")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=datetime(2026, 1, 1), help="Latest generated created_at/updated_at (due dates may fall after it)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows buffered per table before a flush")
+    args = parser.parse_args()
+    if args.users < 1 and args.projects:
+        parser.error("Projects need at least one user")
+    asyncio.run(main(GeneratorConfig(**vars(args))))
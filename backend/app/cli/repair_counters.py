@@ -0,0 +1,53 @@
+"""Recompute denormalized counters from their source tables.
+
+Usage:
+    python -m app.cli.repair_counters              # everything
+    python -m app.cli.repair_counters notifications
+    python -m app.cli.repair_counters projects
+    python -m app.cli.repair_counters comments
+"""
+import argparse
+import asyncio
+from sqlalchemy import select
+from app.db.base import AsyncSessionLocal
+from app.crud import notification as notification_crud, project as project_crud, task_comment as task_comment_crud
+from app.models.project import Project
+
+async def repair_notification_counters():
+    async with AsyncSessionLocal() as db:
+        await notification_crud.recompute_unread_counters(db)
+        await db.commit()
+    print("Unread notification counters recomputed")
+
+async def repair_project_counters():
+    async with AsyncSessionLocal() as db:
+        project_ids = (await db.execute(select(Project.id))).scalars().all()
+    # One short transaction per project keeps locks brief on large installs
+    for project_id in project_ids:
+        async with AsyncSessionLocal() as db:
+            await project_crud.recalculate_task_counters(db, project_id)
+            await db.commit()
+    print(f"Task counters recomputed for {len(project_ids)} projects")
+
+async def repair_comment_counters():
+    async with AsyncSessionLocal() as db:
+        await task_comment_crud.recalculate_comment_counts(db)
+        await db.commit()
+    print("Task comment counters recomputed")
+
+async def main(targets: list[str]):
+    if "notifications" in targets:
+        await repair_notification_counters()
+    if "projects" in targets:
+        await repair_project_counters()
+    if "comments" in targets:
+        await repair_comment_counters()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute denormalized counters")
+    parser.add_argument(
+        "targets", nargs="*", choices=["notifications", "projects", "comments"],
+        help="Counters to repair (default: all)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.targets or ["notifications", "projects", "comments"]))
@@ -1,10 +1,62 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    READ_DATABASE_URL: Optional[str] = None  # replica for read-heavy GET routes; defaults to DATABASE_URL
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    LOG_LEVEL: str = "INFO"
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 2  # connections opened at startup (capped at DB_POOL_SIZE); 0 disables
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection; 0 behind pgbouncer
+    RANK_REBALANCE_LENGTH: int = 24  # re-space a column once a placed rank gets this long
+    REQUEST_QUERY_BUDGET: int = 20  # requests issuing more queries are logged and counted; 0 disables
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # 0 disables the authenticated-user cache
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    PROJECT_ACCESS_TTL_SECONDS: int = 60  # 0 disables the project-access index cache
+    PROJECT_ACCESS_MAX_USERS: int = 10000
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 500
+    NOTIFICATION_OUTBOX_FLUSH_INTERVAL_SECONDS: float = 1.0
+    PROJECT_DELETION_BATCH_SIZE: int = 500  # children soft-deleted per transaction when a project is deleted
+    PROJECT_DELETION_POLL_INTERVAL_SECONDS: float = 5.0  # how often workers look for jobs queued elsewhere
+    PROJECT_DELETION_RETRY_BACKOFF_SECONDS: float = 30.0  # delay after a failed batch, doubling with each failure
+    PROJECT_DELETION_MAX_FAILURES: int = 5  # a job failing this many times is marked failed and left alone
+    ARCHIVE_ENABLED: bool = True
+    ARCHIVE_RETENTION_DAYS: int = 30  # soft-deleted rows older than this move to the *_archive tables
+    ARCHIVE_BATCH_SIZE: int = 500  # tasks (with their comments) moved per transaction
+    ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    EVENT_BROKER: str = "memory"  # memory (single worker), postgres (LISTEN/NOTIFY) or redis (pub/sub across workers)
+    EVENT_BROKER_URL: Optional[str] = None  # defaults to DATABASE_URL for the postgres broker; required for redis
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    EVENT_STREAM_QUEUE_SIZE: int = 100
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # hashes below this cost are upgraded on the next login
+    PASSWORD_HASH_EXECUTOR: str = "process"  # process or thread
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    EXPORT_YIELD_PER: int = 1000  # rows fetched per round trip from the export's server-side cursors
+    IMPORT_CHUNK_SIZE: int = 1000  # tasks per bulk insert when importing a project
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE: str = "memory"  # memory (per worker) or redis (shared by all workers; needs the redis package)
+    RATE_LIMIT_STORAGE_URL: Optional[str] = None  # e.g. redis://localhost:6379/0; any Redis-compatible server works
+    RATE_LIMIT_LEASE_FRACTION: float = 0.1  # share of a shared bucket a worker takes at once and spends locally
+    RATE_LIMIT_DEFAULT: str = "600/minute"  # per user (or client address) across routes without their own limit
+    # Per-route limits by "METHOD /route/template"; each route gets its own bucket per user or address
+    RATE_LIMITS: dict[str, str] = {
+        "GET /": "10/minute",
+        "POST /auth/login": "20/minute",
+        "POST /auth/register": "10/minute",
+        "POST /tasks/batch": "60/minute",
+        "GET /search": "120/minute",
+        "GET /projects/{project_id}/export": "10/minute",
+        "POST /projects/import": "5/minute",
+    }
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,27 @@
+from typing import Optional
+from fastapi import Response, status
+
+# Clients may keep the body but must revalidate it; responses are per user, so no shared caches
+CACHE_CONTROL = "private, no-cache"
+
+def project_etag(resource: str, project_id: int, version: int, user_id: int) -> str:
+    """Strong ETag for a project-scoped response; bodies can embed the caller's role, so it is per user"""
+    return f'"{resource}-{project_id}-{version}-{user_id}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers `etag` (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
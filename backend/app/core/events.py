@@ -0,0 +1,263 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def project_channel(project_id: int) -> str:
+    return f"project:{project_id}"
+
+class Subscription:
+    """A bounded queue of events for one consumer, subscribed to a set of channels"""
+    
+    def __init__(self, broker: "InMemoryEventBroker", channels: Iterable[str], max_queue: int):
+        self._broker = broker
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.channels: set[str] = set()
+        self.dropped = 0
+        self.set_channels(channels)
+    
+    def set_channels(self, channels: Iterable[str]):
+        channels = set(channels)
+        for channel in self.channels - channels:
+            self._broker._unlink(channel, self)
+        for channel in channels - self.channels:
+            self._broker._subscribers.setdefault(channel, set()).add(self)
+        self.channels = channels
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Wait for the next event; returns None if the timeout elapses first"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    def close(self):
+        self.set_channels(())
+    
+    def _offer(self, event: dict):
+        # A slow consumer loses its oldest events rather than blocking publishers
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+class InMemoryEventBroker:
+    """Pub/sub within a single process; suitable when the API runs as one worker"""
+    
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: dict[str, set[Subscription]] = {}
+    
+    async def start(self):
+        pass
+    
+    async def stop(self):
+        pass
+    
+    async def publish(self, channel: str, event: dict):
+        self._dispatch(channel, event)
+    
+    def subscribe(self, channels: Iterable[str]) -> Subscription:
+        return Subscription(self, channels, self.max_queue)
+    
+    def _dispatch(self, channel: str, event: dict):
+        for subscription in list(self._subscribers.get(channel, ())):
+            subscription._offer(event)
+    
+    def _dispatch_message(self, payload):
+        # Cross-process brokers carry {"channel": ..., "event": ...} as JSON
+        try:
+            message = json.loads(payload)
+            self._dispatch(message["channel"], message["event"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed event payload: %r", payload)
+    
+    def _unlink(self, channel: str, subscription: Subscription):
+        subscribers = self._subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[channel]
+
+class PostgresEventBroker(InMemoryEventBroker):
+    """Pub/sub across worker processes over PostgreSQL LISTEN/NOTIFY.
+    
+    Every worker listens on one NOTIFY channel and fans messages out to its local
+    subscribers, so publishing from any worker reaches streams held by all of them.
+    A dropped connection is re-opened in the background with exponential backoff and
+    LISTEN re-issued; events published while it is down are lost, publishes fail fast.
+    """
+    
+    NOTIFY_CHANNEL = "kanban_events"
+    
+    def __init__(
+        self,
+        dsn: str,
+        max_queue: int = 100,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        connect=None
+    ):
+        super().__init__(max_queue)
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self._connect = connect
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+    
+    async def start(self):
+        self._stopping = False
+        await self._open()
+    
+    async def stop(self):
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.remove_listener(self.NOTIFY_CHANNEL, self._on_notify)
+            await connection.close()
+    
+    async def publish(self, channel: str, event: dict):
+        payload = json.dumps({"channel": channel, "event": event}, default=str)
+        # asyncpg connections run one statement at a time
+        async with self._lock:
+            connection = self._connection
+            if connection is None or connection.is_closed():
+                self._connection_lost(connection)
+                raise ConnectionError("Event broker connection is down; reconnecting")
+            try:
+                await connection.execute("SELECT pg_notify($1, $2)", self.NOTIFY_CHANNEL, payload)
+            except Exception:
+                if connection.is_closed():
+                    self._connection_lost(connection)
+                raise
+    
+    async def _open(self):
+        connect = self._connect
+        if connect is None:
+            import asyncpg
+            connect = asyncpg.connect
+        connection = await connect(self.dsn)
+        await connection.add_listener(self.NOTIFY_CHANNEL, self._on_notify)
+        connection.add_termination_listener(self._connection_lost)
+        self._connection = connection
+    
+    def _connection_lost(self, connection):
+        # Called by asyncpg when the connection closes, and by publish when it finds it closed
+        if self._stopping or connection is not self._connection:
+            return
+        if self._reconnect_task is None or self._reconnect_task.done():
+            logger.warning("Event broker connection lost; reconnecting")
+            self._connection = None
+            self._reconnect_task = asyncio.create_task(self._reconnect(), name="event-broker-reconnect")
+    
+    async def _reconnect(self):
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                await self._open()
+            except Exception as e:
+                logger.warning("Event broker reconnect failed (%s); retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            else:
+                self.reconnects += 1
+                logger.info("Event broker reconnected")
+                return
+    
+    def _on_notify(self, connection, pid, notify_channel, payload):
+        self._dispatch_message(payload)
+
+class RedisEventBroker(InMemoryEventBroker):
+    """Pub/sub across worker processes over Redis PUBLISH/SUBSCRIBE.
+    
+    Works like the Postgres broker: one subscription per worker, fanned out locally.
+    The Redis client reconnects and re-subscribes on its own; events published while
+    a worker is disconnected are lost.
+    """
+    
+    PUBSUB_CHANNEL = "kanban_events"
+    
+    def __init__(self, url: str, max_queue: int = 100, retry_delay: float = 1.0, client=None):
+        super().__init__(max_queue)
+        self.url = url
+        self.retry_delay = retry_delay
+        self._client = client
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        if self._client is None:
+            import redis.asyncio
+            self._client = redis.asyncio.from_url(self.url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.PUBSUB_CHANNEL)
+        self._task = asyncio.create_task(self._listen(), name="event-broker-listener")
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def publish(self, channel: str, event: dict):
+        payload = json.dumps({"channel": channel, "event": event}, default=str)
+        await self._client.publish(self.PUBSUB_CHANNEL, payload)
+    
+    async def _listen(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Event broker subscription failed (%s); retrying in %.1fs", e, self.retry_delay)
+                await asyncio.sleep(self.retry_delay)
+                continue
+            if message is not None and message["type"] == "message":
+                self._dispatch_message(message["data"])
+
+_event_broker: InMemoryEventBroker = InMemoryEventBroker()
+
+def get_event_broker() -> InMemoryEventBroker:
+    return _event_broker
+
+def set_event_broker(broker: InMemoryEventBroker):
+    global _event_broker
+    _event_broker = broker
+
+def create_event_broker(settings) -> InMemoryEventBroker:
+    if settings.EVENT_BROKER == "memory":
+        return InMemoryEventBroker(settings.EVENT_STREAM_QUEUE_SIZE)
+    if settings.EVENT_BROKER == "postgres":
+        dsn = settings.EVENT_BROKER_URL or settings.DATABASE_URL.replace("+asyncpg", "")
+        return PostgresEventBroker(dsn, settings.EVENT_STREAM_QUEUE_SIZE)
+    if settings.EVENT_BROKER == "redis":
+        if not settings.EVENT_BROKER_URL:
+            raise ValueError("EVENT_BROKER_URL is required for the redis event broker")
+        return RedisEventBroker(settings.EVENT_BROKER_URL, settings.EVENT_STREAM_QUEUE_SIZE)
+    raise ValueError(f"Unknown EVENT_BROKER: {settings.EVENT_BROKER}")
@@ -0,0 +1,201 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+OVERHEAD_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.025)
+
+class RequestStats:
+    """Database work attributed to the request currently being served"""
+    __slots__ = ("query_count", "db_time")
+    
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_request.get()
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+    
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            # One slot per bucket, then +Inf, sum and count
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[len(self.buckets)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def totals(self, labels: tuple) -> tuple[int, float]:
+        """(count, sum) observed so far for one label set, for in-process readers"""
+        series = self._series.get(labels)
+        return (series[-1], series[-2]) if series is not None else (0, 0.0)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._series.items():
+            base = _format_labels(self.label_names, labels)
+            for i, bound in enumerate(self.buckets):
+                yield f"{self.name}_bucket{_with_le(base, bound)} {series[i]}"
+            yield f"{self.name}_bucket{_with_le(base, '+Inf')} {series[len(self.buckets)]}"
+            yield f"{self.name}_sum{base} {series[-2]}"
+            yield f"{self.name}_count{base} {series[-1]}"
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: dict[tuple, float] = {}
+    
+    def inc(self, labels: tuple, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text exposition format"""
+    
+    def __init__(self):
+        route_labels = ("method", "route")
+        self.request_latency = Histogram(
+            "http_request_duration_seconds", "Request latency by route",
+            route_labels + ("status",), LATENCY_BUCKETS
+        )
+        self.request_db_time = Histogram(
+            "http_request_db_seconds", "Time spent in database queries per request",
+            route_labels, LATENCY_BUCKETS
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries", "Database queries issued per request",
+            route_labels, QUERY_COUNT_BUCKETS
+        )
+        self.query_budget_exceeded = Counter(
+            "http_request_query_budget_exceeded_total", "Requests that issued more queries than the budget",
+            route_labels
+        )
+        self.rate_limit_rejections = Counter(
+            "http_rate_limit_rejections_total", "Requests rejected with 429 by the rate limiter",
+            route_labels + ("scope",)
+        )
+        self.rate_limit_check = Histogram(
+            "rate_limit_check_seconds", "Time spent deciding whether to admit a request", (), OVERHEAD_BUCKETS
+        )
+        self._metrics = [
+            self.request_latency, self.request_db_time, self.request_queries, self.query_budget_exceeded,
+            self.rate_limit_rejections, self.rate_limit_check
+        ]
+        self._gauge_collectors: dict[str, tuple[str, Callable[[], dict]]] = {}
+    
+    def register_gauges(self, prefix: str, help_text: str, collect: Callable[[], dict]):
+        """Expose each numeric value of collect() as a gauge named <prefix>_<key>; re-registering replaces"""
+        self._gauge_collectors[prefix] = (help_text, collect)
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for prefix, (help_text, collect) in self._gauge_collectors.items():
+            try:
+                values = collect()
+            except Exception:
+                logger.exception("Metrics collector %s failed", prefix)
+                continue
+            for key, value in values.items():
+                name = f"{prefix}_{key}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _with_le(base: str, bound) -> str:
+    le = f'le="{bound}"'
+    return "{" + le + "}" if not base else base[:-1] + "," + le + "}"
+
+def instrument_engine(engine):
+    """Attribute every query run on the engine to the current request's stats"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_times"].pop()
+        stats = _current_request.get()
+        if stats is not None:
+            stats.query_count += 1
+            stats.db_time += time.perf_counter() - started
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, DB time and query count per route, and flagging N+1 patterns"""
+    
+    def __init__(self, app, query_budget: int = 0):
+        self.app = app
+        self.query_budget = query_budget
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_request.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            metrics.request_latency.observe(labels + (str(status_code),), elapsed)
+            metrics.request_db_time.observe(labels, stats.db_time)
+            metrics.request_queries.observe(labels, stats.query_count)
+            if self.query_budget and stats.query_count > self.query_budget:
+                metrics.query_budget_exceeded.inc(labels)
+                logger.warning(
+                    "%s %s issued %d queries (budget %d) in %.1f ms; possible N+1",
+                    labels[0], labels[1], stats.query_count, self.query_budget, elapsed * 1000
+                )
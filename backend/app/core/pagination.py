@@ -0,0 +1,28 @@
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, status
+
+# Response header carrying the opaque cursor for the next page of a list endpoint
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(position: dict) -> str:
+    """Encode a keyset position into an opaque, URL-safe cursor"""
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict]:
+    """Decode a cursor produced by encode_cursor, rejecting anything malformed"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        position = None
+    if not isinstance(position, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return position
@@ -0,0 +1,79 @@
+"""Lexicographic fractional ranks for ordering board columns and tasks.
+
+A rank is a base-62 fraction written without the leading "0." and never ending in "0",
+so plain string comparison orders ranks numerically and a new rank always fits between
+any two neighbours. Placing an item writes only that item's row; keys grow by roughly
+one character per six insertions into the same gap, and rebalancing re-spaces a list.
+Appending to the end steps up from the last rank instead, so keys grow only with the
+logarithm of the number of appends.
+"""
+from typing import Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+_VALUES = {digit: value for value, digit in enumerate(DIGITS)}
+
+def is_valid_rank(rank: str) -> bool:
+    return bool(rank) and not rank.endswith(DIGITS[0]) and all(c in _VALUES for c in rank)
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    # lower is "" for the start of the list, upper None for the end
+    if upper is not None:
+        prefix = 0
+        while prefix < len(upper) and (lower[prefix] if prefix < len(lower) else DIGITS[0]) == upper[prefix]:
+            prefix += 1
+        if prefix:
+            return upper[:prefix] + _midpoint(lower[prefix:], upper[prefix:])
+
+    low = _VALUES[lower[0]] if lower else 0
+    high = _VALUES[upper[0]] if upper is not None else BASE
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+    # Adjacent digits: extend the shorter side by one more place
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[low] + _midpoint(lower[1:], None)
+
+def _increment(before: str) -> str:
+    # Each leading "z" leaves 1/62 of the room above it, so step at twice that depth:
+    # a run of k z's gives 62^(k+1) appends before the run grows
+    width = 2 * (len(before) - len(before.lstrip(DIGITS[-1]))) + 1
+    digits = [_VALUES[digit] for digit in before[:width].ljust(width, DIGITS[0])]
+    position = width - 1
+    while digits[position] == BASE - 1:
+        digits[position] = 0
+        position -= 1
+    digits[position] += 1
+    return "".join(DIGITS[value] for value in digits[:position + 1])
+
+def rank_between(before: Optional[str] = None, after: Optional[str] = None) -> str:
+    """Return a rank sorting strictly after `before` and strictly before `after` (either may be None)"""
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} must sort before {after!r}")
+    if before and after is None:
+        return _increment(before)
+    return _midpoint(before or "", after)
+
+def ranks_after(last: Optional[str], count: int) -> list[str]:
+    """`count` ascending ranks following `last` (or starting an empty list)"""
+    ranks = []
+    for _ in range(count):
+        last = rank_between(last, None)
+        ranks.append(last)
+    return ranks
+
+def spread_ranks(count: int) -> list[str]:
+    """`count` evenly spaced ranks of the shortest common length, used for seeding and rebalancing"""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    span = BASE ** width
+    ranks = []
+    for index in range(1, count + 1):
+        value = index * span // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+    return ranks
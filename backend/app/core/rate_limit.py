@@ -0,0 +1,340 @@
+"""Token-bucket rate limiting with per-worker or shared storage.
+
+Limits are configured centrally in settings: RATE_LIMIT_DEFAULT applies to every
+route, and RATE_LIMITS overrides it for individual "METHOD /route/template" keys.
+Each (limit, user) pair gets its own bucket, keyed by the authenticated user when
+the request carries a valid token and by client address otherwise.
+
+With shared storage, a worker doesn't round-trip for every request: it leases a
+slice of the bucket and spends it locally without locking, so the shared store
+sees one call per lease instead of one per request. A lease is sized from how fast
+this worker has recently been seeing the key, so a slow client leases single tokens,
+and whatever is left of a lease after `lease_ttl` goes back to the bucket.
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import HTTPException, Request, status
+from app.core.metrics import metrics
+from app.security.auth import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+@dataclass(frozen=True)
+class RateLimit:
+    name: str
+    capacity: int
+    refill_per_second: float
+
+def parse_rate_limit(name: str, spec: str) -> RateLimit:
+    """Parse "N/period", e.g. "10/minute", into a bucket of N tokens refilled over the period"""
+    try:
+        count, period = spec.replace(" ", "").split("/")
+        capacity = int(count)
+        seconds = PERIODS[period.rstrip("s")]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit for {name}: {spec!r}")
+    if capacity < 1:
+        raise ValueError(f"Invalid rate limit for {name}: {spec!r}")
+    return RateLimit(name, capacity, capacity / seconds)
+
+class InMemoryRateLimitStorage:
+    """Buckets held in this process; each worker enforces the limits on its own"""
+
+    shared = False
+
+    def __init__(self, max_keys: int = 100_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> [tokens, last refill time]
+        self._buckets: dict[str, list] = {}
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def take(self, key: str, limit: RateLimit, requested: int, now: float, refund: int = 0) -> tuple[int, float]:
+        """Return `refund` unspent tokens, then take up to `requested`.
+
+        Returns (granted, seconds until one is available when none were).
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._evict(now)
+            bucket = self._buckets[key] = [float(limit.capacity), now]
+        else:
+            bucket[0] = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.refill_per_second + refund)
+            bucket[1] = now
+        granted = min(int(bucket[0]), requested)
+        if granted:
+            bucket[0] -= granted
+            return granted, 0.0
+        return 0, (1 - bucket[0]) / limit.refill_per_second
+
+    async def acquire(self, key: str, limit: RateLimit, requested: int, refund: int = 0) -> tuple[int, float]:
+        return self.take(key, limit, requested, self.clock(), refund)
+
+    def _evict(self, now: float):
+        # Buckets idle for an hour are full again for any sensible limit; fall back to the oldest half
+        stale = [key for key, (_, updated) in self._buckets.items() if now - updated > 3600]
+        for key in stale or list(self._buckets)[:len(self._buckets) // 2]:
+            del self._buckets[key]
+
+class RedisRateLimitStorage:
+    """Buckets in Redis (or any server speaking its protocol), shared by every worker.
+
+    The refill-and-take runs as one Lua script on the server's clock, so concurrent
+    workers can't double-spend a bucket and their clocks don't need to agree.
+    """
+
+    shared = True
+
+    TAKE_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local requested = tonumber(ARGV[3])
+    local refund = tonumber(ARGV[4])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1])
+    if tokens == nil then
+        tokens = capacity
+    else
+        tokens = math.min(capacity, tokens + (now - tonumber(state[2])) * rate + refund)
+    end
+    local granted = math.min(math.floor(tokens), requested)
+    local wait = 0
+    if granted > 0 then
+        tokens = tokens - granted
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+    return {granted, tostring(wait)}
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:", client=None):
+        self.url = url
+        self.prefix = prefix
+        self._client = client
+        self._take = None
+
+    async def start(self):
+        if self._client is None:
+            import redis.asyncio
+            self._client = redis.asyncio.from_url(self.url)
+        self._take = self._client.register_script(self.TAKE_SCRIPT)
+
+    async def stop(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def acquire(self, key: str, limit: RateLimit, requested: int, refund: int = 0) -> tuple[int, float]:
+        granted, wait = await self._take(
+            keys=[self.prefix + key], args=[limit.capacity, limit.refill_per_second, requested, refund]
+        )
+        return int(granted), float(wait)
+
+class RateLimiter:
+    def __init__(
+        self,
+        storage,
+        default: RateLimit,
+        rules: Optional[dict[str, RateLimit]] = None,
+        lease_fraction: float = 0.1,
+        lease_ttl: float = 1.0,
+        rate_window: float = 5.0,
+        clock=time.monotonic
+    ):
+        self.storage = storage
+        self.default = default
+        self.rules = rules or {}
+        self.lease_fraction = lease_fraction
+        self.lease_ttl = lease_ttl
+        self.rate_window = rate_window
+        self.clock = clock
+        # Only used with shared storage:
+        # key -> [tokens left, expires at, limit]
+        self._leases: dict[str, list] = {}
+        # key -> [requests seen, decayed over rate_window, at last update]
+        self._rates: dict[str, list] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self.checks = 0
+        self.fast_path_hits = 0
+        self.rejections = 0
+        self.storage_errors = 0
+        self.refunded = 0
+
+    async def start(self):
+        await self.storage.start()
+        if self.storage.shared and self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep(), name="rate-limit-lease-sweeper")
+
+    async def stop(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        # Hand every outstanding lease back so the other workers can use it
+        await self.release_expired(math.inf)
+        await self.storage.stop()
+
+    def limit_for(self, method: str, route: str) -> RateLimit:
+        return self.rules.get(f"{method} {route}", self.default)
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        """Spend one token; returns 0 if the request is admitted, else seconds until it would be"""
+        self.checks += 1
+        now = self.clock()
+        if not self.storage.shared:
+            granted, wait = self.storage.take(key, limit, 1, now)
+            return 0.0 if granted else wait
+
+        rate = self._observe(key, now)
+        # Fast path: spend a token from this worker's lease without touching shared storage
+        lease = self._leases.pop(key, None)
+        if lease is not None and lease[0] > 0 and lease[1] > now:
+            lease[0] -= 1
+            self._leases[key] = lease
+            self.fast_path_hits += 1
+            return 0.0
+
+        # Enough for what this worker expects to see of the key before the lease expires
+        batch = max(1, min(int(limit.capacity * self.lease_fraction), round(rate * self.lease_ttl)))
+        refund = lease[0] if lease is not None else 0
+        try:
+            granted, wait = await self.storage.acquire(key, limit, batch, refund)
+        except Exception:
+            # Better to admit traffic than to fail every request while the store is unreachable
+            self.storage_errors += 1
+            logger.warning("Rate limit storage unavailable; admitting request", exc_info=True)
+            return 0.0
+        self.refunded += refund
+        if not granted:
+            return wait
+        if granted > 1:
+            self._leases[key] = [granted - 1, now + self.lease_ttl, limit]
+        return 0.0
+
+    async def release_expired(self, now: Optional[float] = None) -> int:
+        """Return the unspent tokens of leases that expired by `now` to shared storage; returns the tokens"""
+        now = self.clock() if now is None else now
+        expired = [(key, lease) for key, lease in self._leases.items() if lease[1] <= now]
+        for key, _ in expired:
+            del self._leases[key]
+        refunds = [(key, lease[2], lease[0]) for key, lease in expired if lease[0] > 0]
+        results = await asyncio.gather(
+            *(self.storage.acquire(key, limit, 0, tokens) for key, limit, tokens in refunds),
+            return_exceptions=True
+        )
+        returned = 0
+        for (_, _, tokens), result in zip(refunds, results):
+            if isinstance(result, Exception):
+                self.storage_errors += 1
+                logger.warning("Couldn't return leased rate limit tokens", exc_info=result)
+            else:
+                returned += tokens
+        self.refunded += returned
+
+        horizon = now - 10 * self.rate_window
+        if len(self._rates) > 10_000:
+            self._rates = {key: rate for key, rate in self._rates.items() if rate[1] > horizon}
+        return returned
+
+    def _observe(self, key: str, now: float) -> float:
+        """Count a request for `key`; returns this worker's recent rate for it in requests per second"""
+        rate = self._rates.get(key)
+        if rate is None:
+            rate = self._rates[key] = [0.0, now]
+        rate[0] = rate[0] * math.exp((rate[1] - now) / self.rate_window) + 1
+        rate[1] = now
+        return rate[0] / self.rate_window
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.lease_ttl)
+            try:
+                await self.release_expired()
+            except Exception:
+                logger.exception("Returning expired rate limit leases failed")
+
+    def stats(self) -> dict:
+        return {
+            "checks": self.checks,
+            "fast_path_hits": self.fast_path_hits,
+            "rejections": self.rejections,
+            "storage_errors": self.storage_errors,
+            "leases": len(self._leases),
+            "refunded": self.refunded,
+        }
+
+def client_key(request: Request) -> str:
+    """The authenticated user when the request carries a valid token, else the client address"""
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_access_token(token)
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+_rate_limiter: Optional[RateLimiter] = None
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    return _rate_limiter
+
+def set_rate_limiter(limiter: Optional[RateLimiter]):
+    global _rate_limiter
+    _rate_limiter = limiter
+
+def create_rate_limiter(settings) -> Optional[RateLimiter]:
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    if settings.RATE_LIMIT_STORAGE == "memory":
+        storage = InMemoryRateLimitStorage()
+    elif settings.RATE_LIMIT_STORAGE == "redis":
+        if not settings.RATE_LIMIT_STORAGE_URL:
+            raise ValueError("RATE_LIMIT_STORAGE_URL is required for the redis rate limit storage")
+        storage = RedisRateLimitStorage(settings.RATE_LIMIT_STORAGE_URL)
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_STORAGE: {settings.RATE_LIMIT_STORAGE}")
+    rules = {route: parse_rate_limit(route, spec) for route, spec in settings.RATE_LIMITS.items()}
+    return RateLimiter(
+        storage,
+        parse_rate_limit("default", settings.RATE_LIMIT_DEFAULT),
+        rules,
+        lease_fraction=settings.RATE_LIMIT_LEASE_FRACTION
+    )
+
+async def enforce_rate_limit(request: Request):
+    """App-wide dependency: reject the request with 429 once its bucket is empty"""
+    limiter = _rate_limiter
+    if limiter is None:
+        return
+    started = time.perf_counter()
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    limit = limiter.limit_for(request.method, route)
+    wait = await limiter.hit(f"{limit.name}|{client_key(request)}", limit)
+    metrics.rate_limit_check.observe((), time.perf_counter() - started)
+    if wait:
+        limiter.rejections += 1
+        metrics.rate_limit_rejections.inc((request.method, route, "default" if limit is limiter.default else "route"))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))}
+        )
@@ -0,0 +1,87 @@
+from datetime import datetime
+from sqlalchemy import select, insert, delete, exists, literal, DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.access_request import AccessRequest
+from app.models.archive import (
+    projects_archive, statuses_archive, project_members_archive, access_requests_archive, tasks_archive,
+    task_comments_archive
+)
+from app.models.project import Project
+from app.models.project_deletion_job import ProjectDeletionJob
+from app.models.project_member import ProjectMember
+from app.models.status import Status
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+
+async def _move(db: AsyncSession, model, archive, condition, archived_at: datetime) -> int:
+    """Copy the rows matching `condition` into `archive`, then delete them; returns the row count"""
+    source = model.__table__
+    await db.execute(
+        insert(archive).from_select(
+            [column.name for column in source.columns] + ["archived_at"],
+            select(*source.columns, literal(archived_at, DateTime)).where(condition)
+        )
+    )
+    result = await db.execute(delete(source).where(condition))
+    return result.rowcount
+
+async def lock_expired_tasks(db: AsyncSession, cutoff: datetime, limit: int) -> list[int]:
+    """Ids of up to `limit` tasks soft-deleted before `cutoff`, oldest first.
+
+    Locked with SKIP LOCKED so archivers in several workers take disjoint batches.
+    """
+    result = await db.execute(
+        select(Task.id)
+        .where(Task.deleted_at.is_not(None), Task.deleted_at < cutoff)
+        .order_by(Task.deleted_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(result.scalars().all())
+
+async def archive_tasks(db: AsyncSession, task_ids: list[int]) -> tuple[int, int]:
+    """Move tasks and all of their comments to the archive; returns (tasks, comments) moved"""
+    if not task_ids:
+        return 0, 0
+    now = datetime.utcnow()
+    comments = await _move(db, TaskComment, task_comments_archive, TaskComment.task_id.in_(task_ids), now)
+    tasks = await _move(db, Task, tasks_archive, Task.id.in_(task_ids), now)
+    return tasks, comments
+
+async def lock_expired_project(db: AsyncSession, cutoff: datetime):
+    """The id of one project soft-deleted before `cutoff` that no other archiver holds, or None.
+
+    Projects whose deletion cascade hasn't finished are left until it has.
+    """
+    cascading = exists().where(
+        ProjectDeletionJob.project_id == Project.id, ProjectDeletionJob.finished_at.is_(None)
+    )
+    result = await db.execute(
+        select(Project.id)
+        .where(Project.deleted_at.is_not(None), Project.deleted_at < cutoff, ~cascading)
+        .order_by(Project.deleted_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    return result.scalar_one_or_none()
+
+async def archive_project_batch(db: AsyncSession, project_id: int, batch_size: int) -> tuple[int, int, bool]:
+    """Move up to batch_size of the project's tasks (live or not), with their comments, to the archive.
+
+    Once no tasks remain, the project's statuses, members and access requests follow it in the
+    same call. Returns (tasks, comments, finished).
+    """
+    result = await db.execute(
+        select(Task.id).where(Task.project_id == project_id).order_by(Task.id).limit(batch_size)
+    )
+    task_ids = list(result.scalars().all())
+    if task_ids:
+        tasks, comments = await archive_tasks(db, task_ids)
+        return tasks, comments, False
+
+    now = datetime.utcnow()
+    await _move(db, Status, statuses_archive, Status.project_id == project_id, now)
+    await _move(db, ProjectMember, project_members_archive, ProjectMember.project_id == project_id, now)
+    await _move(db, AccessRequest, access_requests_archive, AccessRequest.project_id == project_id, now)
+    await _move(db, Project, projects_archive, Project.id == project_id, now)
+    return 0, 0, True
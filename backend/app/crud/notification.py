@@ -1,19 +1,78 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from collections import Counter
+from sqlalchemy import select, update, insert, delete, func, case
+from app.db.dialect import dialect_insert, insert_ignoring_conflicts
 from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
+from app.models.notification_outbox import NotificationOutbox
 from app.schemas.notification import NotificationCreate
 
-async def create_notification(db: AsyncSession, notification: NotificationCreate):
-    db_notification = Notification(
-        user_id=notification.user_id,
-        message=notification.message,
-        type=notification.type,
-        related_id=notification.related_id
+async def _increment_unread(db: AsyncSession, user_ids: list[int]):
+    """Add one unread notification per occurrence of each user id to their counters"""
+    if not user_ids:
+        return
+    deltas = Counter(user_ids)
+    stmt = dialect_insert(db, NotificationCounter).values([
+        {"user_id": user_id, "unread_count": deltas[user_id]}
+        for user_id in sorted(deltas)  # fixed lock order across concurrent writers
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"unread_count": NotificationCounter.unread_count + stmt.excluded.unread_count}
+    ))
+
+async def _decrement_unread(db: AsyncSession, user_id: int, amount: int):
+    if amount <= 0:
+        return
+    await db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread_count=case(
+            (NotificationCounter.unread_count > amount, NotificationCounter.unread_count - amount),
+            else_=0
+        ))
     )
-    db.add(db_notification)
-    await db.flush()
-    await db.refresh(db_notification)
-    return db_notification
+
+async def enqueue_notifications(db: AsyncSession, notifications: list[NotificationCreate]):
+    """Record notifications in the outbox as part of the caller's transaction"""
+    if not notifications:
+        return
+    await db.execute(insert(NotificationOutbox), [n.model_dump() for n in notifications])
+
+async def enqueue_notification(db: AsyncSession, notification: NotificationCreate):
+    await enqueue_notifications(db, [notification])
+
+async def deliver_outbox_batch(db: AsyncSession, batch_size: int) -> list[int]:
+    """Move up to batch_size outbox rows into notifications and return the recipients' user ids.
+    
+    Rows are locked with SKIP LOCKED so several workers can drain the outbox concurrently.
+    The caller commits; if it fails before committing the rows stay queued and are retried.
+    """
+    result = await db.execute(
+        select(NotificationOutbox)
+        .order_by(NotificationOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    entries = result.scalars().all()
+    if not entries:
+        return []
+    
+    await db.execute(insert(Notification), [
+        {
+            "user_id": entry.user_id,
+            "message": entry.message,
+            "type": entry.type,
+            "related_id": entry.related_id
+        }
+        for entry in entries
+    ])
+    await db.execute(
+        delete(NotificationOutbox).where(NotificationOutbox.id.in_([entry.id for entry in entries]))
+    )
+    recipients = [entry.user_id for entry in entries]
+    await _increment_unread(db, recipients)
+    return recipients
 
 async def get_user_notifications(db: AsyncSession, user_id: int, unread_only: bool = False):
     query = select(Notification).where(Notification.user_id == user_id)
@@ -25,27 +84,63 @@ async def get_user_notifications(db: AsyncSession, user_id: int, unread_only: bo
     return result.scalars().all()
 
 async def mark_as_read(db: AsyncSession, notification_id: int):
-    await db.execute(
+    result = await db.execute(
         update(Notification)
-        .where(Notification.id == notification_id)
+        .where(Notification.id == notification_id, Notification.is_read == False)
         .values(is_read=True)
+        .returning(Notification.user_id)
     )
+    user_id = result.scalar_one_or_none()
+    if user_id is not None:
+        await _decrement_unread(db, user_id, 1)
     await db.flush()
 
 async def mark_all_as_read(db: AsyncSession, user_id: int):
-    await db.execute(
+    result = await db.execute(
         update(Notification)
         .where(Notification.user_id == user_id, Notification.is_read == False)
         .values(is_read=True)
     )
+    # Decrement by what was actually marked so concurrent deliveries are not lost
+    await _decrement_unread(db, user_id, result.rowcount)
     await db.flush()
 
 async def get_unread_count(db: AsyncSession, user_id: int) -> int:
-    from sqlalchemy import func
     result = await db.execute(
-        select(func.count(Notification.id)).where(
-            Notification.user_id == user_id,
-            Notification.is_read == False
-        )
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
     )
     return result.scalar() or 0
+
+async def get_unread_counts(db: AsyncSession, user_ids: list[int]) -> dict[int, int]:
+    """Unread counts for several users (users with none map to 0)"""
+    if not user_ids:
+        return {}
+    result = await db.execute(
+        select(NotificationCounter.user_id, NotificationCounter.unread_count)
+        .where(NotificationCounter.user_id.in_(user_ids))
+    )
+    counts = {user_id: 0 for user_id in user_ids}
+    counts.update(dict(result.all()))
+    return counts
+
+async def recompute_unread_counters(db: AsyncSession):
+    """Rebuild every user's unread counter from the notifications table"""
+    unread_for_user = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == NotificationCounter.user_id, Notification.is_read == False)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(NotificationCounter).values(unread_count=unread_for_user)
+        .execution_options(synchronize_session=False)
+    )
+    # Users with unread notifications but no counter row yet
+    missing = (
+        select(Notification.user_id, func.count(Notification.id))
+        .where(Notification.is_read == False)
+        .group_by(Notification.user_id)
+    )
+    await db.execute(
+        insert_ignoring_conflicts(db, NotificationCounter, ["user_id"])
+        .from_select(["user_id", "unread_count"], missing)
+    )
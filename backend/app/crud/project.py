@@ -1,8 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, case, or_, exists, union
 from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.status import Status
+from app.models.task import Task
+from app.models.user import User
+from app.crud.status import DONE_STATUS_NAME
+from app.db.dialect import insert_ignoring_conflicts
 from app.schemas.project import ProjectCreate
-from typing import Any
+from typing import Any, Optional
 
 
 async def create_project(db: AsyncSession, project: ProjectCreate, owner_id: int):
@@ -26,12 +32,178 @@ async def get_project_by_id(db: AsyncSession, project_id: int):
     )
     return result.scalar_one_or_none()
 
+async def get_projects_by_ids(db: AsyncSession, project_ids: list[int]):
+    if not project_ids:
+        return []
+    result = await db.execute(
+        select(Project).where(Project.id.in_(project_ids), Project.deleted_at.is_(None))
+    )
+    return result.scalars().all()
+
 async def get_user_projects(db: AsyncSession, user_id: int):
     result = await db.execute(
         select(Project).where(Project.owner_id == user_id, Project.deleted_at.is_(None))
     )
     return result.scalars().all()
 
+async def get_member_projects_with_role(db: AsyncSession, user_id: int):
+    """Get live projects the user belongs to along with the user's role in each"""
+    result = await db.execute(
+        select(Project, ProjectMember.role)
+        .join(ProjectMember, ProjectMember.project_id == Project.id)
+        .where(ProjectMember.user_id == user_id, Project.deleted_at.is_(None))
+    )
+    return result.all()
+
+async def get_available_projects(
+    db: AsyncSession,
+    user_id: int,
+    search: Optional[str] = None,
+    limit: int = 50,
+    after_id: Optional[int] = None
+):
+    """Live projects the user is not a member of, with the owner's name, ordered by id"""
+    is_member = exists().where(
+        ProjectMember.project_id == Project.id,
+        ProjectMember.user_id == user_id
+    )
+    query = (
+        select(Project, User.name)
+        .outerjoin(User, Project.owner_id == User.id)
+        .where(Project.deleted_at.is_(None), ~is_member)
+    )
+    if search:
+        # Match the text literally: "%" and "_" in the search are not wildcards
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        query = query.where(or_(
+            Project.title.ilike(pattern, escape="\\"), Project.technology_stack.ilike(pattern, escape="\\")
+        ))
+    if after_id is not None:
+        query = query.where(Project.id > after_id)
+    
+    result = await db.execute(query.order_by(Project.id).limit(limit))
+    return result.all()
+
+async def get_collaborator_ids(db: AsyncSession, user_id: int, candidate_ids: list[int]) -> set[int]:
+    """Return which of the given users share a live project with the user, as its owner or a member"""
+    if not candidate_ids:
+        return set()
+    shared_projects = select(Project.id).where(
+        Project.deleted_at.is_(None),
+        or_(
+            Project.owner_id == user_id,
+            Project.id.in_(
+                select(ProjectMember.project_id).where(
+                    ProjectMember.user_id == user_id, ProjectMember.deleted_at.is_(None)
+                )
+            )
+        )
+    )
+    members = select(ProjectMember.user_id).where(
+        ProjectMember.project_id.in_(shared_projects),
+        ProjectMember.user_id.in_(candidate_ids),
+        ProjectMember.deleted_at.is_(None)
+    )
+    owners = select(Project.owner_id).where(Project.id.in_(shared_projects), Project.owner_id.in_(candidate_ids))
+    result = await db.execute(union(members, owners))
+    return set(result.scalars().all())
+
+async def get_member_user_ids(db: AsyncSession, project_id: int, user_ids: list[int]) -> set[int]:
+    """Return which of the given users are already members of the project"""
+    if not user_ids:
+        return set()
+    result = await db.execute(
+        select(ProjectMember.user_id).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id.in_(user_ids)
+        )
+    )
+    return set(result.scalars().all())
+
+async def add_project_members(db: AsyncSession, project_id: int, user_ids: list[int], role: str = "member") -> set[int]:
+    """Bulk-insert memberships, skipping existing ones, and return the user ids actually added"""
+    if not user_ids:
+        return set()
+    stmt = (
+        insert_ignoring_conflicts(db, ProjectMember, ["project_id", "user_id"])
+        .values([{"project_id": project_id, "user_id": user_id, "role": role} for user_id in user_ids])
+        .returning(ProjectMember.user_id)
+    )
+    result = await db.execute(stmt)
+    return set(result.scalars().all())
+
+async def get_user_project_roles(
+    db: AsyncSession, user_id: int, project_ids: Optional[list[int]] = None
+) -> dict[int, str]:
+    """Map every live project the user owns or belongs to (of `project_ids`, if given) onto the user's role in it"""
+    query = (
+        select(Project.id, Project.owner_id, ProjectMember.role)
+        .outerjoin(
+            ProjectMember,
+            (ProjectMember.project_id == Project.id) & (ProjectMember.user_id == user_id)
+        )
+        .where(
+            Project.deleted_at.is_(None),
+            or_(Project.owner_id == user_id, ProjectMember.user_id == user_id)
+        )
+    )
+    if project_ids is not None:
+        query = query.where(Project.id.in_(project_ids))
+    result = await db.execute(query)
+    # Owners are always leaders, whatever their membership row says
+    return {
+        project_id: "leader" if owner_id == user_id else role
+        for project_id, owner_id, role in result.all()
+    }
+
+async def adjust_task_counters(db: AsyncSession, project_id: int, total_delta: int = 0, done_delta: int = 0):
+    """Atomically shift a project's task counters by the given deltas"""
+    if not total_delta and not done_delta:
+        return
+    await db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(
+            task_count=Project.task_count + total_delta,
+            done_task_count=Project.done_task_count + done_delta
+        )
+    )
+
+async def bump_project_version(db: AsyncSession, project_id: int):
+    """Mark the project's board, statuses and members as changed, in the writing transaction"""
+    await db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(version=Project.version + 1)
+    )
+
+async def get_project_version(db: AsyncSession, project_id: int) -> Optional[int]:
+    """The project's change counter alone, without loading the row"""
+    result = await db.execute(
+        select(Project.version).where(Project.id == project_id, Project.deleted_at.is_(None))
+    )
+    return result.scalar_one_or_none()
+
+async def recalculate_task_counters(db: AsyncSession, project_id: int):
+    """Recompute a project's task counters from the tasks table in one grouped query"""
+    result = await db.execute(
+        select(
+            func.count(Task.id),
+            func.coalesce(func.sum(case((Status.name == DONE_STATUS_NAME, 1), else_=0)), 0)
+        )
+        .select_from(Task)
+        .outerjoin(Status, Task.status_id == Status.id)
+        .where(Task.project_id == project_id, Task.deleted_at.is_(None))
+    )
+    total, done = result.one()
+    await db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(task_count=total, done_task_count=done)
+    )
+    return total, done
+
 async def soft_delete_project(db: AsyncSession, project: Project):
     from datetime import datetime
     project.deleted_at = datetime.utcnow()
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.project import Project
+from app.models.project_deletion_job import ProjectDeletionJob, DELETION_PHASES
+from app.models.project_member import ProjectMember
+from app.models.status import Status
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+
+async def create_job(db: AsyncSession, project_id: int, requested_by: int) -> ProjectDeletionJob:
+    job = ProjectDeletionJob(project_id=project_id, requested_by=requested_by)
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    return job
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[ProjectDeletionJob]:
+    return await db.get(ProjectDeletionJob, job_id)
+
+async def lock_next_job(db: AsyncSession) -> Optional[ProjectDeletionJob]:
+    """The next unfinished job that is due and no other worker is running a batch of, locked until commit.
+
+    Jobs backing off after a failure wait until their next_attempt_at, so they don't hold up the rest.
+    """
+    result = await db.execute(
+        select(ProjectDeletionJob)
+        .where(
+            ProjectDeletionJob.finished_at.is_(None),
+            or_(ProjectDeletionJob.next_attempt_at.is_(None), ProjectDeletionJob.next_attempt_at <= datetime.utcnow())
+        )
+        .order_by(ProjectDeletionJob.next_attempt_at.nulls_first(), ProjectDeletionJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    return result.scalar_one_or_none()
+
+def _live_children(phase: str, project_id: int):
+    """(model, query for the ids of its live rows under the project) for a deletion phase"""
+    if phase == "comments":
+        return TaskComment, (
+            select(TaskComment.id)
+            .join(Task, TaskComment.task_id == Task.id)
+            .where(Task.project_id == project_id, TaskComment.deleted_at.is_(None))
+        )
+    if phase == "tasks":
+        return Task, select(Task.id).where(Task.project_id == project_id, Task.deleted_at.is_(None))
+    if phase == "statuses":
+        return Status, select(Status.id).where(Status.project_id == project_id, Status.deleted_at.is_(None))
+    if phase == "members":
+        return ProjectMember, select(ProjectMember.id).where(
+            ProjectMember.project_id == project_id, ProjectMember.deleted_at.is_(None)
+        )
+    raise ValueError(f"Unknown deletion phase: {phase}")
+
+async def run_job_batch(db: AsyncSession, job: ProjectDeletionJob, batch_size: int) -> bool:
+    """Soft-delete up to batch_size rows of the job's current phase and record progress; True once finished.
+
+    Only live rows are touched, so re-running a batch whose commit was lost is harmless.
+    Children are stamped with the project's deletion time, so they reach archive retention with it.
+    """
+    now = datetime.utcnow()
+    if job.started_at is None:
+        job.started_at = now
+        job.status = "running"
+    deleted_at = await db.scalar(select(Project.deleted_at).where(Project.id == job.project_id)) or now
+
+    model, live_ids = _live_children(job.phase, job.project_id)
+    ids = list((await db.execute(live_ids.order_by(model.id).limit(batch_size))).scalars().all())
+    if ids:
+        await db.execute(
+            update(model)
+            .where(model.id.in_(ids))
+            .values(deleted_at=deleted_at, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        counter = f"{job.phase}_deleted"
+        setattr(job, counter, getattr(job, counter) + len(ids))
+    job.batches += 1
+
+    if len(ids) < batch_size:
+        # Phase exhausted: move on, or finish after the last one
+        position = DELETION_PHASES.index(job.phase)
+        if position + 1 < len(DELETION_PHASES):
+            job.phase = DELETION_PHASES[position + 1]
+        else:
+            job.status = "completed"
+            job.finished_at = now
+    await db.flush()
+    return job.finished_at is not None
+
+async def record_failure(
+    db: AsyncSession, job_id: int, error: str, max_failures: int, backoff_seconds: float
+) -> Optional[ProjectDeletionJob]:
+    """Count a failed batch and back the job off exponentially; after max_failures it is marked failed"""
+    job = await db.get(ProjectDeletionJob, job_id, with_for_update=True)
+    if job is None:
+        return None
+    now = datetime.utcnow()
+    job.failures += 1
+    job.last_error = error[:2000]
+    if job.failures >= max_failures:
+        job.status = "failed"
+        job.finished_at = now
+        job.next_attempt_at = None
+    else:
+        job.next_attempt_at = now + timedelta(seconds=backoff_seconds * 2 ** (job.failures - 1))
+    await db.flush()
+    return job
@@ -0,0 +1,60 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert
+from sqlalchemy.orm import aliased
+from app.models.project_member import ProjectMember
+from app.models.status import Status
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+from app.models.user import User
+from typing import Any
+
+# Export reads go through server-side cursors (stream / stream_scalars) so only `yield_per`
+# rows are held in memory at a time, however large the project.
+
+async def stream_statuses(db: AsyncSession, project_id: int, yield_per: int):
+    return await db.stream_scalars(
+        select(Status)
+        .where(Status.project_id == project_id)
+        .order_by(Status.rank, Status.id)
+        .execution_options(yield_per=yield_per)
+    )
+
+async def stream_members(db: AsyncSession, project_id: int, yield_per: int):
+    return await db.stream(
+        select(User.email, User.name, ProjectMember.role)
+        .join(User, User.id == ProjectMember.user_id)
+        .where(ProjectMember.project_id == project_id)
+        .order_by(ProjectMember.id)
+        .execution_options(yield_per=yield_per)
+    )
+
+async def stream_tasks_with_comments(db: AsyncSession, project_id: int, yield_per: int):
+    """Live tasks ordered by id, each followed by its comments (a task without comments yields one row)"""
+    assignee = aliased(User)
+    author = aliased(User)
+    return await db.stream(
+        select(
+            Task.id, Task.title, Task.description, Task.priority, Task.due_date, Task.status_id,
+            Task.rank, Task.created_at, assignee.email.label("assignee_email"),
+            TaskComment.id.label("comment_id"), TaskComment.comment, TaskComment.created_at.label("comment_created_at"),
+            author.email.label("author_email")
+        )
+        .outerjoin(assignee, assignee.id == Task.assigned_to)
+        .outerjoin(TaskComment, (TaskComment.task_id == Task.id) & TaskComment.deleted_at.is_(None))
+        .outerjoin(author, author.id == TaskComment.user_id)
+        .where(Task.project_id == project_id, Task.deleted_at.is_(None))
+        .order_by(Task.id, TaskComment.id)
+        .execution_options(yield_per=yield_per)
+    )
+
+async def bulk_create_statuses(db: AsyncSession, rows: list[dict[str, Any]]) -> list[int]:
+    """Insert statuses in one statement and return their ids in input order"""
+    if not rows:
+        return []
+    result = await db.execute(insert(Status).returning(Status.id, sort_by_parameter_order=True), rows)
+    return list(result.scalars().all())
+
+async def bulk_create_comments(db: AsyncSession, rows: list[dict[str, Any]]):
+    if not rows:
+        return
+    await db.execute(insert(TaskComment), rows)
@@ -0,0 +1,62 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+from app.core.ranking import spread_ranks
+from typing import Optional
+
+# Ordered lists are Task rows within a status column and Status rows within a project.
+# `scope` is the column that partitions a model into lists, e.g. Task.status_id.
+
+async def get_item_rank(db: AsyncSession, model, scope, scope_id: int, item_id: int) -> Optional[str]:
+    """Rank of a live item, or None if it is not in the given list"""
+    result = await db.execute(
+        select(model.rank).where(model.id == item_id, scope == scope_id, model.deleted_at.is_(None))
+    )
+    return result.scalar_one_or_none()
+
+async def get_adjacent_rank(
+    db: AsyncSession,
+    model,
+    scope,
+    scope_id: int,
+    rank: str,
+    following: bool,
+    exclude_id: Optional[int] = None
+) -> Optional[str]:
+    """The nearest rank after (following=True) or before `rank` in the list, skipping exclude_id"""
+    query = select(func.min(model.rank) if following else func.max(model.rank)).where(
+        scope == scope_id,
+        model.rank > rank if following else model.rank < rank,
+        model.deleted_at.is_(None)
+    )
+    if exclude_id is not None:
+        query = query.where(model.id != exclude_id)
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+async def get_last_ranks(db: AsyncSession, model, scope, scope_ids: list[int]) -> dict[int, str]:
+    """Highest live rank in each list, one grouped query for all of them"""
+    if not scope_ids:
+        return {}
+    result = await db.execute(
+        select(scope, func.max(model.rank))
+        .where(scope.in_(scope_ids), model.deleted_at.is_(None))
+        .group_by(scope)
+    )
+    return {scope_id: rank for scope_id, rank in result.all() if rank is not None}
+
+async def rebalance_ranks(db: AsyncSession, model, scope, scope_id: int) -> int:
+    """Re-space every live rank in the list evenly, keeping the current order; returns rows rewritten"""
+    result = await db.execute(
+        select(model.id)
+        .where(scope == scope_id, model.deleted_at.is_(None))
+        .order_by(model.rank, model.id)
+        .with_for_update()
+    )
+    ids = result.scalars().all()
+    if not ids:
+        return 0
+    await db.execute(
+        update(model),
+        [{"id": item_id, "rank": rank} for item_id, rank in zip(ids, spread_ranks(len(ids)))]
+    )
+    return len(ids)
@@ -0,0 +1,128 @@
+import re
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal, literal_column, null, union_all, text, bindparam
+from app.db.search import TASK_SEARCH_DOCUMENT, COMMENT_SEARCH_DOCUMENT, SQLITE_FTS_TABLE
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Control characters bracket the matches in the database's snippet. They are taken out again
+# before returning, so the snippet is plain user text and the matches are given as offsets into it.
+START_MATCH, STOP_MATCH = "\x02", "\x03"
+_MARKERS = re.compile(f"([{START_MATCH}{STOP_MATCH}])")
+
+def _with_highlights(row) -> dict:
+    """The hit with its marked-up snippet turned into plain text plus [start, end) offsets of the matches"""
+    hit = dict(row)
+    pieces, highlights, start, length = [], [], None, 0
+    for piece in _MARKERS.split(hit["snippet"] or ""):
+        if piece == START_MATCH:
+            start = length
+        elif piece == STOP_MATCH:
+            if start is not None and length > start:
+                highlights.append((start, length))
+            start = None
+        else:
+            pieces.append(piece)
+            length += len(piece)
+    hit["snippet"] = "".join(pieces)
+    hit["highlights"] = highlights
+    return hit
+
+async def search_project_content(db: AsyncSession, project_ids: list[int], query: str, limit: int, offset: int):
+    """Ranked task and comment matches in the given projects, best first"""
+    if not project_ids:
+        return []
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return await _search_postgresql(db, project_ids, query, limit, offset)
+    if dialect_name == "sqlite":
+        return await _search_sqlite(db, project_ids, query, limit, offset)
+    raise NotImplementedError(f"Full-text search is not supported on {dialect_name}")
+
+async def _search_postgresql(db: AsyncSession, project_ids: list[int], query: str, limit: int, offset: int):
+    tsquery = func.websearch_to_tsquery(literal_column("'english'"), query)
+    task_document = literal_column(f"({TASK_SEARCH_DOCUMENT})")
+    comment_document = literal_column(f"({COMMENT_SEARCH_DOCUMENT})")
+    
+    task_hits = select(
+        literal("task").label("kind"),
+        Task.id.label("task_id"),
+        null().label("comment_id"),
+        Task.project_id,
+        Task.title,
+        func.concat_ws(" ", Task.title, Task.description).label("body"),
+        func.ts_rank(task_document, tsquery).label("score")
+    ).where(
+        task_document.op("@@")(tsquery),
+        Task.project_id.in_(project_ids),
+        Task.deleted_at.is_(None)
+    )
+    comment_hits = select(
+        literal("comment").label("kind"),
+        TaskComment.task_id,
+        TaskComment.id.label("comment_id"),
+        Task.project_id,
+        Task.title,
+        TaskComment.comment.label("body"),
+        func.ts_rank(comment_document, tsquery).label("score")
+    ).join(Task, Task.id == TaskComment.task_id).where(
+        comment_document.op("@@")(tsquery),
+        Task.project_id.in_(project_ids),
+        Task.deleted_at.is_(None),
+        TaskComment.deleted_at.is_(None)
+    )
+    
+    hits = union_all(task_hits, comment_hits).subquery()
+    page = (
+        select(hits)
+        .order_by(hits.c.score.desc(), hits.c.task_id, hits.c.comment_id)
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    # Highlight only the rows on this page
+    result = await db.execute(
+        select(
+            page.c.kind, page.c.task_id, page.c.comment_id, page.c.project_id, page.c.title, page.c.score,
+            func.ts_headline(
+                literal_column("'english'"), page.c.body, tsquery,
+                bindparam(
+                    "headline_options",
+                    f'MaxFragments=1, MaxWords=20, MinWords=5, StartSel="{START_MATCH}", StopSel="{STOP_MATCH}"'
+                )
+            ).label("snippet")
+        ).order_by(page.c.score.desc(), page.c.task_id, page.c.comment_id)
+    )
+    return [_with_highlights(row) for row in result.mappings().all()]
+
+def _fts5_query(query: str) -> str:
+    # Quote every word so user input can't inject FTS5 syntax; the last word matches as a prefix
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return ""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+async def _search_sqlite(db: AsyncSession, project_ids: list[int], query: str, limit: int, offset: int):
+    match = _fts5_query(query)
+    if not match:
+        return []
+    statement = text(f"""
+        SELECT s.kind, s.task_id, s.comment_id, t.project_id, t.title,
+               -bm25({SQLITE_FTS_TABLE}, 10.0, 4.0) AS score,
+               snippet({SQLITE_FTS_TABLE}, -1, char(2), char(3), '...', 20) AS snippet
+        FROM {SQLITE_FTS_TABLE} AS s
+        JOIN tasks AS t ON t.id = s.task_id
+        WHERE {SQLITE_FTS_TABLE} MATCH :match
+          AND t.project_id IN :project_ids
+          AND t.deleted_at IS NULL
+        ORDER BY score DESC, s.task_id, s.comment_id
+        LIMIT :limit OFFSET :offset
+    """).bindparams(bindparam("project_ids", expanding=True))
+    result = await db.execute(
+        statement, {"match": match, "project_ids": project_ids, "limit": limit, "offset": offset}
+    )
+    return [_with_highlights(row) for row in result.mappings().all()]
@@ -4,11 +4,13 @@ from app.models.status import Status
 from app.schemas.status import StatusCreate
 from typing import Any
 
+# Tasks in a status with this name count as completed for project progress
+DONE_STATUS_NAME = "Done"
 
-async def create_status(db: AsyncSession, status: StatusCreate):
+async def create_status(db: AsyncSession, status: StatusCreate, rank: str):
     db_status = Status(
         name=status.name,
-        position=status.position,
+        rank=rank,
         project_id=status.project_id
     )
     db.add(db_status)
@@ -20,12 +22,24 @@ async def get_status_by_id(db: AsyncSession, status_id: int):
     result = await db.execute(select(Status).where(Status.id == status_id))
     return result.scalar_one_or_none()
 
+async def get_statuses_by_ids(db: AsyncSession, status_ids: list[int]):
+    if not status_ids:
+        return []
+    result = await db.execute(select(Status).where(Status.id.in_(status_ids)))
+    return result.scalars().all()
+
 async def get_project_statuses(db: AsyncSession, project_id: int):
     result = await db.execute(
-        select(Status).where(Status.project_id == project_id).order_by(Status.position)
+        select(Status).where(Status.project_id == project_id).order_by(Status.rank, Status.id)
     )
     return result.scalars().all()
 
+async def update_status_rank(db: AsyncSession, status: Status, rank: str):
+    status.rank = rank
+    await db.flush()
+    await db.refresh(status)
+    return status
+
 async def update_status_name(db: AsyncSession, status: Status, name: str):
     status.name = name
     await db.flush()
@@ -1,16 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update
+from datetime import datetime
 from app.models.task import Task
+from app.models.user import User
 from app.schemas.task import TaskCreate, TaskUpdate
-from typing import Optional
+from typing import Any, Optional
 
-async def create_task(db: AsyncSession, task: TaskCreate):
+async def create_task(db: AsyncSession, task: TaskCreate, rank: str):
     db_task = Task(
         title=task.title,
         description=task.description,
         priority=task.priority,
         due_date=task.due_date,
         status_id=task.status_id,
+        rank=rank,
         project_id=task.project_id,
         assigned_to=task.assigned_to
     )
@@ -25,6 +28,40 @@ async def get_task_by_id(db: AsyncSession, task_id: int):
     )
     return result.scalar_one_or_none()
 
+async def get_tasks_by_ids(db: AsyncSession, task_ids: list[int], refresh: bool = False):
+    """Load live tasks by id in one query; refresh=True overwrites stale objects already in the session"""
+    if not task_ids:
+        return []
+    query = select(Task).where(Task.id.in_(task_ids), Task.deleted_at.is_(None))
+    if refresh:
+        query = query.execution_options(populate_existing=True)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def bulk_create_tasks(db: AsyncSession, rows: list[dict[str, Any]]):
+    """Insert many tasks in one statement, returning them in input order"""
+    if not rows:
+        return []
+    result = await db.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), rows)
+    return result.all()
+
+async def bulk_update_tasks(db: AsyncSession, rows: list[dict[str, Any]]):
+    """Apply per-task column changes by primary key; each row needs an "id" key"""
+    if not rows:
+        return
+    now = datetime.utcnow()
+    await db.execute(update(Task), [{**row, "updated_at": now} for row in rows])
+
+async def bulk_soft_delete_tasks(db: AsyncSession, task_ids: list[int]):
+    if not task_ids:
+        return
+    await db.execute(
+        update(Task)
+        .where(Task.id.in_(task_ids))
+        .values(deleted_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
 async def get_project_tasks(
     db: AsyncSession,
     project_id: int,
@@ -32,7 +69,8 @@ async def get_project_tasks(
     priority: Optional[str] = None,
     assigned_to: Optional[int] = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    after_id: Optional[int] = None
 ):
     query = select(Task).where(Task.project_id == project_id, Task.deleted_at.is_(None))
     
@@ -43,7 +81,13 @@ async def get_project_tasks(
     if assigned_to:
         query = query.where(Task.assigned_to == assigned_to)
     
-    query = query.limit(limit).offset(offset)
+    # Keyset mode seeks past the last seen id instead of skipping rows
+    if after_id is not None:
+        query = query.where(Task.id > after_id)
+    else:
+        query = query.offset(offset)
+    
+    query = query.order_by(Task.id).limit(limit)
     result = await db.execute(query)
     return result.scalars().all()
 
@@ -63,14 +107,14 @@ async def update_task(db: AsyncSession, task: Task, task_update: TaskUpdate):
     await db.refresh(task)
     return task
 
-async def move_task(db: AsyncSession, task: Task, new_status_id: int):
+async def move_task(db: AsyncSession, task: Task, new_status_id: int, rank: str):
     task.status_id = new_status_id
+    task.rank = rank
     await db.flush()
     await db.refresh(task)
     return task
 
 async def soft_delete_task(db: AsyncSession, task: Task):
-    from datetime import datetime
     task.deleted_at = datetime.utcnow()
     await db.flush()
     await db.refresh(task)
@@ -82,6 +126,16 @@ async def get_tasks_by_status(db: AsyncSession, project_id: int):
     )
     return result.scalars().all()
 
+async def get_board_tasks(db: AsyncSession, project_id: int):
+    """Get all live tasks in a project with their assignee's name and email in one query"""
+    result = await db.execute(
+        select(Task, User.name, User.email)
+        .outerjoin(User, (Task.assigned_to == User.id) & User.deleted_at.is_(None))
+        .where(Task.project_id == project_id, Task.deleted_at.is_(None))
+        .order_by(Task.status_id, Task.rank, Task.id)
+    )
+    return result.all()
+
 async def get_tasks_by_assignee(db: AsyncSession, project_id: int, user_id: int):
     """Get all tasks assigned to a specific user in a project"""
     result = await db.execute(
@@ -1,8 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, tuple_
+from app.models.task import Task
 from app.models.task_comment import TaskComment
 from app.models.user import User
 from app.schemas.task_comment import TaskCommentCreate
+from app.crud import project as project_crud
+from datetime import datetime
+from typing import Optional
 
 async def create_comment(db: AsyncSession, task_id: int, comment: TaskCommentCreate, user_id: int):
     db_comment = TaskComment(
@@ -11,15 +15,33 @@ async def create_comment(db: AsyncSession, task_id: int, comment: TaskCommentCre
         comment=comment.comment
     )
     db.add(db_comment)
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(comment_count=Task.comment_count + 1)
+        .returning(Task.project_id)
+        .execution_options(synchronize_session=False)
+    )
+    # The board shows comment counts, so a new comment changes the project's version
+    project_id = result.scalar_one_or_none()
+    if project_id is not None:
+        await project_crud.bump_project_version(db, project_id)
     await db.flush()
     await db.refresh(db_comment)
     return db_comment
 
-async def get_task_comments(db: AsyncSession, task_id: int):
+async def get_task_comments(
+    db: AsyncSession,
+    task_id: int,
+    limit: int = 50,
+    before: Optional[tuple[datetime, int]] = None
+):
+    """Newest-first page of a task's comments; `before` is the (created_at, id) of the last comment seen"""
+    query = select(TaskComment, User.name).join(User).where(TaskComment.task_id == task_id)
+    if before is not None:
+        query = query.where(tuple_(TaskComment.created_at, TaskComment.id) < tuple_(*before))
     result = await db.execute(
-        select(TaskComment, User.name).join(User).where(
-            TaskComment.task_id == task_id
-        ).order_by(TaskComment.created_at.desc())
+        query.order_by(TaskComment.created_at.desc(), TaskComment.id.desc()).limit(limit)
     )
     comments = []
     for comment, user_name in result.all():
@@ -33,3 +55,16 @@ async def get_task_comments(db: AsyncSession, task_id: int):
         }
         comments.append(comment_dict)
     return comments
+
+async def recalculate_comment_counts(db: AsyncSession):
+    """Recompute every task's comment_count from the comments table in one statement"""
+    counted = (
+        select(func.count(TaskComment.id))
+        .where(TaskComment.task_id == Task.id)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(Task)
+        .values(comment_count=counted, updated_at=Task.updated_at)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,8 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.security.auth import get_password_hash
+from app.security.hashing import password_hasher
 
 async def get_user_by_email(db: AsyncSession, email: str):
     result = await db.execute(select(User).where(User.email == email, User.deleted_at.is_(None)))
@@ -12,8 +12,21 @@ async def get_user_by_id(db: AsyncSession, user_id: int):
     result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     return result.scalar_one_or_none()
 
+async def get_users_by_emails(db: AsyncSession, emails: list[str]):
+    if not emails:
+        return []
+    result = await db.execute(select(User).where(User.email.in_(emails), User.deleted_at.is_(None)))
+    return result.scalars().all()
+
+async def get_existing_user_ids(db: AsyncSession, user_ids: list[int]) -> set[int]:
+    """Return the subset of user_ids that belong to live users"""
+    if not user_ids:
+        return set()
+    result = await db.execute(select(User.id).where(User.id.in_(user_ids), User.deleted_at.is_(None)))
+    return set(result.scalars().all())
+
 async def create_user(db: AsyncSession, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
     db_user = User(
         name=user.name,
         email=user.email,
@@ -25,3 +38,13 @@ async def create_user(db: AsyncSession, user: UserCreate):
     await db.flush()
     await db.refresh(db_user)
     return db_user
+
+async def update_password_hash(db: AsyncSession, user_id: int, old_hash: str, new_hash: str) -> bool:
+    """Replace a user's hash only if it is still old_hash, so a concurrent password change wins"""
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
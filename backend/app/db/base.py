@@ -1,12 +1,139 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+import asyncio
+import logging
+import os
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import declarative_base, Session
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+logger = logging.getLogger(__name__)
+
+def _engine_options(url: str) -> dict:
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    # SQLite (local runs) manages its own pool sizing
+    if parsed.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+class ReadOnlySession(Session):
+    """Session for the read replica; refuses to write"""
+    
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Attempted to write through a read-only session")
+        super().flush(objects)
+
+class _LazySessionMaker(async_sessionmaker):
+    """Session factory that creates the engines on first use, for callers outside the app lifespan"""
+    
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            init_engines()
+        return super().__call__(**local_kw)
+
+# Bound to the engines by init_engines(); importing this module opens no pools
+AsyncSessionLocal = _LazySessionMaker(class_=AsyncSession, expire_on_commit=False)
+ReadSessionLocal = _LazySessionMaker(class_=AsyncSession, sync_session_class=ReadOnlySession, expire_on_commit=False)
+
+_engine: Optional[AsyncEngine] = None
+_read_engine: Optional[AsyncEngine] = None
+
+def init_engines() -> AsyncEngine:
+    """Create the primary (and read replica) engines if they don't exist yet; returns the primary"""
+    global _engine, _read_engine
+    if _engine is None:
+        engine = create_async_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+        instrument_engine(engine)
+        read_engine = engine
+        if settings.READ_DATABASE_URL:
+            read_engine = create_async_engine(settings.READ_DATABASE_URL, **_engine_options(settings.READ_DATABASE_URL))
+            instrument_engine(read_engine)
+        _engine, _read_engine = engine, read_engine
+        AsyncSessionLocal.configure(bind=engine)
+        ReadSessionLocal.configure(bind=read_engine)
+    return _engine
+
+def get_engine() -> AsyncEngine:
+    return init_engines()
+
+def get_read_engine() -> AsyncEngine:
+    init_engines()
+    return _read_engine
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """True when `db` reads from a separate read replica, which may lag behind the primary"""
+    return _read_engine is not None and _read_engine is not _engine and db.bind is _read_engine
+
+async def dispose_engines():
+    """Close every pooled connection and forget the engines; the next use creates them again"""
+    global _engine, _read_engine
+    engine, read_engine = _engine, _read_engine
+    _engine = _read_engine = None
+    AsyncSessionLocal.configure(bind=None)
+    ReadSessionLocal.configure(bind=None)
+    if read_engine is not None and read_engine is not engine:
+        await read_engine.dispose()
+    if engine is not None:
+        await engine.dispose()
+
+async def warm_pool(async_engine: AsyncEngine, connections: int):
+    """Open up to `connections` pooled connections concurrently so the first requests don't pay for connecting"""
+    size = getattr(async_engine.pool, "size", None)
+    # Pools that don't keep connections (NullPool, e.g. file SQLite) have nothing to warm
+    if size is None:
+        return
+    count = min(connections, size())
+    
+    async def connect():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    # All checked out at once, so each is a separate connection when they're returned to the pool
+    results = await asyncio.gather(*(connect() for _ in range(count)), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning("Pool warmup: %d of %d connections failed: %s", len(failures), count, failures[0])
+
+def _after_fork_in_child():
+    # Connections inherited from the parent belong to its sockets: drop them without closing,
+    # so a preloaded app forked into workers never shares a connection between processes
+    for engine in {id(e): e for e in (_engine, _read_engine) if e is not None}.values():
+        engine.sync_engine.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_db():
+    """Session on the read replica (or the primary when none is configured) for GET routes"""
+    async with ReadSessionLocal() as session:
+        yield session
+
+def pool_stats(async_engine) -> dict:
+    """Checked-out/idle/overflow connection counts for saturation monitoring"""
+    pool = async_engine.pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if method is not None:
+            stats[name] = method()
+    return stats
@@ -0,0 +1,20 @@
+from sqlalchemy import String
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Fractional rank keys must compare byte-wise; PostgreSQL's locale collations would reorder mixed case
+RankString = String().with_variant(String(collation="C"), "postgresql")
+
+def dialect_insert(db: AsyncSession, model):
+    """A dialect-specific INSERT (PostgreSQL or SQLite) that supports ON CONFLICT clauses"""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect_name}")
+    return insert(model)
+
+def insert_ignoring_conflicts(db: AsyncSession, model, index_elements: list[str]):
+    """INSERT ... ON CONFLICT DO NOTHING for the session's dialect"""
+    return dialect_insert(db, model).on_conflict_do_nothing(index_elements=index_elements)
@@ -0,0 +1,80 @@
+"""Full-text search index definitions.
+
+PostgreSQL indexes task and comment text with expression GIN indexes over weighted tsvectors
+(declared on the models), so the index is maintained by PostgreSQL on every write. SQLite,
+used for local runs, keeps an FTS5 table in sync through triggers. Both are incremental.
+"""
+from sqlalchemy import event
+from app.db.base import Base
+
+# Weighted tsvector documents. Queries must use these exact expressions for PostgreSQL to
+# pick the expression indexes, so they are defined once here.
+TASK_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+COMMENT_SEARCH_DOCUMENT = "setweight(to_tsvector('english', comment), 'C')"
+
+SQLITE_FTS_TABLE = "search_index"
+
+# rowid = 2 * task id for tasks and 2 * comment id + 1 for comments, so triggers update by rowid
+SQLITE_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, body, kind UNINDEXED, task_id UNINDEXED, comment_id UNINDEXED,
+        tokenize = 'porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_insert AFTER INSERT ON tasks
+    WHEN new.deleted_at IS NULL BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, body, kind, task_id, comment_id)
+        VALUES (new.id * 2, new.title, coalesce(new.description, ''), 'task', new.id, NULL);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_update AFTER UPDATE OF title, description, deleted_at ON tasks
+    BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.id * 2;
+        INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, body, kind, task_id, comment_id)
+        SELECT new.id * 2, new.title, coalesce(new.description, ''), 'task', new.id, NULL
+        WHERE new.deleted_at IS NULL;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_delete AFTER DELETE ON tasks BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.id * 2;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_comments_search_insert AFTER INSERT ON task_comments
+    WHEN new.deleted_at IS NULL BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, body, kind, task_id, comment_id)
+        VALUES (new.id * 2 + 1, '', new.comment, 'comment', new.task_id, new.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_comments_search_update AFTER UPDATE OF comment, deleted_at ON task_comments
+    BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.id * 2 + 1;
+        INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, body, kind, task_id, comment_id)
+        SELECT new.id * 2 + 1, '', new.comment, 'comment', new.task_id, new.id
+        WHERE new.deleted_at IS NULL;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_comments_search_delete AFTER DELETE ON task_comments BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.id * 2 + 1;
+    END""",
+]
+
+SQLITE_SEARCH_BACKFILL = [
+    f"""INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, body, kind, task_id, comment_id)
+    SELECT id * 2, title, coalesce(description, ''), 'task', id, NULL FROM tasks WHERE deleted_at IS NULL""",
+    f"""INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, body, kind, task_id, comment_id)
+    SELECT id * 2 + 1, '', comment, 'comment', task_id, id FROM task_comments WHERE deleted_at IS NULL""",
+]
+
+SQLITE_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS task_comments_search_delete",
+    "DROP TRIGGER IF EXISTS task_comments_search_update",
+    "DROP TRIGGER IF EXISTS task_comments_search_insert",
+    "DROP TRIGGER IF EXISTS tasks_search_delete",
+    "DROP TRIGGER IF EXISTS tasks_search_update",
+    "DROP TRIGGER IF EXISTS tasks_search_insert",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_sqlite_search_index(target, connection, **kw):
+    # metadata.create_all() (local SQLite setups) gets the same index as the migration
+    if connection.dialect.name == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            connection.exec_driver_sql(statement)
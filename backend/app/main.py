@@ -1,39 +1,137 @@
-from fastapi import FastAPI, Request
+"""ASGI entry point.
+
+Run with `uvicorn app.main:create_app --factory`; `app.main:app` still works and builds
+the app on first access. Importing this module doesn't read settings, import the routes
+or touch the database: create_app() loads settings and routes, and the lifespan creates
+the engines and pools in the worker process, so a pre-forking server (gunicorn --preload)
+never hands one connection to several workers.
+"""
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter 
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.extension import _rate_limit_exceeded_handler
-from app.api.routes import auth, projects, statuses, tasks, access_requests, notifications
 
-limiter = Limiter(key_func=get_remote_address)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.core.config import settings
+    from app.core.events import create_event_broker, set_event_broker
+    from app.core.metrics import metrics
+    from app.core.rate_limit import create_rate_limiter, set_rate_limiter
+    from app.db.base import AsyncSessionLocal, init_engines, dispose_engines, warm_pool
+    from app.security.hashing import password_hasher
+    from app.services.archive_worker import create_archive_worker
+    from app.services.notification_outbox_worker import create_outbox_worker
+    from app.services.project_deletion_worker import create_project_deletion_worker, set_project_deletion_worker
+
+    engine = init_engines()
+    if settings.DB_POOL_WARMUP:
+        await warm_pool(engine, settings.DB_POOL_WARMUP)
+
+    event_broker = create_event_broker(settings)
+    await event_broker.start()
+    set_event_broker(event_broker)
+
+    rate_limiter = create_rate_limiter(settings)
+    if rate_limiter is not None:
+        await rate_limiter.start()
+    set_rate_limiter(rate_limiter)
+
+    outbox_worker = create_outbox_worker(AsyncSessionLocal)
+    app.state.outbox_worker = outbox_worker
+    outbox_worker.start()
+    metrics.register_gauges(
+        "notification_outbox", "Notification outbox worker", lambda: {"delivered": outbox_worker.delivered}
+    )
+
+    deletion_worker = create_project_deletion_worker(AsyncSessionLocal)
+    set_project_deletion_worker(deletion_worker)
+    deletion_worker.start()
+    metrics.register_gauges("project_deletion", "Project deletion cascade jobs", deletion_worker.stats)
+
+    archive_worker = None
+    if settings.ARCHIVE_ENABLED:
+        archive_worker = create_archive_worker(AsyncSessionLocal)
+        archive_worker.start()
+        metrics.register_gauges(
+            "archived", "Soft-deleted rows moved to the archive tables", lambda: archive_worker.archived
+        )
+    try:
+        yield
+    finally:
+        if archive_worker is not None:
+            await archive_worker.stop()
+        set_project_deletion_worker(None)
+        await deletion_worker.stop()
+        await outbox_worker.stop()
+        await event_broker.stop()
+        if rate_limiter is not None:
+            set_rate_limiter(None)
+            await rate_limiter.stop()
+        password_hasher.shutdown()
+        await dispose_engines()
+
+def create_app() -> FastAPI:
+    from app.api.routes import (
+        auth, projects, statuses, tasks, access_requests, notifications, events, search, metrics as metrics_routes
+    )
+    from app.core.config import settings
+    from app.core.metrics import metrics, MetricsMiddleware
+    from app.core.pagination import NEXT_CURSOR_HEADER
+    from app.core.rate_limit import get_rate_limiter, enforce_rate_limit
+    from app.db.base import get_engine, get_read_engine, pool_stats
+    from app.security.hashing import password_hasher
+    from app.security.principal_cache import principal_cache
+
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(levelname)-5.5s [%(name)s] %(message)s")
 
-app = FastAPI(title="Kanban Task Management API")
+    # Limits are looked up per route in settings.RATE_LIMITS, falling back to RATE_LIMIT_DEFAULT
+    app = FastAPI(title="Kanban Task Management API", lifespan=lifespan, dependencies=[Depends(enforce_rate_limit)])
 
-app.state.limiter = limiter 
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["https://to-do-i1al-iufe0zk1k-aadils-projects-6d01c15f.vercel.app"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
+    )
 
-app.add_middleware(SlowAPIMiddleware) 
+    # Outermost, so it times the whole stack
+    app.add_middleware(MetricsMiddleware, query_budget=settings.REQUEST_QUERY_BUDGET)
+    metrics.register_gauges("principal_cache", "Authenticated principal cache", principal_cache.stats)
+    metrics.register_gauges(
+        "rate_limiter", "Rate limiter", lambda: get_rate_limiter().stats() if get_rate_limiter() else {}
+    )
+    metrics.register_gauges("password_hash", "Password hashing executor", password_hasher.stats)
+    metrics.register_gauges("db_pool_primary", "Primary database connection pool", lambda: pool_stats(get_engine()))
+    if settings.READ_DATABASE_URL:
+        metrics.register_gauges(
+            "db_pool_read", "Read replica connection pool", lambda: pool_stats(get_read_engine())
+        )
 
+    app.include_router(auth.router)
+    app.include_router(projects.router)
+    app.include_router(statuses.router)
+    app.include_router(tasks.router)
+    app.include_router(access_requests.router)
+    app.include_router(notifications.router)
+    app.include_router(events.router)
+    app.include_router(search.router)
+    app.include_router(metrics_routes.router)
 
+    @app.get("/")
+    async def root():
+        return {"message": "Kanban Task Management API"}
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["https://to-do-i1al-iufe0zk1k-aadils-projects-6d01c15f.vercel.app"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    return app
 
-app.include_router(auth.router)
-app.include_router(projects.router)
-app.include_router(statuses.router)
-app.include_router(tasks.router)
-app.include_router(access_requests.router)
-app.include_router(notifications.router)
+_app = None
 
-@app.get("/")
-@limiter.limit("10/minute")
-async def root(request:Request):
-    return {"message": "Kanban Task Management API"}
+def __getattr__(name: str):
+    # `app.main:app` for servers and scripts that expect a module-level app
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,5 +6,14 @@ from app.models.task import Task
 from app.models.task_comment import TaskComment
 from app.models.access_request import AccessRequest
 from app.models.notification import Notification
+from app.models.notification_outbox import NotificationOutbox
+from app.models.notification_counter import NotificationCounter
+from app.models.project_deletion_job import ProjectDeletionJob
+from app.models.archive import (
+    projects_archive, statuses_archive, project_members_archive, access_requests_archive, tasks_archive,
+    task_comments_archive
+)
 
-__all__ = ["User", "Project", "ProjectMember", "Status", "Task", "TaskComment", "AccessRequest", "Notification"]
+__all__ = ["User", "Project", "ProjectMember", "Status", "Task", "TaskComment", "AccessRequest", "Notification", "NotificationOutbox", "NotificationCounter", "ProjectDeletionJob",
+           "projects_archive", "statuses_archive", "project_members_archive", "access_requests_archive",
+           "tasks_archive", "task_comments_archive"]
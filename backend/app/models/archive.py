@@ -0,0 +1,34 @@
+"""Archive tables for soft-deleted rows, filled by app.services.archive_worker.
+
+Each mirrors its source table's columns plus `archived_at`, without foreign keys, so
+rows can be moved in any order and outlive their parents.
+"""
+from sqlalchemy import Table, Column, DateTime, Index
+from app.db.base import Base
+from app.models.access_request import AccessRequest
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.status import Status
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+
+def archive_table(model, *indexed: str) -> Table:
+    source = model.__table__
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, autoincrement=False, nullable=column.nullable)
+        for column in source.columns
+    ]
+    name = f"{source.name}_archive"
+    return Table(
+        name, Base.metadata,
+        *columns,
+        Column("archived_at", DateTime, nullable=False),
+        *(Index(f"ix_{name}_{column}", column) for column in indexed)
+    )
+
+projects_archive = archive_table(Project, "owner_id")
+statuses_archive = archive_table(Status, "project_id")
+project_members_archive = archive_table(ProjectMember, "project_id")
+access_requests_archive = archive_table(AccessRequest, "project_id")
+tasks_archive = archive_table(Task, "project_id")
+task_comments_archive = archive_table(TaskComment, "task_id")
@@ -1,10 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.models.mixins import TimestampMixin
 
 class Notification(Base, TimestampMixin):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_user_unread", "user_id",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = false")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.db.base import Base
+
+class NotificationCounter(Base):
+    """Denormalized per-user count of unread notifications"""
+    __tablename__ = "notification_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, default=0, server_default="0", nullable=False)
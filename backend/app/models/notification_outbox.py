@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Text
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+class NotificationOutbox(Base, TimestampMixin):
+    """Notifications recorded inside a request's transaction, delivered later by the outbox worker"""
+    __tablename__ = "notification_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(String, nullable=False)
+    related_id = Column(Integer, nullable=True)
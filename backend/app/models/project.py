@@ -1,10 +1,30 @@
-from sqlalchemy import Column, String, ForeignKey, Date, Text, Integer
+from sqlalchemy import Column, String, ForeignKey, Date, Text, Integer, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.models.mixins import TimestampMixin
 
 class Project(Base, TimestampMixin):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Trigram indexes back the substring search on /projects/available (PostgreSQL pg_trgm)
+        Index("ix_projects_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "ix_projects_technology_stack_trgm", "technology_stack",
+            postgresql_using="gin", postgresql_ops={"technology_stack": "gin_trgm_ops"}
+        ),
+        # Live projects only, for owner listings
+        Index(
+            "ix_projects_owner_live", "owner_id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL")
+        ),
+        # Soft-deleted projects by age, for the archiver
+        Index(
+            "ix_projects_deleted_at", "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -14,6 +34,13 @@ class Project(Base, TimestampMixin):
     technology_stack = Column(Text, nullable=True)  # JSON string of technologies
     team_size = Column(Integer, nullable=True)
 
+    # Denormalized task counters kept up to date by task create/move/delete
+    task_count = Column(Integer, default=0, server_default="0", nullable=False)
+    done_task_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Bumped by every task, status and membership write; the board/statuses/members ETags derive from it
+    version = Column(Integer, default=0, server_default="0", nullable=False)
+
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     owner = relationship("User", back_populates="projects")
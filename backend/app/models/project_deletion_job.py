@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, text
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+# Children are soft-deleted in this order; a job's phase is the one it is working through
+DELETION_PHASES = ("comments", "tasks", "statuses", "members")
+
+class ProjectDeletionJob(Base, TimestampMixin):
+    """Soft-deletes a deleted project's children in batches, driven by the project deletion worker.
+
+    Progress is committed with every batch, so a job survives restarts and resumes where it stopped.
+    """
+    __tablename__ = "project_deletion_jobs"
+    __table_args__ = (
+        Index(
+            "ix_project_deletion_jobs_unfinished", "next_attempt_at", "id",
+            postgresql_where=text("finished_at IS NULL"),
+            sqlite_where=text("finished_at IS NULL")
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # No foreign keys: jobs outlive their project once it is archived
+    project_id = Column(Integer, nullable=False, index=True)
+    requested_by = Column(Integer, nullable=True)
+    status = Column(String, default="pending", server_default="pending", nullable=False)  # pending, running, completed, failed
+    phase = Column(String, default=DELETION_PHASES[0], server_default=DELETION_PHASES[0], nullable=False)
+    comments_deleted = Column(Integer, default=0, server_default="0", nullable=False)
+    tasks_deleted = Column(Integer, default=0, server_default="0", nullable=False)
+    statuses_deleted = Column(Integer, default=0, server_default="0", nullable=False)
+    members_deleted = Column(Integer, default=0, server_default="0", nullable=False)
+    batches = Column(Integer, default=0, server_default="0", nullable=False)
+    failures = Column(Integer, default=0, server_default="0", nullable=False)
+    last_error = Column(Text, nullable=True)
+    # Set after a failed batch; the job isn't picked up again before then
+    next_attempt_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
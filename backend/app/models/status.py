@@ -1,15 +1,18 @@
-from sqlalchemy import Column, String, ForeignKey, Integer, UUID
-from uuid import uuid4
+from sqlalchemy import Column, String, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.dialect import RankString
 from app.models.mixins import TimestampMixin
 
 class Status(Base, TimestampMixin):
     __tablename__ = "statuses"
+    __table_args__ = (
+        Index("ix_statuses_project_rank", "project_id", "rank"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    position = Column(UUID(as_uuid=True), nullable=False, default=uuid4)
+    rank = Column(RankString, nullable=False)  # fractional rank, see app.core.ranking
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     
     project = relationship("Project", back_populates="statuses")
@@ -1,10 +1,35 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.dialect import RankString
+from app.db.search import TASK_SEARCH_DOCUMENT
 from app.models.mixins import TimestampMixin
 
 class Task(Base, TimestampMixin):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_status", "project_id", "status_id"),
+        Index("ix_tasks_status_rank", "status_id", "rank"),
+        Index("ix_tasks_project_assignee", "project_id", "assigned_to"),
+        Index(
+            "ix_tasks_project_live", "project_id", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL")
+        ),
+        # Live tasks in board order
+        Index(
+            "ix_tasks_board_live", "project_id", "status_id", "rank",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL")
+        ),
+        # Soft-deleted tasks by age, for the archiver
+        Index(
+            "ix_tasks_deleted_at", "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL")
+        ),
+        Index("ix_tasks_search", text(f"({TASK_SEARCH_DOCUMENT})"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -12,9 +37,13 @@ class Task(Base, TimestampMixin):
     priority = Column(String)
     due_date = Column(DateTime, nullable=True)
     status_id = Column(Integer, ForeignKey("statuses.id"), nullable=False)
+    rank = Column(RankString, nullable=False)  # order within the status column, see app.core.ranking
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
     
+    # Denormalized count of comments, kept up to date by create_comment
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
     status = relationship("Status", back_populates="tasks")
     project = relationship("Project", back_populates="tasks")
     assigned_user = relationship("User", back_populates="assigned_tasks")
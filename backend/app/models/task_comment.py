@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text 
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.search import COMMENT_SEARCH_DOCUMENT
 from app.models.mixins import TimestampMixin
 
 class TaskComment(Base, TimestampMixin):
     __tablename__ = "task_comments"
+    __table_args__ = (
+        # Scanned backwards for newest-first comment pages
+        Index("ix_task_comments_task_created", "task_id", "created_at", "id"),
+        Index("ix_task_comments_search", text(f"({COMMENT_SEARCH_DOCUMENT})"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -28,4 +28,28 @@ class ProjectMemberAdd(BaseModel):
     role: str = "member"
 
 class AddTeamMembersRequest(BaseModel):
-    emails: List[str]
\ No newline at end of file
+    emails: List[str]
+
+class ProjectDeletionResponse(BaseModel):
+    message: str
+    job_id: int
+    status_url: str
+
+class ProjectDeletionJobResponse(BaseModel):
+    id: int
+    project_id: int
+    status: str  # pending, running, completed, failed
+    phase: str  # the children currently being deleted: comments, tasks, statuses, members
+    comments_deleted: int
+    tasks_deleted: int
+    statuses_deleted: int
+    members_deleted: int
+    batches: int
+    failures: int
+    last_error: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,59 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Literal, Optional
+from app.schemas.project import ProjectBase
+
+# One NDJSON line of a project export is {"type": <record type>, "data": <one of these>}
+
+EXPORT_FORMAT = "taskhive-project-export"
+EXPORT_VERSION = 1
+
+class ExportHeader(BaseModel):
+    format: str
+    version: int
+    exported_at: Optional[datetime] = None
+
+class ExportProject(ProjectBase):
+    pass
+
+class ExportStatus(BaseModel):
+    id: int
+    name: str
+    rank: str
+
+class ExportMember(BaseModel):
+    email: str
+    name: Optional[str] = None
+    role: Literal["leader", "member"] = "member"
+
+class ExportTask(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    priority: Optional[str] = None
+    due_date: Optional[datetime] = None
+    status_id: int
+    rank: str
+    assignee_email: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class ExportComment(BaseModel):
+    id: int
+    task_id: int
+    author_email: Optional[str] = None
+    comment: str
+    created_at: Optional[datetime] = None
+
+class ExportTrailer(BaseModel):
+    statuses: int
+    members: int
+    tasks: int
+    comments: int
+
+class ProjectImportResult(BaseModel):
+    project_id: int
+    statuses: int
+    members: int
+    unmatched_members: int  # members not added: no account here, or not someone the importer shares a project with
+    tasks: int
+    comments: int
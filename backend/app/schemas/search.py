@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional, Tuple
+
+class SearchResult(BaseModel):
+    kind: Literal["task", "comment"]
+    task_id: int
+    comment_id: Optional[int] = None
+    project_id: int
+    title: str  # title of the task the match belongs to
+    snippet: str  # plain text, exactly as written; escape it like any other user content
+    highlights: List[Tuple[int, int]] = []  # [start, end) character offsets of the matched words in snippet
+    score: float
@@ -1,20 +1,27 @@
 from pydantic import BaseModel
 from datetime import datetime
-from uuid import UUID
+from typing import Optional
 
 class StatusBase(BaseModel):
     name: str
-    position: UUID
 
 class StatusCreate(StatusBase):
-    project_id: int 
+    project_id: int
+    # Neighbouring columns to place the new one between; appended to the board when both are omitted
+    after_status_id: Optional[int] = None
+    before_status_id: Optional[int] = None
 
 class StatusUpdate(BaseModel):
     name: str
 
+class StatusMove(BaseModel):
+    after_status_id: Optional[int] = None
+    before_status_id: Optional[int] = None
+
 class StatusResponse(StatusBase):
     id: int 
     project_id: int 
+    rank: str
     created_at: datetime
     
     model_config = {"from_attributes": True}
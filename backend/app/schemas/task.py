@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from uuid import UUID 
 
 class TaskBase(BaseModel):
@@ -23,13 +23,58 @@ class TaskUpdate(BaseModel):
 
 class TaskMove(BaseModel):
     new_status_id: int
+    # Neighbouring tasks in the target column; the task goes to the bottom when both are omitted
+    after_task_id: Optional[int] = None
+    before_task_id: Optional[int] = None
 
 class TaskResponse(TaskBase):
     id: int
     status_id: int
     project_id: int
     assigned_to: Optional[int] = None
+    rank: str
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
     
     model_config = {"from_attributes": True}
+
+class TaskBatchOperation(BaseModel):
+    """One item of a batch: `task` for create, `changes` for update, `new_status_id` for move"""
+    op: Literal["create", "update", "move", "delete"]
+    task_id: Optional[int] = None
+    task: Optional[TaskCreate] = None
+    changes: Optional[TaskUpdate] = None
+    new_status_id: Optional[int] = None
+    
+    @model_validator(mode="after")
+    def check_fields(self):
+        if self.op == "create":
+            if self.task is None:
+                raise ValueError("create requires 'task'")
+            return self
+        if self.task_id is None:
+            raise ValueError(f"{self.op} requires 'task_id'")
+        if self.op == "update" and self.changes is None:
+            raise ValueError("update requires 'changes'")
+        if self.op == "move" and self.new_status_id is None:
+            raise ValueError("move requires 'new_status_id'")
+        return self
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=500)
+    atomic: bool = False  # when true, any failed item rolls back the whole batch
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    op: str
+    success: bool
+    status_code: int
+    task_id: Optional[int] = None
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+class TaskBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBatchItemResult]
@@ -1,11 +1,19 @@
+import logging
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Prefer bcrypt_sha256 to avoid bcrypt's 72-byte password limit while
 # keeping plain bcrypt in the schemes list for backward compatibility
-pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256", "bcrypt"],
+    deprecated="auto",
+    bcrypt_sha256__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt_sha256__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -13,35 +21,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for plain bcrypt hashes or ones below the configured cost; cheap, no hashing involved"""
+    return pwd_context.needs_update(hashed_password)
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    print(f"[DEBUG] Creating token with data: {to_encode}")
-    print(f"[DEBUG] Using SECRET_KEY: {settings.SECRET_KEY[:10]}...")
-    print(f"[DEBUG] Algorithm: {settings.ALGORITHM}")
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    print(f"[DEBUG] Created token: {encoded_jwt[:50]}...")
+    logger.debug("Created access token for sub=%s expiring %s", to_encode.get("sub"), expire)
     return encoded_jwt
 
 def decode_access_token(token: str):
     try:
-        print(f"[DEBUG] ===== TOKEN DECODE START =====")
-        print(f"[DEBUG] Token (first 50 chars): {token[:50]}")
-        print(f"[DEBUG] SECRET_KEY (first 10 chars): {settings.SECRET_KEY[:10]}")
-        print(f"[DEBUG] Algorithm: {settings.ALGORITHM}")
-        
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        print(f"[DEBUG] ✅ Successfully decoded payload: {payload}")
-        print(f"[DEBUG] ===== TOKEN DECODE SUCCESS =====")
-        return payload
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError as e:
-        print(f"[DEBUG] ❌ JWT ERROR: {str(e)}")
-        print(f"[DEBUG] Error type: {type(e).__name__}")
-        print(f"[DEBUG] ===== TOKEN DECODE FAILED =====")
+        logger.debug("Access token rejected: %s", e)
         return None
-    except Exception as e:
-        print(f"[DEBUG] ❌ UNEXPECTED ERROR: {str(e)}")
-        print(f"[DEBUG] Error type: {type(e).__name__}")
+    except Exception:
+        logger.exception("Unexpected error decoding access token")
         return None
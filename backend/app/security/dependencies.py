@@ -1,21 +1,22 @@
-from fastapi import Depends, HTTPException, status
+import logging
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.base import get_db
+from app.db.base import get_db, AsyncSessionLocal
 from app.security.auth import decode_access_token
 from app.crud import user as user_crud
+from app.security.principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+logger = logging.getLogger(__name__)
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
-    print(f"[DEBUG] ===== GET_CURRENT_USER START =====")
-    print(f"[DEBUG] Raw token received from OAuth2PasswordBearer:")
-    print(f"[DEBUG] Token length: {len(token)}")
-    print(f"[DEBUG] Token (first 100 chars): {token[:100]}")
-    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -25,32 +26,47 @@ async def get_current_user(
     payload = decode_access_token(token)
     
     if payload is None:
-        print("[DEBUG] ❌ Payload is None - token decode failed")
-        print("[DEBUG] ===== GET_CURRENT_USER FAILED =====")
         raise credentials_exception
     
     # Get user_id as string from JWT (industry standard)
     user_id_str: str = payload.get("sub")
-    print(f"[DEBUG] User ID from token (string): {user_id_str}")
     
     if user_id_str is None:
-        print("[DEBUG] ❌ No 'sub' in payload")
+        logger.debug("Access token has no 'sub' claim")
         raise credentials_exception
     
     # Convert to int for database query
     try:
         user_id = int(user_id_str)
     except (ValueError, TypeError):
-        print(f"[DEBUG] ❌ Invalid user_id format: {user_id_str}")
+        logger.debug("Access token has a non-integer 'sub' claim: %r", user_id_str)
         raise credentials_exception
     
+    cached_user = principal_cache.get(user_id, token)
+    if cached_user is not None:
+        return cached_user
+    
     user = await user_crud.get_user_by_id(db, user_id=user_id)
-    print(f"[DEBUG] User found: {user.email if user else 'None'}")
     
     if user is None or user.deleted_at is not None:
-        print("[DEBUG] ❌ User not found or deleted")
+        logger.debug("User %s from access token not found or deleted", user_id)
         raise credentials_exception
     
-    print(f"[DEBUG] ✅ Authentication successful for user: {user.email}")
-    print("[DEBUG] ===== GET_CURRENT_USER SUCCESS =====")
+    principal_cache.set(token, user, token_expires_at=payload.get("exp"))
+    
     return user
+
+async def get_current_user_for_stream(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None, description="Bearer token, for clients such as EventSource that cannot set headers")
+):
+    """Authenticate a long-lived stream without tying a database session to its lifetime"""
+    token = header_token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    async with AsyncSessionLocal() as db:
+        return await get_current_user(token=token, db=db)
@@ -0,0 +1,81 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from app.core.config import settings
+from app.security.auth import verify_password, get_password_hash
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a dedicated executor, with a cap on concurrent operations.
+    
+    Callers beyond the cap wait on a semaphore; that wait is recorded as queue time.
+    """
+    
+    def __init__(self, executor_kind: str, workers: int, max_concurrency: int):
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.operations = 0
+        self.waiting = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+    
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+    
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def stats(self) -> dict:
+        return {
+            "operations": self.operations,
+            "waiting": self.waiting,
+            "queue_time_seconds_total": self.queue_time_total,
+            "queue_time_seconds_max": self.queue_time_max
+        }
+    
+    async def _run(self, func, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            queue_time = time.perf_counter() - queued_at
+            self.operations += 1
+            self.queue_time_total += queue_time
+            self.queue_time_max = max(self.queue_time_max, queue_time)
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._semaphore.release()
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # Spawned workers avoid inheriting the event loop and open connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            elif self.executor_kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            else:
+                raise ValueError(f"Unknown PASSWORD_HASH_EXECUTOR: {self.executor_kind}")
+        return self._executor
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY
+)
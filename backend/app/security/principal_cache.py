@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import event
+from app.core.config import settings
+from app.models.user import User
+
+class PrincipalCache:
+    """Bounded, TTL-based in-process cache of authenticated users keyed by (user id, token)"""
+    
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple[int, str], tuple[float, dict]]" = OrderedDict()
+        self._keys_by_user: dict[int, set] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+    
+    def get(self, user_id: int, token: str) -> Optional[User]:
+        if not self.enabled:
+            return None
+        key = (user_id, token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Hand out a fresh detached instance so callers never share state
+        return User(**values)
+    
+    def set(self, token: str, user: User, token_expires_at: Optional[float] = None):
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        if token_expires_at is not None:
+            # Never serve a principal past its token's own expiry
+            expires_at = min(expires_at, time.monotonic() + (token_expires_at - time.time()))
+        values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        key = (user.id, token)
+        self._entries[key] = (expires_at, values)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user.id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+    
+    def invalidate_user(self, user_id: int):
+        keys = self._keys_by_user.pop(user_id, None)
+        if not keys:
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+        self.invalidations += 1
+    
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_user.clear()
+    
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
+    
+    def _remove(self, key: tuple[int, str]):
+        self._entries.pop(key, None)
+        user_keys = self._keys_by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[key[0]]
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    """Drop cached principals whenever a user row changes (role, permissions, soft delete)"""
+    principal_cache.invalidate_user(target.id)
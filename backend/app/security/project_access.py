@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud import project as project_crud
+from app.db.base import AsyncSessionLocal, is_replica_session
+
+class ProjectAccessIndex:
+    """Answers "what is user U's role in project P" from a cached per-user map of project id to role.
+    
+    Each user's map is loaded with one query and kept until it expires or a membership
+    change (project creation, member addition, join approval, project deletion) invalidates it.
+    Invalidate after the membership change has been committed. The cache is only ever
+    filled from the primary: a lagging replica could otherwise re-cache roles that an
+    invalidation has just dropped.
+
+    Invalidation only reaches the worker that made the change, so only grants are trusted:
+    a project missing from a cached map is re-read from the primary before access is denied.
+    """
+    
+    def __init__(self, max_users: int, ttl_seconds: int):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._roles: "OrderedDict[int, tuple[float, dict[int, str]]]" = OrderedDict()
+        self._users_by_project: dict[int, set[int]] = {}
+    
+    async def get_roles(self, db: AsyncSession, user_id: int) -> dict[int, str]:
+        """Every project the user can access; may miss ones joined through another worker until the TTL"""
+        roles = self._cached(user_id)
+        if roles is not None:
+            return roles
+        
+        if self.ttl_seconds <= 0 or self.max_users <= 0:
+            return await project_crud.get_user_project_roles(db, user_id)
+        roles = await self._load(db, user_id)
+        self._store(user_id, roles)
+        return roles
+    
+    async def get_roles_for(self, db: AsyncSession, user_id: int, project_ids) -> dict[int, str]:
+        """The user's roles in the given projects, leaving out those they have no access to"""
+        roles = self._cached(user_id)
+        if roles is None:
+            roles = await self.get_roles(db, user_id)
+        else:
+            missing = [project_id for project_id in set(project_ids) if project_id not in roles]
+            if missing:
+                for project_id, role in (await self._load(db, user_id, missing)).items():
+                    roles[project_id] = role
+                    self._users_by_project.setdefault(project_id, set()).add(user_id)
+        return {project_id: roles[project_id] for project_id in project_ids if project_id in roles}
+    
+    async def get_role(self, db: AsyncSession, user_id: int, project_id: int) -> Optional[str]:
+        """Return the user's role in the project, or None if they have no access"""
+        roles = await self.get_roles_for(db, user_id, [project_id])
+        return roles.get(project_id)
+    
+    def invalidate_user(self, user_id: int):
+        entry = self._roles.pop(user_id, None)
+        if entry is None:
+            return
+        for project_id in entry[1]:
+            self._unlink(project_id, user_id)
+    
+    def invalidate_project(self, project_id: int):
+        for user_id in list(self._users_by_project.get(project_id, ())):
+            self.invalidate_user(user_id)
+    
+    def clear(self):
+        self._roles.clear()
+        self._users_by_project.clear()
+    
+    def _cached(self, user_id: int) -> Optional[dict[int, str]]:
+        entry = self._roles.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._roles.move_to_end(user_id)
+        return entry[1]
+    
+    async def _load(self, db: AsyncSession, user_id: int, project_ids: Optional[list[int]] = None) -> dict[int, str]:
+        if is_replica_session(db):
+            async with AsyncSessionLocal() as primary:
+                return await project_crud.get_user_project_roles(primary, user_id, project_ids)
+        return await project_crud.get_user_project_roles(db, user_id, project_ids)
+    
+    def _store(self, user_id: int, roles: dict[int, str]):
+        self.invalidate_user(user_id)
+        self._roles[user_id] = (time.monotonic() + self.ttl_seconds, roles)
+        for project_id in roles:
+            self._users_by_project.setdefault(project_id, set()).add(user_id)
+        while len(self._roles) > self.max_users:
+            oldest_user_id = next(iter(self._roles))
+            self.invalidate_user(oldest_user_id)
+    
+    def _unlink(self, project_id: int, user_id: int):
+        users = self._users_by_project.get(project_id)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del self._users_by_project[project_id]
+
+project_access = ProjectAccessIndex(
+    max_users=settings.PROJECT_ACCESS_MAX_USERS,
+    ttl_seconds=settings.PROJECT_ACCESS_TTL_SECONDS
+)
@@ -4,6 +4,7 @@ from app.crud import access_request as access_request_crud, notification as noti
 from app.schemas.access_request import AccessRequestCreate
 from app.schemas.notification import NotificationCreate
 from app.models.user import User
+from app.security.project_access import project_access
 
 async def request_project_creation(db: AsyncSession, current_user: User, request: AccessRequestCreate):
     """User requests permission to create projects OR join a specific project"""
@@ -20,15 +21,7 @@ async def request_project_creation(db: AsyncSession, current_user: User, request
             )
         
         # Check if already a member
-        from app.models.project_member import ProjectMember
-        from sqlalchemy import select
-        result = await db.execute(
-            select(ProjectMember).where(
-                ProjectMember.project_id == request.project_id,
-                ProjectMember.user_id == current_user.id
-            )
-        )
-        if result.scalar_one_or_none():
+        if await project_access.get_role(db, current_user.id, request.project_id) is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="You are already a member of this project"
@@ -109,6 +102,11 @@ async def get_all_pending_requests(db: AsyncSession, current_user: User):
     # Get all pending requests
     all_requests = await access_request_crud.get_pending_requests(db)
     
+    # Projects the user leads, i.e. owns
+    user_roles = await project_access.get_roles_for(
+        db, current_user.id, [request["project_id"] for request in all_requests if request["project_id"]]
+    )
+    
     # Filter requests based on what user can approve
     filtered_requests = []
     for request in all_requests:
@@ -117,9 +115,7 @@ async def get_all_pending_requests(db: AsyncSession, current_user: User):
             filtered_requests.append(request)
         # User can only approve join_project requests for their own projects
         elif request["request_type"] == "join_project" and request["project_id"]:
-            from app.crud import project as project_crud
-            project = await project_crud.get_project_by_id(db, request["project_id"])
-            if project and project.owner_id == current_user.id:
+            if user_roles.get(request["project_id"]) == "leader":
                 filtered_requests.append(request)
     
     return filtered_requests
@@ -154,14 +150,10 @@ async def approve_or_reject_request(db: AsyncSession, request_id: int, approved:
     
     if approved:
         if request.request_type == "join_project":
-            # Add user to project as member
-            from app.models.project_member import ProjectMember
-            member = ProjectMember(
-                project_id=request.project_id,
-                user_id=request.requester_id,
-                role="member"
-            )
-            db.add(member)
+            # Add user to project as member (a no-op if they joined in the meantime)
+            from app.crud import project as project_crud
+            if await project_crud.add_project_members(db, request.project_id, [request.requester_id]):
+                await project_crud.bump_project_version(db, request.project_id)
             
             request_obj = await access_request_crud.approve_request(db, request_id, current_user.id)
             message_text = "approved"
@@ -178,7 +170,7 @@ async def approve_or_reject_request(db: AsyncSession, request_id: int, approved:
                     type="project_assigned",
                     related_id=request.project_id
                 )
-                await notification_crud.create_notification(db, notification)
+                await notification_crud.enqueue_notification(db, notification)
         else:
             # Grant create_project permission
             request_obj = await access_request_crud.approve_request(db, request_id, current_user.id)
@@ -191,7 +183,7 @@ async def approve_or_reject_request(db: AsyncSession, request_id: int, approved:
                     type="access_approved",
                     related_id=request_id
                 )
-                await notification_crud.create_notification(db, notification)
+                await notification_crud.enqueue_notification(db, notification)
     else:
         request_obj = await access_request_crud.reject_request(db, request_id, current_user.id)
         message_text = "rejected"
@@ -211,7 +203,9 @@ async def approve_or_reject_request(db: AsyncSession, request_id: int, approved:
                 type="access_rejected",
                 related_id=request_id
             )
-            await notification_crud.create_notification(db, notification)
+            await notification_crud.enqueue_notification(db, notification)
     
     await db.commit()
+    if approved and request.request_type == "join_project":
+        project_access.invalidate_user(request.requester_id)
     return {"message": f"Request {message_text}"}
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from app.core.config import settings
+from app.crud import archive as archive_crud
+
+logger = logging.getLogger(__name__)
+
+class ArchiveWorker:
+    """Background task that moves rows soft-deleted longer than the retention period into the *_archive tables.
+
+    Work is done in bounded batches, one short transaction each, so the hot tables are never
+    locked for long and an interrupted run simply resumes from what is left on the next tick.
+    """
+
+    def __init__(self, session_factory, retention: timedelta, batch_size: int, interval: float):
+        self.session_factory = session_factory
+        self.retention = retention
+        self.batch_size = batch_size
+        self.interval = interval
+        self.archived = {"tasks": 0, "comments": 0, "projects": 0}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run(), name="archive-worker")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def run_once(self) -> dict:
+        """Archive everything currently past retention; returns the rows moved by this run"""
+        cutoff = datetime.utcnow() - self.retention
+        moved = {"tasks": 0, "comments": 0, "projects": 0}
+
+        while not self._stopping.is_set():
+            async with self.session_factory() as db:
+                task_ids = await archive_crud.lock_expired_tasks(db, cutoff, self.batch_size)
+                tasks, comments = await archive_crud.archive_tasks(db, task_ids)
+                await db.commit()
+            moved["tasks"] += tasks
+            moved["comments"] += comments
+            if len(task_ids) < self.batch_size:
+                break
+
+        while not self._stopping.is_set():
+            async with self.session_factory() as db:
+                project_id = await archive_crud.lock_expired_project(db, cutoff)
+                if project_id is None:
+                    break
+                tasks, comments, finished = await archive_crud.archive_project_batch(db, project_id, self.batch_size)
+                await db.commit()
+            moved["tasks"] += tasks
+            moved["comments"] += comments
+            moved["projects"] += finished
+
+        for key, count in moved.items():
+            self.archived[key] += count
+        if any(moved.values()):
+            logger.info("Archived %(projects)d projects, %(tasks)d tasks and %(comments)d comments", moved)
+        return moved
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                # Each batch commits on its own; whatever is left is retried on the next tick
+                logger.exception("Archiving soft-deleted rows failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+def create_archive_worker(session_factory) -> ArchiveWorker:
+    return ArchiveWorker(
+        session_factory,
+        retention=timedelta(days=settings.ARCHIVE_RETENTION_DAYS),
+        batch_size=settings.ARCHIVE_BATCH_SIZE,
+        interval=settings.ARCHIVE_INTERVAL_SECONDS
+    )
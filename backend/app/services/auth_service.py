@@ -1,8 +1,14 @@
+import logging
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import HTTPException, status
+from fastapi import BackgroundTasks, HTTPException, status
 from app.crud import user as user_crud
+from app.db.base import AsyncSessionLocal
 from app.schemas.user import UserCreate
-from app.security.auth import verify_password, create_access_token
+from app.security.auth import create_access_token, password_needs_rehash
+from app.security.hashing import password_hasher
+
+logger = logging.getLogger(__name__)
 
 async def register_user(db: AsyncSession, user: UserCreate):
     try:
@@ -25,7 +31,12 @@ async def register_user(db: AsyncSession, user: UserCreate):
             detail=str(e)
         )
 
-async def login_user(db: AsyncSession, email: str, password: str):
+async def login_user(
+    db: AsyncSession,
+    email: str,
+    password: str,
+    background_tasks: Optional[BackgroundTasks] = None
+):
     user = await user_crud.get_user_by_email(db, email=email)
     
     if not user or user.deleted_at is not None:
@@ -35,15 +46,11 @@ async def login_user(db: AsyncSession, email: str, password: str):
         )
     
     try:
-        password_ok = verify_password(password, user.hashed_password)
+        password_ok = await password_hasher.verify(password, user.hashed_password)
     except ValueError as e:
         # bcrypt raises ValueError for passwords longer than 72 bytes.
-        # Log length for debugging (do NOT log the actual password in production).
-        try:
-            pw_len = len(password.encode('utf-8'))
-        except Exception:
-            pw_len = None
-        print(f"[DEBUG] Password verification error: {e}; password_len={pw_len}")
+        # Log length for debugging (never the actual password).
+        logger.debug("Password verification error: %s; password_len=%d", e, len(password.encode('utf-8')))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -55,6 +62,20 @@ async def login_user(db: AsyncSession, email: str, password: str):
             detail="Incorrect email or password"
         )
     
+    # Upgrade plain-bcrypt or low-cost hashes after the response has been sent
+    if background_tasks is not None and password_needs_rehash(user.hashed_password):
+        background_tasks.add_task(rehash_password, user.id, password, user.hashed_password)
+    
     # Convert user.id to string for JWT (industry standard)
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
+
+async def rehash_password(user_id: int, password: str, old_hash: str):
+    """Store a hash with the current scheme and cost for a user who just logged in"""
+    try:
+        new_hash = await password_hasher.hash(password)
+        async with AsyncSessionLocal() as db:
+            await user_crud.update_password_hash(db, user_id, old_hash, new_hash)
+            await db.commit()
+    except Exception:
+        logger.exception("Password rehash failed for user %s", user_id)
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import Optional
+from app.core.config import settings
+from app.crud import notification as notification_crud
+from app.services import realtime_service
+
+logger = logging.getLogger(__name__)
+
+class NotificationOutboxWorker:
+    """Background task that drains the notification outbox into the notifications table in batches"""
+    
+    def __init__(self, session_factory, batch_size: int, flush_interval: float):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.delivered = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+    
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run(), name="notification-outbox-worker")
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+    
+    async def flush(self) -> int:
+        """Deliver everything currently queued; returns the number of notifications delivered"""
+        total = 0
+        while True:
+            async with self.session_factory() as db:
+                recipients = await notification_crud.deliver_outbox_batch(db, self.batch_size)
+                await db.commit()
+                if recipients:
+                    await realtime_service.publish_unread_counts(db, recipients)
+            total += len(recipients)
+            if len(recipients) < self.batch_size:
+                break
+        self.delivered += total
+        return total
+    
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await self.flush()
+            except Exception:
+                # Undelivered rows stay in the outbox and are retried on the next tick
+                logger.exception("Notification outbox flush failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+        # Deliver whatever was queued before shutdown
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final notification outbox flush failed")
+
+def create_outbox_worker(session_factory) -> NotificationOutboxWorker:
+    return NotificationOutboxWorker(
+        session_factory,
+        batch_size=settings.NOTIFICATION_OUTBOX_BATCH_SIZE,
+        flush_interval=settings.NOTIFICATION_OUTBOX_FLUSH_INTERVAL_SECONDS
+    )
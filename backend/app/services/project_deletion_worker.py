@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Optional
+from app.core.config import settings
+from app.crud import project_deletion as project_deletion_crud
+
+logger = logging.getLogger(__name__)
+
+class ProjectDeletionWorker:
+    """Background task that runs project deletion jobs one short transaction (batch) at a time.
+
+    Jobs live in the database, so anything queued or half-done when a worker stops is picked up
+    again on the next start, by this process or any other.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int,
+        poll_interval: float,
+        retry_backoff: float = 30.0,
+        max_failures: int = 5
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.max_failures = max_failures
+        self.batches = 0
+        self.completed = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run(), name="project-deletion-worker")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def wake(self):
+        """Start on newly queued jobs now instead of at the next poll"""
+        self._wakeup.set()
+
+    async def run_pending(self) -> int:
+        """Run batches until no due job is left (or one fails); returns the batches run"""
+        batches = 0
+        while not self._stopping.is_set():
+            async with self.session_factory() as db:
+                job = await project_deletion_crud.lock_next_job(db)
+                if job is None:
+                    break
+                job_id = job.id
+                try:
+                    finished = await project_deletion_crud.run_job_batch(db, job, self.batch_size)
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    async with self.session_factory() as error_db:
+                        failed = await project_deletion_crud.record_failure(
+                            error_db, job_id, str(e), self.max_failures, self.retry_backoff
+                        )
+                        await error_db.commit()
+                    if failed is not None and failed.status == "failed":
+                        self.failed += 1
+                        logger.error("Project deletion job %d failed %d times; giving up", job_id, failed.failures)
+                    raise
+            batches += 1
+            self.batches += 1
+            if finished:
+                self.completed += 1
+                logger.info("Project deletion job %d completed", job_id)
+            # Let request handlers in; each batch already committed on its own
+            await asyncio.sleep(0)
+        return batches
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                await self.run_pending()
+            except Exception:
+                # The failed batch rolled back; the job resumes from its last committed batch once its backoff ends
+                logger.exception("Project deletion batch failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "completed": self.completed, "failed": self.failed}
+
+_project_deletion_worker: Optional[ProjectDeletionWorker] = None
+
+def get_project_deletion_worker() -> Optional[ProjectDeletionWorker]:
+    return _project_deletion_worker
+
+def set_project_deletion_worker(worker: Optional[ProjectDeletionWorker]):
+    global _project_deletion_worker
+    _project_deletion_worker = worker
+
+def create_project_deletion_worker(session_factory) -> ProjectDeletionWorker:
+    return ProjectDeletionWorker(
+        session_factory,
+        batch_size=settings.PROJECT_DELETION_BATCH_SIZE,
+        poll_interval=settings.PROJECT_DELETION_POLL_INTERVAL_SECONDS,
+        retry_backoff=settings.PROJECT_DELETION_RETRY_BACKOFF_SECONDS,
+        max_failures=settings.PROJECT_DELETION_MAX_FAILURES
+    )
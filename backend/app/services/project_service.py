@@ -1,18 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from fastapi import HTTPException, status
-from typing import List
-from uuid import uuid4
-from app.crud import project as project_crud, status as status_crud, notification as notification_crud
+from typing import List, Optional
+from app.crud import project as project_crud, status as status_crud, notification as notification_crud, user as user_crud
+from app.crud import project_deletion as project_deletion_crud
 import logging
 
 logger = logging.getLogger(__name__)
 from app.schemas.project import ProjectCreate
 from app.schemas.status import StatusCreate
 from app.schemas.notification import NotificationCreate
+from app.core.ranking import spread_ranks
 from app.models.user import User
-from app.models.task import Task
 from app.models.project_member import ProjectMember
+from app.security.project_access import project_access
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.etag import project_etag, etag_matches
+from app.services.project_deletion_worker import get_project_deletion_worker
 
 async def create_project(db: AsyncSession, project: ProjectCreate, current_user: User):
     try:
@@ -29,15 +33,16 @@ async def create_project(db: AsyncSession, project: ProjectCreate, current_user:
         
         # Create default statuses for the project
         default_statuses = [
-            StatusCreate(name="Todo", position=uuid4(), project_id=db_project.id),
-            StatusCreate(name="In Progress", position=uuid4(), project_id=db_project.id),
-            StatusCreate(name="Done", position=uuid4(), project_id=db_project.id)
+            StatusCreate(name="Todo", project_id=db_project.id),
+            StatusCreate(name="In Progress", project_id=db_project.id),
+            StatusCreate(name="Done", project_id=db_project.id)
         ]
         
-        for st in default_statuses:
-            await status_crud.create_status(db, st)
+        for st, rank in zip(default_statuses, spread_ranks(len(default_statuses))):
+            await status_crud.create_status(db, st, rank)
         
         await db.commit()
+        project_access.invalidate_user(current_user.id)
         return db_project
     except Exception as e:
         await db.rollback()
@@ -48,32 +53,12 @@ async def create_project(db: AsyncSession, project: ProjectCreate, current_user:
         )
 
 async def get_user_projects(db: AsyncSession, current_user: User):
-    # Get projects where user is owner OR team member
-    result = await db.execute(
-        select(project_crud.Project).join(
-            ProjectMember,
-            ProjectMember.project_id == project_crud.Project.id
-        ).where(
-            ProjectMember.user_id == current_user.id,
-            project_crud.Project.deleted_at.is_(None)
-        )
-    )
-    projects = result.scalars().all()
+    # Get projects where user is owner OR team member, with the user's role
+    rows = await project_crud.get_member_projects_with_role(db, current_user.id)
     
-    # Calculate progress and add role for each project
+    # Progress comes from the denormalized task counters on each project
     projects_with_progress = []
-    for project in projects:
-        progress = await calculate_project_progress(db, project.id)
-        
-        # Get user's role in this project
-        role_result = await db.execute(
-            select(ProjectMember.role).where(
-                ProjectMember.project_id == project.id,
-                ProjectMember.user_id == current_user.id
-            )
-        )
-        user_role = role_result.scalar()
-        
+    for project, user_role in rows:
         project_dict = {
             "id": project.id,
             "title": project.title,
@@ -85,42 +70,18 @@ async def get_user_projects(db: AsyncSession, current_user: User):
             "owner_id": project.owner_id,
             "created_at": project.created_at,
             "updated_at": project.updated_at,
-            "progress": progress,
+            "progress": calculate_project_progress(project.task_count, project.done_task_count),
             "user_role": user_role  # leader or member
         }
         projects_with_progress.append(project_dict)
     
     return projects_with_progress
 
-async def calculate_project_progress(db: AsyncSession, project_id: int) -> float:
-    """Calculate project completion percentage based on tasks"""
-    # Get total tasks
-    total_result = await db.execute(
-        select(func.count(Task.id)).where(
-            Task.project_id == project_id,
-            Task.deleted_at.is_(None)
-        )
-    )
-    total_tasks = total_result.scalar() or 0
-    
-    if total_tasks == 0:
+def calculate_project_progress(total_tasks: int, completed_tasks: int) -> float:
+    """Calculate project completion percentage from its task counters"""
+    if not total_tasks:
         return 0.0
     
-    # Get completed tasks (tasks in "Done" status)
-    completed_result = await db.execute(
-        select(func.count(Task.id)).where(
-            Task.project_id == project_id,
-            Task.deleted_at.is_(None),
-            Task.status_id.in_(
-                select(status_crud.Status.id).where(
-                    status_crud.Status.project_id == project_id,
-                    status_crud.Status.name == "Done"
-                )
-            )
-        )
-    )
-    completed_tasks = completed_result.scalar() or 0
-    
     return round((completed_tasks / total_tasks) * 100, 1)
 
 async def delete_project(db: AsyncSession, project_id: int, current_user: User):
@@ -139,9 +100,19 @@ async def delete_project(db: AsyncSession, project_id: int, current_user: User):
                 detail="Not authorized to delete this project"
             )
         
+        # The project disappears now; its tasks, comments, statuses and members follow in the background
         await project_crud.soft_delete_project(db, project)
+        job = await project_deletion_crud.create_job(db, project_id, current_user.id)
         await db.commit()
-        return {"message": "Project deleted successfully"}
+        project_access.invalidate_project(project_id)
+        worker = get_project_deletion_worker()
+        if worker is not None:
+            worker.wake()
+        return {
+            "message": "Project deleted successfully",
+            "job_id": job.id,
+            "status_url": f"/projects/deletion-jobs/{job.id}"
+        }
     except HTTPException:
         raise
     except Exception as e:
@@ -151,6 +122,16 @@ async def delete_project(db: AsyncSession, project_id: int, current_user: User):
             detail=str(e)
         )
 
+async def get_deletion_job(db: AsyncSession, job_id: int, current_user: User):
+    """Progress of a project deletion job, visible to the user who requested it"""
+    job = await project_deletion_crud.get_job(db, job_id)
+    if job is None or job.requested_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deletion job not found"
+        )
+    return job
+
 async def add_team_members(db: AsyncSession, project_id: int, emails: List[str], current_user: User):
     """Add team members to a project by their email addresses"""
     try:
@@ -168,47 +149,43 @@ async def add_team_members(db: AsyncSession, project_id: int, emails: List[str],
                 detail="Only project leader can add team members"
             )
         
-        added_members = []
-        not_found_emails = []
-        
+        # Resolve every email with one query, keeping the first spelling of each address
+        requested = {}
         for email in emails:
-            # Find user by email
-            result = await db.execute(
-                select(User).where(User.email == email.strip())
+            requested.setdefault(email.strip(), email)
+        users = await user_crud.get_users_by_emails(db, list(requested))
+        users_by_email = {user.email: user for user in users}
+        
+        not_found_emails = [
+            original for stripped, original in requested.items() if stripped not in users_by_email
+        ]
+        
+        # Skip users who already belong to the project, then add the rest in bulk
+        existing_ids = await project_crud.get_member_user_ids(db, project_id, [user.id for user in users])
+        candidate_ids = [user.id for user in users if user.id not in existing_ids]
+        added_user_ids = await project_crud.add_project_members(db, project_id, candidate_ids)
+        if added_user_ids:
+            await project_crud.bump_project_version(db, project_id)
+        
+        added_members = [
+            original for stripped, original in requested.items()
+            if stripped in users_by_email and users_by_email[stripped].id in added_user_ids
+        ]
+        
+        # Queue notifications for the added members
+        await notification_crud.enqueue_notifications(db, [
+            NotificationCreate(
+                user_id=user_id,
+                message=f"You have been added to project '{project.title}'",
+                type="project_assigned",
+                related_id=project_id
             )
-            user = result.scalar_one_or_none()
-            
-            if user:
-                # Check if already a member
-                existing = await db.execute(
-                    select(ProjectMember).where(
-                        ProjectMember.project_id == project_id,
-                        ProjectMember.user_id == user.id
-                    )
-                )
-                if not existing.scalar_one_or_none():
-                    # Add as team member
-                    member = ProjectMember(
-                        project_id=project_id,
-                        user_id=user.id,
-                        role="member"
-                    )
-                    db.add(member)
-                    added_members.append(email)
-                    
-                    # Create notification for the added member
-                    notification = NotificationCreate(
-                        user_id=user.id,
-                        message=f"You have been added to project '{project.title}'",
-                        type="project_assigned",
-                        related_id=project_id
-                    )
-                    created_notif = await notification_crud.create_notification(db, notification)
-                    print(f"✅ Created notification ID {created_notif.id} for user {user.email}")
-            else:
-                not_found_emails.append(email)
+            for user_id in added_user_ids
+        ])
         
         await db.commit()
+        for user_id in added_user_ids:
+            project_access.invalidate_user(user_id)
         
         return {
             "message": f"Added {len(added_members)} team members",
@@ -225,33 +202,42 @@ async def add_team_members(db: AsyncSession, project_id: int, emails: List[str],
         )
 
 
-async def get_project_members(db: AsyncSession, project_id: int, current_user: User):
-    """Get all members of a project including the owner"""
+async def get_project_members(
+    db: AsyncSession,
+    project_id: int,
+    current_user: User,
+    if_none_match: Optional[str] = None
+):
+    """Get all members of a project including the owner, as (members, etag).
+    
+    members is None when `if_none_match` already holds the current version.
+    """
     try:
-        # Check if project exists
-        project = await project_crud.get_project_by_id(db, project_id)
-        if not project:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Project not found"
-            )
-        
         # Check if user is a member or owner
-        is_owner = project.owner_id == current_user.id
-        result = await db.execute(
-            select(ProjectMember).where(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == current_user.id
-            )
-        )
-        is_member = result.scalar_one_or_none() is not None
+        role = await project_access.get_role(db, current_user.id, project_id)
         
-        if not is_owner and not is_member:
+        if role is None:
+            project = await project_crud.get_project_by_id(db, project_id)
+            if not project:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Project not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to view project members"
             )
         
+        version = await project_crud.get_project_version(db, project_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        etag = project_etag("members", project_id, version, current_user.id)
+        if etag_matches(if_none_match, etag):
+            return None, etag
+        
         # Get all project members with user info
         members_result = await db.execute(
             select(ProjectMember, User).join(
@@ -270,7 +256,7 @@ async def get_project_members(db: AsyncSession, project_id: int, current_user: U
                 "role": member.role
             })
         
-        return members
+        return members, etag
     except HTTPException:
         raise
     except Exception as e:
@@ -280,48 +266,41 @@ async def get_project_members(db: AsyncSession, project_id: int, current_user: U
         )
 
 
-async def get_available_projects(db: AsyncSession, current_user: User):
-    """Get all projects that the user is NOT a member of"""
-    try:
-        # Get all projects
-        all_projects_result = await db.execute(
-            select(project_crud.Project).where(
-                project_crud.Project.deleted_at.is_(None)
-            )
-        )
-        all_projects = all_projects_result.scalars().all()
-        
-        # Get projects where user is a member
-        user_projects_result = await db.execute(
-            select(ProjectMember.project_id).where(
-                ProjectMember.user_id == current_user.id
-            )
+async def get_available_projects(
+    db: AsyncSession,
+    current_user: User,
+    search: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+):
+    """Get a page of projects that the user is NOT a member of, plus the next-page cursor"""
+    position = decode_cursor(cursor)
+    after_id = position.get("id") if position else None
+    if position is not None and not isinstance(after_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
         )
-        user_project_ids = [row[0] for row in user_projects_result.all()]
+    
+    try:
+        rows = await project_crud.get_available_projects(db, current_user.id, search, limit, after_id)
         
-        # Filter out projects where user is already a member
         available_projects = []
-        for project in all_projects:
-            if project.id not in user_project_ids:
-                # Get owner info
-                owner_result = await db.execute(
-                    select(User).where(User.id == project.owner_id)
-                )
-                owner = owner_result.scalar_one_or_none()
-                
-                available_projects.append({
-                    "id": project.id,
-                    "title": project.title,
-                    "description": project.description,
-                    "technology_stack": project.technology_stack,
-                    "team_size": project.team_size,
-                    "owner_name": owner.name if owner else "Unknown",
-                    "created_at": project.created_at
-                })
+        for project, owner_name in rows:
+            available_projects.append({
+                "id": project.id,
+                "title": project.title,
+                "description": project.description,
+                "technology_stack": project.technology_stack,
+                "team_size": project.team_size,
+                "owner_name": owner_name or "Unknown",
+                "created_at": project.created_at
+            })
         
-        return available_projects
+        next_cursor = encode_cursor({"id": rows[-1][0].id}) if len(rows) == limit else None
+        return available_projects, next_cursor
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
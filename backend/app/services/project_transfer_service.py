@@ -0,0 +1,361 @@
+"""Streaming project export and import in NDJSON.
+
+An export is one JSON object per line: a header, the project, its statuses, its members,
+then every task immediately followed by its comments, and an end marker with record counts.
+Both directions hold at most one chunk of rows in memory.
+"""
+import json
+import logging
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from app.core.config import settings
+from app.crud import project as project_crud, project_transfer as project_transfer_crud, task as task_crud, user as user_crud
+from app.db.base import ReadSessionLocal
+from app.models.user import User
+from app.schemas.project import ProjectCreate
+from app.schemas.project_transfer import (
+    EXPORT_FORMAT, EXPORT_VERSION, ExportHeader, ExportProject, ExportStatus, ExportMember,
+    ExportTask, ExportComment, ExportTrailer
+)
+from app.security.project_access import project_access
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_BYTES = 64 * 1024
+MAX_IMPORT_LINE_BYTES = 1024 * 1024
+
+def _line(record_type: str, data: dict) -> str:
+    return json.dumps({"type": record_type, "data": data}, default=str, separators=(",", ":")) + "\n"
+
+async def authorize_export(db: AsyncSession, project_id: int, current_user: User):
+    role = await project_access.get_role(db, current_user.id, project_id)
+    if role is None:
+        project = await project_crud.get_project_by_id(db, project_id)
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+    if role != "leader":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the project leader can export this project"
+        )
+
+async def _export_lines(project_id: int):
+    yield_per = settings.EXPORT_YIELD_PER
+    # The response outlives the request's session, so the stream owns one
+    async with ReadSessionLocal() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            # One snapshot across all tables keeps the export consistent under concurrent writes
+            await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+        project = await project_crud.get_project_by_id(db, project_id)
+        if project is None:
+            return
+
+        yield _line("header", {"format": EXPORT_FORMAT, "version": EXPORT_VERSION, "exported_at": datetime.utcnow()})
+        yield _line("project", {
+            "title": project.title,
+            "description": project.description,
+            "start_date": project.start_date,
+            "end_date": project.end_date,
+            "technology_stack": project.technology_stack,
+            "team_size": project.team_size
+        })
+
+        counts = {"statuses": 0, "members": 0, "tasks": 0, "comments": 0}
+        async for status_obj in await project_transfer_crud.stream_statuses(db, project_id, yield_per):
+            counts["statuses"] += 1
+            yield _line("status", {"id": status_obj.id, "name": status_obj.name, "rank": status_obj.rank})
+
+        async for email, name, role in await project_transfer_crud.stream_members(db, project_id, yield_per):
+            counts["members"] += 1
+            yield _line("member", {"email": email, "name": name, "role": role})
+
+        current_task_id = None
+        async for row in await project_transfer_crud.stream_tasks_with_comments(db, project_id, yield_per):
+            if row.id != current_task_id:
+                current_task_id = row.id
+                counts["tasks"] += 1
+                yield _line("task", {
+                    "id": row.id,
+                    "title": row.title,
+                    "description": row.description,
+                    "priority": row.priority,
+                    "due_date": row.due_date,
+                    "status_id": row.status_id,
+                    "rank": row.rank,
+                    "assignee_email": row.assignee_email,
+                    "created_at": row.created_at
+                })
+            if row.comment_id is not None:
+                counts["comments"] += 1
+                yield _line("comment", {
+                    "id": row.comment_id,
+                    "task_id": row.id,
+                    "author_email": row.author_email,
+                    "comment": row.comment,
+                    "created_at": row.comment_created_at
+                })
+
+        yield _line("end", counts)
+
+async def export_project(project_id: int, compress: bool = False):
+    """Yield the project's NDJSON export in ~64 KiB chunks, gzipped on the fly when `compress`"""
+    encoder = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+    buffer, size = [], 0
+    async for line in _export_lines(project_id):
+        buffer.append(line)
+        size += len(line)
+        if size >= _CHUNK_BYTES:
+            data = "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+            data = encoder.compress(data) if encoder else data
+            if data:
+                yield data
+
+    data = "".join(buffer).encode("utf-8")
+    if encoder:
+        data = encoder.compress(data) + encoder.flush()
+    if data:
+        yield data
+
+def _inflate(decoder, data: bytes):
+    # Bounded output per call, so a small compressed body can't expand all at once
+    while data:
+        try:
+            yield decoder.decompress(data, _CHUNK_BYTES)
+        except zlib.error as e:
+            raise ValueError(f"Invalid gzip data: {e}")
+        data = decoder.unconsumed_tail
+
+async def _read_lines(chunks: AsyncIterator[bytes]):
+    """Split a plain or gzipped request body into lines without buffering it whole"""
+    decoder = None
+    sniffed = False
+    pending = b""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if not sniffed:
+            sniffed = True
+            if chunk[:2] == b"\x1f\x8b":
+                decoder = zlib.decompressobj(wbits=47)  # 32 + 15: accept a gzip header
+        for piece in (_inflate(decoder, chunk) if decoder else (chunk,)):
+            pending += piece
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+            if len(pending) > MAX_IMPORT_LINE_BYTES:
+                raise ValueError(f"Line longer than {MAX_IMPORT_LINE_BYTES} bytes")
+    if decoder:
+        if not decoder.eof:
+            raise ValueError("Gzip data is truncated")
+        pending += decoder.flush()
+    for line in pending.split(b"\n"):
+        if line.strip():
+            yield line
+
+class _ProjectImporter:
+    """Applies export records in order, bulk-inserting tasks and their comments a chunk at a time"""
+
+    def __init__(self, db: AsyncSession, owner: User, chunk_size: int):
+        self.db = db
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.project_id = None
+        self.header_seen = False
+        self.trailer = None
+        self.status_ids = {}  # exported status id -> new status id
+        self.pending_statuses = []
+        self.pending_members = []
+        self.pending_tasks = []  # (ExportTask, [ExportComment, ...])
+        self.member_ids = set()
+        self.read = {"statuses": 0, "members": 0, "tasks": 0, "comments": 0}
+        self.unmatched_members = 0
+
+    async def add(self, record_type, data):
+        if self.trailer is not None:
+            raise ValueError("Records after the end marker")
+        if not self.header_seen:
+            if record_type != "header":
+                raise ValueError("Missing export header")
+            header = ExportHeader.model_validate(data)
+            if header.format != EXPORT_FORMAT or header.version != EXPORT_VERSION:
+                raise ValueError(f"Unsupported export format {header.format!r} version {header.version}")
+            self.header_seen = True
+            return
+        if record_type == "project":
+            if self.project_id is not None:
+                raise ValueError("Duplicate project record")
+            await self._create_project(ExportProject.model_validate(data))
+            return
+        if self.project_id is None:
+            raise ValueError("The project record must come before its contents")
+
+        if record_type == "status":
+            self.read["statuses"] += 1
+            self.pending_statuses.append(ExportStatus.model_validate(data))
+        elif record_type == "member":
+            self.read["members"] += 1
+            self.pending_members.append(ExportMember.model_validate(data))
+            if len(self.pending_members) >= self.chunk_size:
+                await self._flush_members()
+        elif record_type == "task":
+            self.read["tasks"] += 1
+            await self._flush_statuses()
+            await self._flush_members()
+            if len(self.pending_tasks) >= self.chunk_size:
+                await self._flush_tasks()
+            self.pending_tasks.append((ExportTask.model_validate(data), []))
+        elif record_type == "comment":
+            self.read["comments"] += 1
+            comment = ExportComment.model_validate(data)
+            if not self.pending_tasks or self.pending_tasks[-1][0].id != comment.task_id:
+                raise ValueError(f"Comment {comment.id} does not follow its task {comment.task_id}")
+            self.pending_tasks[-1][1].append(comment)
+        elif record_type == "end":
+            self.trailer = ExportTrailer.model_validate(data)
+        else:
+            raise ValueError(f"Unknown record type {record_type!r}")
+
+    async def finish(self):
+        if self.trailer is None:
+            raise ValueError("Export is truncated: missing end marker")
+        if self.trailer.model_dump() != self.read:
+            raise ValueError(f"Record counts {self.read} do not match the end marker {self.trailer.model_dump()}")
+        await self._flush_statuses()
+        await self._flush_members()
+        await self._flush_tasks()
+        await project_crud.recalculate_task_counters(self.db, self.project_id)
+
+    async def _create_project(self, data: ExportProject):
+        project = await project_crud.create_project(self.db, ProjectCreate(**data.model_dump()), self.owner.id)
+        self.project_id = project.id
+        await project_crud.add_project_members(self.db, project.id, [self.owner.id], role="leader")
+
+    async def _flush_statuses(self):
+        if not self.pending_statuses:
+            return
+        new_ids = await project_transfer_crud.bulk_create_statuses(self.db, [
+            {"project_id": self.project_id, "name": status_obj.name, "rank": status_obj.rank}
+            for status_obj in self.pending_statuses
+        ])
+        self.status_ids.update(zip((status_obj.id for status_obj in self.pending_statuses), new_ids))
+        self.pending_statuses = []
+
+    async def _flush_members(self):
+        if not self.pending_members:
+            return
+        roles = {member.email: member.role for member in self.pending_members}
+        roles.pop(self.owner.email, None)  # the importer already leads the project
+        users = [
+            user for user in await user_crud.get_users_by_emails(self.db, list(roles)) if user.id != self.owner.id
+        ]
+        # Only people the importer already works with are added; nobody joins a project uninvited
+        collaborator_ids = await project_crud.get_collaborator_ids(self.db, self.owner.id, [user.id for user in users])
+        self.unmatched_members += len(roles) - len(collaborator_ids)
+        candidate_ids = defaultdict(list)
+        for user in users:
+            if user.id in collaborator_ids:
+                candidate_ids[roles[user.email]].append(user.id)
+        for role, user_ids in candidate_ids.items():
+            self.member_ids |= await project_crud.add_project_members(self.db, self.project_id, user_ids, role=role)
+        self.pending_members = []
+
+    def _comment_text(self, comment: ExportComment) -> str:
+        # Someone else's comment keeps its original author in the text only
+        if comment.author_email and comment.author_email != self.owner.email:
+            return f"Originally posted by {comment.author_email}:\n\n{comment.comment}"
+        return comment.comment
+
+    async def _flush_tasks(self):
+        if not self.pending_tasks:
+            return
+        # Tasks are only assigned to members of the imported project
+        emails = {task.assignee_email for task, _ in self.pending_tasks if task.assignee_email}
+        user_ids = {
+            user.email: user.id for user in await user_crud.get_users_by_emails(self.db, list(emails))
+            if user.id in self.member_ids or user.id == self.owner.id
+        }
+
+        now = datetime.utcnow()
+        rows = []
+        for task, comments in self.pending_tasks:
+            status_id = self.status_ids.get(task.status_id)
+            if status_id is None:
+                raise ValueError(f"Task {task.id} references unknown status {task.status_id}")
+            rows.append({
+                "title": task.title,
+                "description": task.description,
+                "priority": task.priority,
+                "due_date": task.due_date,
+                "status_id": status_id,
+                "rank": task.rank,
+                "project_id": self.project_id,
+                "assigned_to": user_ids.get(task.assignee_email),
+                "comment_count": len(comments),
+                "created_at": task.created_at or now
+            })
+        created = await task_crud.bulk_create_tasks(self.db, rows)
+
+        # Comments are posted by the importer; nobody else's name is put on them
+        await project_transfer_crud.bulk_create_comments(self.db, [
+            {
+                "task_id": db_task.id,
+                "user_id": self.owner.id,
+                "comment": self._comment_text(comment),
+                "created_at": comment.created_at or now
+            }
+            for db_task, (_, comments) in zip(created, self.pending_tasks)
+            for comment in comments
+        ])
+        self.pending_tasks = []
+        self.db.expunge_all()
+
+async def import_project(db: AsyncSession, chunks: AsyncIterator[bytes], current_user: User):
+    """Create a new project owned by the current user from a streamed export, in one transaction"""
+    importer = _ProjectImporter(db, current_user, settings.IMPORT_CHUNK_SIZE)
+    line_number = 0
+    try:
+        async for line in _read_lines(chunks):
+            line_number += 1
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")
+            await importer.add(record.get("type"), record.get("data"))
+        await importer.finish()
+        await db.commit()
+    except (ValueError, ValidationError) as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Line {line_number}: {e}"
+        )
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Project import failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+    project_access.invalidate_user(current_user.id)
+    for user_id in importer.member_ids:
+        project_access.invalidate_user(user_id)
+
+    return {
+        "project_id": importer.project_id,
+        "statuses": importer.read["statuses"],
+        "members": len(importer.member_ids),
+        "unmatched_members": importer.unmatched_members,
+        "tasks": importer.read["tasks"],
+        "comments": importer.read["comments"]
+    }
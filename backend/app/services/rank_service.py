@@ -0,0 +1,117 @@
+import logging
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import BackgroundTasks, HTTPException, status
+from app.core.config import settings
+from app.core.ranking import rank_between
+from app.crud import rank as rank_crud, project as project_crud, status as status_crud
+from app.db.base import AsyncSessionLocal
+from app.models.status import Status
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+async def _place(
+    db: AsyncSession,
+    model,
+    scope,
+    scope_id: int,
+    after_id: Optional[int],
+    before_id: Optional[int],
+    exclude_id: Optional[int]
+) -> str:
+    """Rank for an item placed right after `after_id` and/or right before `before_id` (end of list if neither)"""
+    if after_id is None and before_id is None:
+        last = (await rank_crud.get_last_ranks(db, model, scope, [scope_id])).get(scope_id)
+        if exclude_id is not None and last is not None:
+            # Ignore the item itself when it is already last, so re-placing it is a no-op
+            own = await rank_crud.get_item_rank(db, model, scope, scope_id, exclude_id)
+            if own == last:
+                return own
+        return rank_between(last, None)
+
+    lower = upper = None
+    for neighbour_id, label in ((after_id, "after"), (before_id, "before")):
+        if neighbour_id is None:
+            continue
+        if neighbour_id == exclude_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot place an item relative to itself"
+            )
+        rank = await rank_crud.get_item_rank(db, model, scope, scope_id, neighbour_id)
+        if rank is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Neighbour {neighbour_id} is not in the target list"
+            )
+        if label == "after":
+            lower = rank
+        else:
+            upper = rank
+
+    if upper is None:
+        upper = await rank_crud.get_adjacent_rank(db, model, scope, scope_id, lower, True, exclude_id)
+    elif lower is None:
+        lower = await rank_crud.get_adjacent_rank(db, model, scope, scope_id, upper, False, exclude_id)
+
+    if lower is not None and upper is not None and lower >= upper:
+        # Neighbours out of order or tied (two concurrent drops into the same gap)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Neighbouring items are not adjacent; reload and try again"
+        )
+    return rank_between(lower, upper)
+
+async def place_task(
+    db: AsyncSession,
+    status_id: int,
+    after_task_id: Optional[int] = None,
+    before_task_id: Optional[int] = None,
+    task_id: Optional[int] = None
+) -> str:
+    return await _place(db, Task, Task.status_id, status_id, after_task_id, before_task_id, task_id)
+
+async def place_status(
+    db: AsyncSession,
+    project_id: int,
+    after_status_id: Optional[int] = None,
+    before_status_id: Optional[int] = None,
+    status_id: Optional[int] = None
+) -> str:
+    return await _place(db, Status, Status.project_id, project_id, after_status_id, before_status_id, status_id)
+
+def needs_rebalance(rank: str) -> bool:
+    return len(rank) >= settings.RANK_REBALANCE_LENGTH
+
+def schedule_task_rebalance(background_tasks: Optional[BackgroundTasks], status_id: int, rank: str):
+    if background_tasks is not None and needs_rebalance(rank):
+        background_tasks.add_task(rebalance_task_column, status_id)
+
+def schedule_status_rebalance(background_tasks: Optional[BackgroundTasks], project_id: int, rank: str):
+    if background_tasks is not None and needs_rebalance(rank):
+        background_tasks.add_task(rebalance_project_statuses, project_id)
+
+async def rebalance_task_column(status_id: int):
+    """Re-space the task ranks of one status column after they have grown long"""
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await rank_crud.rebalance_ranks(db, Task, Task.status_id, status_id)
+            status_obj = await status_crud.get_status_by_id(db, status_id)
+            if status_obj is not None:
+                await project_crud.bump_project_version(db, status_obj.project_id)
+            await db.commit()
+        logger.info("Rebalanced %d task ranks in status %s", count, status_id)
+    except Exception:
+        logger.exception("Task rank rebalance failed for status %s", status_id)
+
+async def rebalance_project_statuses(project_id: int):
+    """Re-space the column ranks of one project after they have grown long"""
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await rank_crud.rebalance_ranks(db, Status, Status.project_id, project_id)
+            await project_crud.bump_project_version(db, project_id)
+            await db.commit()
+        logger.info("Rebalanced %d status ranks in project %s", count, project_id)
+    except Exception:
+        logger.exception("Status rank rebalance failed for project %s", project_id)
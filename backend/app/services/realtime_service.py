@@ -0,0 +1,65 @@
+import json
+import logging
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.events import get_event_broker, user_channel, project_channel
+from app.crud import notification as notification_crud
+from app.db.base import ReadSessionLocal
+from app.models.user import User
+from app.security.project_access import project_access
+
+logger = logging.getLogger(__name__)
+
+async def publish(channel: str, event: dict):
+    """Publish an event; a broker failure never fails the write that triggered it"""
+    try:
+        await get_event_broker().publish(channel, event)
+    except Exception:
+        logger.exception("Failed to publish %s event on %s", event.get("type"), channel)
+
+async def publish_task_event(event_type: str, task, **extra):
+    await publish(project_channel(task.project_id), {
+        "type": event_type,
+        "project_id": task.project_id,
+        "task_id": task.id,
+        "status_id": task.status_id,
+        "rank": task.rank,
+        "assigned_to": task.assigned_to,
+        **extra
+    })
+
+async def publish_unread_counts(db: AsyncSession, user_ids):
+    """Push the current unread-notification count to each user"""
+    counts = await notification_crud.get_unread_counts(db, list(set(user_ids)))
+    for user_id, count in counts.items():
+        await publish(user_channel(user_id), {"type": "unread_count", "count": count})
+
+def format_sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _accessible_channels(user_id: int) -> set[str]:
+    async with ReadSessionLocal() as db:
+        roles = await project_access.get_roles(db, user_id)
+    return {user_channel(user_id)} | {project_channel(project_id) for project_id in roles}
+
+async def event_stream(request: Request, current_user: User):
+    """Server-sent events for the user's unread count and task changes in their projects.
+    
+    Project subscriptions are refreshed on every heartbeat so membership changes take effect
+    without reconnecting. No database connection is held between events.
+    """
+    async with ReadSessionLocal() as db:
+        unread = await notification_crud.get_unread_count(db, current_user.id)
+    subscription = get_event_broker().subscribe(await _accessible_channels(current_user.id))
+    try:
+        yield format_sse("unread_count", {"type": "unread_count", "count": unread})
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": keepalive\n\n"
+                subscription.set_channels(await _accessible_channels(current_user.id))
+                continue
+            yield format_sse(event["type"], event)
+    finally:
+        subscription.close()
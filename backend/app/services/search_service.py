@@ -0,0 +1,44 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from app.core.pagination import encode_cursor, decode_cursor
+from app.crud import project as project_crud, search as search_crud
+from app.models.user import User
+from app.security.project_access import project_access
+
+async def search(
+    db: AsyncSession,
+    current_user: User,
+    query: str,
+    project_id: Optional[int] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+):
+    """Search tasks and comments in one project, or in every project the user can access"""
+    position = decode_cursor(cursor)
+    offset = position.get("offset") if position else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    if project_id is not None:
+        if await project_access.get_role(db, current_user.id, project_id) is None:
+            project = await project_crud.get_project_by_id(db, project_id)
+            if not project:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Project not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to search this project"
+            )
+        project_ids = [project_id]
+    else:
+        project_ids = list(await project_access.get_roles(db, current_user.id))
+    
+    results = await search_crud.search_project_content(db, project_ids, query.strip(), limit, offset)
+    next_cursor = encode_cursor({"offset": offset + limit}) if len(results) == limit else None
+    return results, next_cursor
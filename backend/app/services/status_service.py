@@ -1,10 +1,18 @@
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import HTTPException, status
+from fastapi import BackgroundTasks, HTTPException, status
 from app.crud import status as status_crud, project as project_crud
-from app.schemas.status import StatusCreate, StatusUpdate
+from app.schemas.status import StatusCreate, StatusUpdate, StatusMove
 from app.models.user import User
+from app.core.etag import project_etag, etag_matches
+from app.services import rank_service
 
-async def create_status(db: AsyncSession, status: StatusCreate, current_user: User):
+async def create_status(
+    db: AsyncSession,
+    status: StatusCreate,
+    current_user: User,
+    background_tasks: Optional[BackgroundTasks] = None
+):
     try:
         project = await project_crud.get_project_by_id(db, status.project_id)
         
@@ -20,8 +28,13 @@ async def create_status(db: AsyncSession, status: StatusCreate, current_user: Us
                 detail="Not authorized to modify this project"
             )
         
-        db_status = await status_crud.create_status(db, status)
+        rank = await rank_service.place_status(
+            db, status.project_id, status.after_status_id, status.before_status_id
+        )
+        db_status = await status_crud.create_status(db, status, rank)
+        await project_crud.bump_project_version(db, status.project_id)
         await db.commit()
+        rank_service.schedule_status_rebalance(background_tasks, status.project_id, rank)
         return db_status
     except HTTPException:
         raise
@@ -50,8 +63,57 @@ async def update_status(db: AsyncSession, status_id: int, status_update: StatusU
                 detail="Not authorized to modify this status"
             )
         
+        was_done = db_status.name == status_crud.DONE_STATUS_NAME
         updated_status = await status_crud.update_status_name(db, db_status, status_update.name)
+        
+        # Renaming a column into or out of "Done" changes which tasks count as completed
+        if was_done != (updated_status.name == status_crud.DONE_STATUS_NAME):
+            await project_crud.recalculate_task_counters(db, updated_status.project_id)
+        
+        await project_crud.bump_project_version(db, updated_status.project_id)
+        await db.commit()
+        return updated_status
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+async def move_status(
+    db: AsyncSession,
+    status_id: int,
+    status_move: StatusMove,
+    current_user: User,
+    background_tasks: Optional[BackgroundTasks] = None
+):
+    """Reorder a board column; only the moved status row is written"""
+    try:
+        db_status = await status_crud.get_status_by_id(db, status_id)
+        
+        if not db_status:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Status not found"
+            )
+        
+        project = await project_crud.get_project_by_id(db, db_status.project_id)
+        
+        if not project or project.owner_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to modify this status"
+            )
+        
+        rank = await rank_service.place_status(
+            db, db_status.project_id, status_move.after_status_id, status_move.before_status_id, db_status.id
+        )
+        updated_status = await status_crud.update_status_rank(db, db_status, rank)
+        await project_crud.bump_project_version(db, db_status.project_id)
         await db.commit()
+        rank_service.schedule_status_rebalance(background_tasks, db_status.project_id, rank)
         return updated_status
     except HTTPException:
         raise
@@ -62,7 +124,13 @@ async def update_status(db: AsyncSession, status_id: int, status_update: StatusU
             detail=str(e)
         )
 
-async def get_project_statuses(db: AsyncSession, project_id: int, current_user: User):
+async def get_project_statuses(
+    db: AsyncSession,
+    project_id: int,
+    current_user: User,
+    if_none_match: Optional[str] = None
+):
+    """Return (statuses, etag); statuses is None when `if_none_match` already holds the current version"""
     project = await project_crud.get_project_by_id(db, project_id)
     
     if not project:
@@ -77,4 +145,7 @@ async def get_project_statuses(db: AsyncSession, project_id: int, current_user:
             detail="Not authorized to view this project"
         )
     
-    return await status_crud.get_project_statuses(db, project_id)
+    etag = project_etag("statuses", project_id, project.version, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return None, etag
+    return await status_crud.get_project_statuses(db, project_id), etag
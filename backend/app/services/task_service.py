@@ -1,33 +1,27 @@
+from collections import defaultdict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from fastapi import HTTPException, status
-from app.crud import task as task_crud, project as project_crud, status as status_crud, user as user_crud
-from app.schemas.task import TaskCreate, TaskUpdate, TaskMove
+from fastapi import BackgroundTasks, HTTPException, status
+from app.core.ranking import rank_between
+from app.crud import (
+    task as task_crud, project as project_crud, status as status_crud, user as user_crud,
+    rank as rank_crud, task_comment as task_comment_crud
+)
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskUpdate, TaskMove, TaskBatchRequest, TaskResponse
 from app.models.user import User
-from app.models.project_member import ProjectMember
+from app.security.project_access import project_access
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.etag import project_etag, etag_matches
+from app.services import rank_service, realtime_service
+from datetime import datetime
 from typing import Optional
 
-async def is_project_member(db: AsyncSession, user_id: int, project_id: int) -> tuple[bool, str]:
-    """Check if user is project member and return role"""
-    # Check if owner
-    project = await project_crud.get_project_by_id(db, project_id)
-    if project and project.owner_id == user_id:
-        return True, "leader"
-    
-    # Check if team member
-    result = await db.execute(
-        select(ProjectMember).where(
-            ProjectMember.user_id == user_id,
-            ProjectMember.project_id == project_id
-        )
-    )
-    membership = result.scalar_one_or_none()
-    if membership:
-        return True, membership.role
-    
-    return False, None
-
-async def create_task(db: AsyncSession, task: TaskCreate, current_user: User):
+async def create_task(
+    db: AsyncSession,
+    task: TaskCreate,
+    current_user: User,
+    background_tasks: Optional[BackgroundTasks] = None
+):
     try:
         project = await project_crud.get_project_by_id(db, task.project_id)
         if not project:
@@ -57,8 +51,17 @@ async def create_task(db: AsyncSession, task: TaskCreate, current_user: User):
                     detail="Assigned user not found"
                 )
         
-        db_task = await task_crud.create_task(db, task)
+        rank = await rank_service.place_task(db, task.status_id)
+        db_task = await task_crud.create_task(db, task, rank)
+        await project_crud.adjust_task_counters(
+            db, task.project_id,
+            total_delta=1,
+            done_delta=1 if task_status.name == status_crud.DONE_STATUS_NAME else 0
+        )
+        await project_crud.bump_project_version(db, task.project_id)
         await db.commit()
+        rank_service.schedule_task_rebalance(background_tasks, task.status_id, rank)
+        await realtime_service.publish_task_event("task_created", db_task)
         return db_task
     except HTTPException:
         raise
@@ -69,7 +72,13 @@ async def create_task(db: AsyncSession, task: TaskCreate, current_user: User):
             detail=str(e)
         )
 
-async def move_task(db: AsyncSession, task_id: int, task_move: TaskMove, current_user: User):
+async def move_task(
+    db: AsyncSession,
+    task_id: int,
+    task_move: TaskMove,
+    current_user: User,
+    background_tasks: Optional[BackgroundTasks] = None
+):
     try:
         task = await task_crud.get_task_by_id(db, task_id)
         
@@ -80,9 +89,9 @@ async def move_task(db: AsyncSession, task_id: int, task_move: TaskMove, current
             )
         
         # Check if user is project member or leader
-        is_member, role = await is_project_member(db, current_user.id, task.project_id)
+        role = await project_access.get_role(db, current_user.id, task.project_id)
         
-        if not is_member:
+        if role is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to move this task"
@@ -102,8 +111,26 @@ async def move_task(db: AsyncSession, task_id: int, task_move: TaskMove, current
                 detail="New status not found"
             )
         
-        updated_task = await task_crud.move_task(db, task, task_move.new_status_id)
+        if new_status.id != task.status_id:
+            old_status = await status_crud.get_status_by_id(db, task.status_id)
+            was_done = old_status is not None and old_status.name == status_crud.DONE_STATUS_NAME
+            is_done = new_status.name == status_crud.DONE_STATUS_NAME
+            await project_crud.adjust_task_counters(
+                db, task.project_id, done_delta=int(is_done) - int(was_done)
+            )
+        
+        # Only this task's row is written, wherever it lands in the column
+        rank = await rank_service.place_task(
+            db, new_status.id, task_move.after_task_id, task_move.before_task_id, task.id
+        )
+        previous_status_id = task.status_id
+        updated_task = await task_crud.move_task(db, task, task_move.new_status_id, rank)
+        await project_crud.bump_project_version(db, task.project_id)
         await db.commit()
+        rank_service.schedule_task_rebalance(background_tasks, new_status.id, rank)
+        await realtime_service.publish_task_event(
+            "task_moved", updated_task, previous_status_id=previous_status_id
+        )
         return updated_task
     except HTTPException:
         raise
@@ -132,8 +159,16 @@ async def delete_task(db: AsyncSession, task_id: int, current_user: User):
                 detail="Not authorized to delete this task"
             )
         
+        task_status = await status_crud.get_status_by_id(db, task.status_id)
+        await project_crud.adjust_task_counters(
+            db, task.project_id,
+            total_delta=-1,
+            done_delta=-1 if task_status and task_status.name == status_crud.DONE_STATUS_NAME else 0
+        )
         await task_crud.soft_delete_task(db, task)
+        await project_crud.bump_project_version(db, task.project_id)
         await db.commit()
+        await realtime_service.publish_task_event("task_deleted", task)
         return {"message": "Task deleted successfully"}
     except HTTPException:
         raise
@@ -144,6 +179,197 @@ async def delete_task(db: AsyncSession, task_id: int, current_user: User):
             detail=str(e)
         )
 
+async def batch_tasks(
+    db: AsyncSession,
+    batch: TaskBatchRequest,
+    current_user: User,
+    background_tasks: Optional[BackgroundTasks] = None
+):
+    """Apply many create/update/move/delete operations in one transaction.
+    
+    Every referenced task, project, status and assignee is loaded with one query per table,
+    each item is validated against the same rules as the single-task endpoints, and the
+    accepted items are written with bulk statements. Items are applied in order, so a later
+    operation sees the effect of an earlier one on the same task. Created and moved tasks
+    are appended to the bottom of their column in batch order.
+    """
+    operations = batch.operations
+    try:
+        task_ids = {operation.task_id for operation in operations if operation.task_id is not None}
+        tasks = {task.id: task for task in await task_crud.get_tasks_by_ids(db, list(task_ids))}
+        creates = [operation.task for operation in operations if operation.op == "create"]
+        
+        project_ids = {data.project_id for data in creates} | {task.project_id for task in tasks.values()}
+        projects = {project.id: project for project in await project_crud.get_projects_by_ids(db, list(project_ids))}
+        roles = await project_access.get_roles_for(db, current_user.id, project_ids)
+        
+        status_ids = (
+            {data.status_id for data in creates}
+            | {operation.new_status_id for operation in operations if operation.op == "move"}
+            | {task.status_id for task in tasks.values()}
+        )
+        statuses = {status_obj.id: status_obj for status_obj in await status_crud.get_statuses_by_ids(db, list(status_ids))}
+        
+        assignee_ids = {data.assigned_to for data in creates if data.assigned_to} | {
+            operation.changes.assigned_to for operation in operations
+            if operation.op == "update" and operation.changes.assigned_to is not None
+        }
+        assignees = await user_crud.get_existing_user_ids(db, list(assignee_ids))
+        
+        target_status_ids = {data.status_id for data in creates} | {
+            operation.new_status_id for operation in operations if operation.op == "move"
+        }
+        column_tails = await rank_crud.get_last_ranks(db, Task, Task.status_id, list(target_status_ids))
+        
+        original_status_ids = {task.id: task.status_id for task in tasks.values()}
+        changes = defaultdict(dict)
+        deleted = set()
+        pending_creates = []
+        
+        def current(task, column):
+            return changes.get(task.id, {}).get(column, getattr(task, column))
+        
+        def require_owner(project_id, detail):
+            project = projects.get(project_id)
+            if not project:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+            if project.owner_id != current_user.id:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        
+        def require_task(task_id):
+            if task_id not in tasks or task_id in deleted:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+            return tasks[task_id]
+        
+        def require_status(status_id, project_id, detail="Status not found"):
+            status_obj = statuses.get(status_id)
+            if status_obj is None or status_obj.project_id != project_id:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+        
+        def require_assignee(user_id):
+            if user_id not in assignees:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assigned user not found")
+        
+        def append_to_column(status_id):
+            column_tails[status_id] = rank_between(column_tails.get(status_id), None)
+            return column_tails[status_id]
+        
+        results = []
+        for index, operation in enumerate(operations):
+            try:
+                if operation.op == "create":
+                    data = operation.task
+                    require_owner(data.project_id, "Not authorized to create tasks in this project")
+                    require_status(data.status_id, data.project_id)
+                    if data.assigned_to:
+                        require_assignee(data.assigned_to)
+                    pending_creates.append((index, {**data.model_dump(), "rank": append_to_column(data.status_id)}))
+                elif operation.op == "update":
+                    task = require_task(operation.task_id)
+                    require_owner(task.project_id, "Not authorized to update this task")
+                    # Fields sent as null are cleared, e.g. to unassign a task or drop its due date
+                    values = operation.changes.model_dump(exclude_unset=True)
+                    if "title" in values and values["title"] is None:
+                        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Title cannot be empty")
+                    if values.get("assigned_to") is not None:
+                        require_assignee(values["assigned_to"])
+                    changes[task.id].update(values)
+                elif operation.op == "move":
+                    task = require_task(operation.task_id)
+                    if roles.get(task.project_id) is None:
+                        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to move this task")
+                    assignee = current(task, "assigned_to")
+                    if assignee is not None and assignee != current_user.id:
+                        raise HTTPException(
+                            status_code=status.HTTP_403_FORBIDDEN,
+                            detail="Only the assigned user can move this task"
+                        )
+                    require_status(operation.new_status_id, task.project_id, "New status not found")
+                    changes[task.id].update(
+                        status_id=operation.new_status_id, rank=append_to_column(operation.new_status_id)
+                    )
+                else:
+                    task = require_task(operation.task_id)
+                    require_owner(task.project_id, "Not authorized to delete this task")
+                    deleted.add(task.id)
+                results.append({"index": index, "op": operation.op, "success": True,
+                                "status_code": status.HTTP_200_OK, "task_id": operation.task_id})
+            except HTTPException as e:
+                results.append({"index": index, "op": operation.op, "success": False,
+                                "status_code": e.status_code, "task_id": operation.task_id, "error": e.detail})
+        
+        failed = sum(1 for result in results if not result["success"])
+        if batch.atomic and failed:
+            for result in results:
+                if result["success"]:
+                    result.update(success=False, status_code=status.HTTP_409_CONFLICT,
+                                  error="Not applied because another operation in the batch failed")
+            return {"succeeded": 0, "failed": len(results), "results": results}
+        
+        def is_done(status_id):
+            status_obj = statuses.get(status_id)
+            return status_obj is not None and status_obj.name == status_crud.DONE_STATUS_NAME
+        
+        # Net counter change per project, from each touched task's original and final state
+        deltas = defaultdict(lambda: [0, 0])
+        for _, row in pending_creates:
+            deltas[row["project_id"]][0] += 1
+            deltas[row["project_id"]][1] += int(is_done(row["status_id"]))
+        for task_id in set(changes) | deleted:
+            task = tasks[task_id]
+            was_done = int(is_done(original_status_ids[task_id]))
+            if task_id in deleted:
+                deltas[task.project_id][0] -= 1
+                deltas[task.project_id][1] -= was_done
+            else:
+                deltas[task.project_id][1] += int(is_done(current(task, "status_id"))) - was_done
+        
+        created = await task_crud.bulk_create_tasks(db, [row for _, row in pending_creates])
+        updated_ids = [task_id for task_id, values in changes.items() if values and task_id not in deleted]
+        await task_crud.bulk_update_tasks(db, [{"id": task_id, **changes[task_id]} for task_id in updated_ids])
+        await task_crud.bulk_soft_delete_tasks(db, list(deleted))
+        for project_id, (total_delta, done_delta) in deltas.items():
+            await project_crud.adjust_task_counters(db, project_id, total_delta=total_delta, done_delta=done_delta)
+            await project_crud.bump_project_version(db, project_id)
+        
+        final_tasks = {task.id: task for task in created}
+        final_tasks.update(
+            (task.id, task) for task in await task_crud.get_tasks_by_ids(db, updated_ids, refresh=True)
+        )
+        await db.commit()
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    for status_id, rank in column_tails.items():
+        rank_service.schedule_task_rebalance(background_tasks, status_id, rank)
+    for (index, _), task in zip(pending_creates, created):
+        results[index]["task_id"] = task.id
+    for result in results:
+        task = final_tasks.get(result["task_id"])
+        if result["success"] and task is not None:
+            result["task"] = TaskResponse.model_validate(task)
+    
+    for task in created:
+        await realtime_service.publish_task_event("task_created", task)
+    for task_id in updated_ids:
+        task = final_tasks[task_id]
+        if task.status_id != original_status_ids[task_id]:
+            await realtime_service.publish_task_event(
+                "task_moved", task, previous_status_id=original_status_ids[task_id]
+            )
+        else:
+            await realtime_service.publish_task_event("task_updated", task)
+    for task_id in deleted:
+        await realtime_service.publish_task_event("task_deleted", tasks[task_id])
+    
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
 async def get_project_tasks(
     db: AsyncSession,
     project_id: int,
@@ -152,8 +378,18 @@ async def get_project_tasks(
     priority: Optional[str] = None,
     assigned_to: Optional[int] = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None
 ):
+    """Get a page of tasks ordered by id, plus the cursor for the next page (None on the last page)"""
+    position = decode_cursor(cursor)
+    after_id = position.get("id") if position else None
+    if position is not None and not isinstance(after_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
     project = await project_crud.get_project_by_id(db, project_id)
     
     if not project:
@@ -168,63 +404,96 @@ async def get_project_tasks(
             detail="Not authorized to view tasks in this project"
         )
     
-    return await task_crud.get_project_tasks(
-        db, project_id, status_id, priority, assigned_to, limit, offset
+    tasks = await task_crud.get_project_tasks(
+        db, project_id, status_id, priority, assigned_to, limit, offset, after_id
     )
+    next_cursor = encode_cursor({"id": tasks[-1].id}) if len(tasks) == limit else None
+    return tasks, next_cursor
 
-async def get_kanban_board(db: AsyncSession, project_id: int, current_user: User):
-    project = await project_crud.get_project_by_id(db, project_id)
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+async def get_task_comments(db: AsyncSession, task_id: int, limit: int = 50, cursor: Optional[str] = None):
+    """Newest-first page of comments, plus the cursor for the next (older) page"""
+    position = decode_cursor(cursor)
+    before = None
+    if position is not None:
+        try:
+            before = (datetime.fromisoformat(position["created_at"]), int(position["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
     
+    comments = await task_comment_crud.get_task_comments(db, task_id, limit, before)
+    next_cursor = None
+    if len(comments) == limit:
+        last = comments[-1]
+        next_cursor = encode_cursor({"created_at": last["created_at"].isoformat(), "id": last["id"]})
+    return comments, next_cursor
+
+async def get_kanban_board(
+    db: AsyncSession,
+    project_id: int,
+    current_user: User,
+    if_none_match: Optional[str] = None
+):
+    """Return (board, etag); board is None when `if_none_match` already holds the current version"""
     # Check if user is project member or leader
-    is_member, role = await is_project_member(db, current_user.id, project_id)
+    role = await project_access.get_role(db, current_user.id, project_id)
     
-    if not is_member:
+    if role is None:
+        project = await project_crud.get_project_by_id(db, project_id)
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to view this project"
         )
     
+    # Read the version before the data: a write landing in between only makes the tag stale
+    version = await project_crud.get_project_version(db, project_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    etag = project_etag("board", project_id, version, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return None, etag
+    
     statuses = await status_crud.get_project_statuses(db, project_id)
     
-    # Both leaders and members see all tasks
-    tasks = await task_crud.get_tasks_by_status(db, project_id)
+    # Both leaders and members see all tasks, joined to their assignees
+    rows = await task_crud.get_board_tasks(db, project_id)
     
-    # Get assigned user info for each task
-    tasks_with_users = []
-    for task in tasks:
-        task_dict = {
+    # Group tasks into their columns in a single pass
+    tasks_by_status = {status_obj.id: [] for status_obj in statuses}
+    for task, user_name, user_email in rows:
+        column = tasks_by_status.get(task.status_id)
+        if column is None:
+            continue
+        column.append({
             "id": task.id,
             "title": task.title,
             "description": task.description,
             "status_id": task.status_id,
             "assigned_to": task.assigned_to,
-            "assigned_user_name": None,
-            "assigned_user_email": None
-        }
-        
-        if task.assigned_to:
-            assigned_user = await user_crud.get_user_by_id(db, task.assigned_to)
-            if assigned_user:
-                task_dict["assigned_user_name"] = assigned_user.name
-                task_dict["assigned_user_email"] = assigned_user.email
-        
-        tasks_with_users.append(task_dict)
+            "rank": task.rank,
+            "comment_count": task.comment_count,
+            "assigned_user_name": user_name,
+            "assigned_user_email": user_email
+        })
     
     board = []
     for status_obj in statuses:
-        status_tasks = [task for task in tasks_with_users if task["status_id"] == status_obj.id]
         board.append({
             "status_id": status_obj.id,
             "status_name": status_obj.name,
-            "tasks": status_tasks,
+            "tasks": tasks_by_status[status_obj.id],
             "user_role": role,
             "current_user_id": current_user.id  # Send current user ID to frontend
         })
     
-    return board
+    return board, etag
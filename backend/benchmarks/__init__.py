@@ -0,0 +1,14 @@
+"""Reproducible API benchmarks.
+
+Seeds a deterministic dataset with app.cli.generate_data, then drives the real ASGI app
+in-process through httpx and reports p50/p95/p99 latency, throughput and database queries
+per request for each scenario.
+
+Usage (from backend/):
+    python -m benchmarks --reset                                  # fresh ./benchmark.db
+    python -m benchmarks --database-url postgresql+asyncpg://... --reset --projects 200 --tasks-per-project lognormal:150,1
+    python -m benchmarks --reuse --scenarios board move --baseline benchmarks/results/before.json
+
+Startup time (import and app construction) is measured separately by benchmarks.startup:
+    python -m benchmarks.startup --baseline benchmarks/results/startup-before.json
+"""
@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+
+SCENARIO_NAMES = ["login", "board", "projects", "tasks", "notifications", "move"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Seed a dataset and benchmark the API in-process")
+    parser.add_argument("--database-url", default=os.environ.get("BENCHMARK_DATABASE_URL", "sqlite+aiosqlite:///./benchmark.db"))
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate the schema before seeding")
+    parser.add_argument("--reuse", action="store_true", help="Skip seeding; the database holds a dataset from the same options")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIO_NAMES, default=SCENARIO_NAMES)
+    parser.add_argument("--requests", type=int, default=500, help="Timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    # Dataset shape; distributions use app.cli.generate_data's syntax
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--members-per-project", default="fixed:8")
+    parser.add_argument("--tasks-per-project", default="fixed:150")
+    parser.add_argument("--comments-per-task", default="poisson:2")
+    parser.add_argument("--notifications-per-user", default="fixed:25")
+    parser.add_argument("--assignee-skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+    if args.reset and args.reuse:
+        parser.error("--reset and --reuse are mutually exclusive")
+    return args
+
+def main():
+    args = parse_args()
+    # Settings are read when app modules are imported, so configure the environment first
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("READ_DATABASE_URL", None)
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # The benchmark drives every request from one client address
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    from app.cli.generate_data import Distribution, GeneratorConfig
+    from benchmarks.seed import EMAIL_DOMAIN, PASSWORD, migrate
+    from benchmarks.runner import run
+
+    config = GeneratorConfig(
+        users=args.users,
+        projects=args.projects,
+        members_per_project=Distribution(args.members_per_project),
+        tasks_per_project=Distribution(args.tasks_per_project),
+        comments_per_task=Distribution(args.comments_per_task),
+        notifications_per_user=Distribution(args.notifications_per_user),
+        assignee_skew=args.assignee_skew,
+        password=PASSWORD,
+        email_domain=EMAIL_DOMAIN,
+        seed=args.seed,
+    )
+    if not args.reuse:
+        migrate(reset=args.reset)
+    output = args.output or Path(__file__).parent / "results" / f"{datetime.utcnow():%Y%m%dT%H%M%SZ}.json"
+    asyncio.run(run(
+        config, args.scenarios, args.requests, args.warmup, args.concurrency, output,
+        reuse=args.reuse, baseline=args.baseline
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Drive the ASGI app in-process and summarise latency, throughput and query counts."""
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import httpx
+import sqlalchemy
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.base import get_engine, dispose_engines
+from app.main import create_app
+from app.security.auth import create_access_token
+from benchmarks.scenarios import SCENARIOS, Scenario
+from app.cli.generate_data import GeneratorConfig
+from benchmarks.seed import BACKEND_DIR, Dataset, load_dataset, seed
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+def _auth_headers():
+    cache = {}
+    def auth(user_id: int) -> dict:
+        if user_id not in cache:
+            cache[user_id] = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+        return cache[user_id]
+    return auth
+
+async def _drive(client: httpx.AsyncClient, method: str, requests: list, concurrency: int):
+    latencies = [0.0] * len(requests)
+    status_codes = Counter()
+    pending = iter(range(len(requests)))
+
+    async def worker():
+        for index in pending:
+            path, kwargs = requests[index]
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies[index] = time.perf_counter() - started
+            status_codes[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, status_codes, time.perf_counter() - started
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    requests: int,
+    warmup: int,
+    concurrency: int
+) -> dict:
+    # Each scenario draws from its own stream, so selecting scenarios doesn't change the others' requests
+    rng = random.Random(f"{dataset.seed}:{scenario.name}")
+    auth = _auth_headers()
+    planned = [scenario.build(dataset, rng, auth) for _ in range(warmup + requests)]
+
+    if warmup:
+        await _drive(client, scenario.method, planned[:warmup], concurrency)
+
+    labels = (scenario.method, scenario.route)
+    queries_before = metrics.request_queries.totals(labels)
+    db_time_before = metrics.request_db_time.totals(labels)
+    latencies, status_codes, elapsed = await _drive(client, scenario.method, planned[warmup:], concurrency)
+    queries_after = metrics.request_queries.totals(labels)
+    db_time_after = metrics.request_db_time.totals(labels)
+
+    measured = max(queries_after[0] - queries_before[0], 1)
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for code, count in status_codes.items() if code >= 400),
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "queries_per_request": round((queries_after[1] - queries_before[1]) / measured, 2),
+        "db_ms_per_request": round((db_time_after[1] - db_time_before[1]) / measured * 1000, 3),
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_report(report: dict, baseline: Optional[dict] = None):
+    header = f"{'scenario':<14}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in report["scenarios"].items():
+        latency = result["latency_ms"]
+        print(
+            f"{name:<14}{result['throughput_rps']:>9.1f}{latency['p50']:>10.2f}{latency['p95']:>10.2f}"
+            f"{latency['p99']:>10.2f}{result['queries_per_request']:>9.1f}{result['errors']:>8}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous:
+            deltas = "  ".join(
+                f"{key} {(latency[key] - previous['latency_ms'][key]) / previous['latency_ms'][key] * 100:+.1f}%"
+                for key in ("p50", "p95", "p99") if previous["latency_ms"][key]
+            )
+            print(f"{'':<14}vs baseline: {deltas}  queries {result['queries_per_request'] - previous['queries_per_request']:+.1f}")
+
+async def run(
+    config: GeneratorConfig,
+    scenario_names: list[str],
+    requests: int,
+    warmup: int,
+    concurrency: int,
+    output: Path,
+    reuse: bool = False,
+    baseline: Optional[Path] = None
+) -> dict:
+    engine = get_engine()
+    if not reuse:
+        started = time.perf_counter()
+        counts = await seed(engine, config)
+        print(f"Seeded {sum(counts.values())} rows in {time.perf_counter() - started:.1f}s")
+    dataset = await load_dataset(engine, config.seed)
+
+    report = {
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "environment": {
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": make_url(settings.DATABASE_URL).render_as_string(hide_password=True),
+        },
+        "dataset": {
+            "generated": None if reuse else {key: str(value) for key, value in vars(config).items() if key != "password"},
+            "rows": dataset.counts,
+        },
+        "run": {"requests": requests, "warmup": warmup, "concurrency": concurrency},
+        "scenarios": {},
+    }
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        # Server errors come back as 500s and count as errors instead of aborting the run
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name in scenario_names:
+                report["scenarios"][name] = await run_scenario(
+                    client, SCENARIOS[name], dataset, requests, warmup, concurrency
+                )
+    await dispose_engines()
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print_report(report, json.loads(baseline.read_text()) if baseline else None)
+    print(f"Results written to {output}")
+    return report
@@ -0,0 +1,51 @@
+"""The request mixes the benchmark times, one per user-facing hot path."""
+from dataclasses import dataclass
+from typing import Callable
+from benchmarks.seed import Dataset, PASSWORD
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    route: str  # route template, as MetricsMiddleware labels it
+    build: Callable  # (dataset, rng, auth) -> (path, request kwargs)
+
+def _login(dataset: Dataset, rng, auth):
+    email = dataset.user_emails[rng.choice(list(dataset.user_emails))]
+    return "/auth/login", {"data": {"username": email, "password": PASSWORD}}
+
+def _board(dataset: Dataset, rng, auth):
+    project_id = rng.choice(list(dataset.members_by_project))
+    user_id = rng.choice(dataset.members_by_project[project_id])
+    return f"/tasks/board/{project_id}", {"headers": auth(user_id)}
+
+def _projects(dataset: Dataset, rng, auth):
+    return "/projects", {"headers": auth(rng.choice(list(dataset.user_emails)))}
+
+def _tasks(dataset: Dataset, rng, auth):
+    # Task listing is owner-only
+    project_id = rng.choice(list(dataset.owner_by_project))
+    return f"/tasks/project/{project_id}", {
+        "headers": auth(dataset.owner_by_project[project_id]), "params": {"limit": 100}
+    }
+
+def _notifications(dataset: Dataset, rng, auth):
+    return "/notifications", {"headers": auth(rng.choice(list(dataset.user_emails)))}
+
+def _move(dataset: Dataset, rng, auth):
+    # Only the assignee may move an assigned task
+    user_id, task_id, project_id = rng.choice(dataset.movable_tasks)
+    return f"/tasks/{task_id}/move", {
+        "headers": auth(user_id), "json": {"new_status_id": rng.choice(dataset.statuses_by_project[project_id])}
+    }
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario("login", "POST", "/auth/login", _login),
+        Scenario("board", "GET", "/tasks/board/{project_id}", _board),
+        Scenario("projects", "GET", "/projects", _projects),
+        Scenario("tasks", "GET", "/tasks/project/{project_id}", _tasks),
+        Scenario("notifications", "GET", "/notifications", _notifications),
+        Scenario("move", "PATCH", "/tasks/{task_id}/move", _move),
+    )
+}
@@ -0,0 +1,86 @@
+"""Benchmark dataset: written by app.cli.generate_data, then sampled for the scenarios."""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.cli.generate_data import GeneratorConfig, TABLE_ORDER, generate
+from app.models import User, Project, ProjectMember, Status, Task
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PASSWORD = "benchmark-password"
+EMAIL_DOMAIN = "bench.test"
+SAMPLE_SIZE = 1000  # users and projects the scenarios draw from, however large the database
+
+@dataclass
+class Dataset:
+    """What the scenarios need to know about the seeded rows"""
+    seed: int
+    user_emails: dict[int, str] = field(default_factory=dict)
+    owner_by_project: dict[int, int] = field(default_factory=dict)
+    members_by_project: dict[int, list[int]] = field(default_factory=dict)
+    statuses_by_project: dict[int, list[int]] = field(default_factory=dict)
+    # (user id, task id, project id) for tasks the user is allowed to move
+    movable_tasks: list[tuple[int, int, int]] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+
+def migrate(reset: bool = False):
+    """Bring the configured database to the current schema, dropping everything first if `reset`"""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    if reset:
+        command.downgrade(config, "base")
+    command.upgrade(config, "head")
+
+async def seed(engine: AsyncEngine, config: GeneratorConfig) -> dict:
+    """Generate the dataset into an empty, migrated database"""
+    async with engine.connect() as conn:
+        if await conn.scalar(select(func.count()).select_from(User.__table__)):
+            raise SystemExit("The benchmark database already has users; run with --reset or --reuse")
+    return await generate(config, engine, progress=lambda message: None)
+
+async def load_dataset(engine: AsyncEngine, seed: int) -> Dataset:
+    """Read a deterministic sample of the seeded users, projects and tasks back"""
+    dataset = Dataset(seed=seed)
+    async with engine.connect() as conn:
+        users = await conn.execute(
+            select(User.id, User.email)
+            .where(User.email.like(f"%@{EMAIL_DOMAIN}"), User.deleted_at.is_(None))
+            .order_by(User.id).limit(SAMPLE_SIZE)
+        )
+        dataset.user_emails = dict(users.all())
+
+        projects = await conn.execute(
+            select(Project.id, Project.owner_id).where(Project.deleted_at.is_(None)).order_by(Project.id).limit(SAMPLE_SIZE)
+        )
+        dataset.owner_by_project = dict(projects.all())
+        project_ids = list(dataset.owner_by_project)
+
+        members = defaultdict(list)
+        for project_id, user_id in await conn.execute(
+            select(ProjectMember.project_id, ProjectMember.user_id)
+            .where(ProjectMember.project_id.in_(project_ids)).order_by(ProjectMember.id)
+        ):
+            members[project_id].append(user_id)
+        dataset.members_by_project = dict(members)
+
+        statuses = defaultdict(list)
+        for project_id, status_id in await conn.execute(
+            select(Status.project_id, Status.id)
+            .where(Status.project_id.in_(project_ids), Status.deleted_at.is_(None)).order_by(Status.project_id, Status.rank)
+        ):
+            statuses[project_id].append(status_id)
+        dataset.statuses_by_project = dict(statuses)
+
+        movable = await conn.execute(
+            select(Task.assigned_to, Task.id, Task.project_id)
+            .where(Task.project_id.in_(project_ids), Task.assigned_to.is_not(None), Task.deleted_at.is_(None))
+            .order_by(Task.id).limit(SAMPLE_SIZE * 10)
+        )
+        dataset.movable_tasks = [tuple(row) for row in movable.all()]
+
+        for model in TABLE_ORDER:
+            dataset.counts[model.__tablename__] = await conn.scalar(select(func.count()).select_from(model.__table__))
+    return dataset
@@ -0,0 +1,146 @@
+"""Startup-time benchmark: how long a fresh interpreter takes to import and build the app.
+
+Each target runs in a new `python -X importtime` process, so nothing is cached between
+runs. The report gives the best wall time over --repeat runs, the slowest modules by
+their own import time, and whether importing the target pulled in modules it shouldn't
+(e.g. `import app.main` creating settings or importing the routes). Pass --baseline to
+compare against an earlier report; the exit status is 1 if a target regressed by more
+than --max-regression percent or imported a forbidden module.
+
+Usage (from backend/):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --baseline benchmarks/results/startup-before.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# name -> (statement timed in the child, modules it must not import)
+TARGETS = {
+    "import app.models": ("import app.models", ("fastapi", "app.api", "app.services")),
+    "import app.main": ("import app.main", ("app.core.config", "app.api", "app.db.base")),
+    "create_app()": ("from app.main import create_app; create_app()", ()),
+}
+
+END_MARKER = "-- startup benchmark: statement done --"
+
+CHILD = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+sys.stderr.write({marker!r} + "\\n")
+db = sys.modules.get("app.db.base")
+print(elapsed)
+print(" ".join(name for name in {forbidden!r} if name in sys.modules))
+print(int(db is not None and db._engine is not None))
+"""
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, self us, cumulative us) for each line of -X importtime output up to the end marker"""
+    modules = []
+    for line in stderr.splitlines():
+        if line == END_MARKER:
+            break
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+def measure(statement: str, forbidden: tuple, env: dict) -> dict:
+    code = CHILD.format(statement=statement, forbidden=forbidden, marker=END_MARKER)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode:
+        raise SystemExit(f"{statement!r} failed:\n{result.stderr[-2000:]}")
+    elapsed, leaked, engine_created = (result.stdout.splitlines() + ["", "", ""])[:3]
+    return {
+        "seconds": float(elapsed),
+        "forbidden_imports": leaked.split(),
+        "engine_created": engine_created == "1",
+        "modules": parse_importtime(result.stderr),
+    }
+
+def run_target(statement: str, forbidden: tuple, repeat: int, env: dict, top: int) -> dict:
+    runs = [measure(statement, forbidden, env) for _ in range(repeat)]
+    best = min(runs, key=lambda run: run["seconds"])
+    slowest = sorted(best["modules"], key=lambda module: module[1], reverse=True)[:top]
+    return {
+        "best_ms": round(best["seconds"] * 1000, 1),
+        "median_ms": round(sorted(run["seconds"] for run in runs)[len(runs) // 2] * 1000, 1),
+        "modules_imported": len(best["modules"]),
+        "forbidden_imports": sorted({name for run in runs for name in run["forbidden_imports"]}),
+        "engine_created": any(run["engine_created"] for run in runs),
+        "slowest_modules_ms": {name: round(self_us / 1000, 1) for name, self_us, _ in slowest},
+    }
+
+def check(report: dict, baseline: Optional[dict], max_regression: float) -> list[str]:
+    problems = []
+    for name, result in report["targets"].items():
+        if result["forbidden_imports"]:
+            problems.append(f"{name} imported {', '.join(result['forbidden_imports'])}")
+        if result["engine_created"]:
+            problems.append(f"{name} created a database engine")
+        previous = (baseline or {}).get("targets", {}).get(name)
+        if previous and previous["best_ms"]:
+            change = (result["best_ms"] - previous["best_ms"]) / previous["best_ms"] * 100
+            if change > max_regression:
+                problems.append(f"{name} is {change:.0f}% slower than the baseline ({previous['best_ms']} ms)")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Benchmark interpreter startup and app construction")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per target; the best run is reported")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules listed per target")
+    parser.add_argument("--output", type=Path, help="JSON results path (default: benchmarks/results/startup-<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier startup results to compare against")
+    parser.add_argument("--max-regression", type=float, default=25.0, help="Percent slower than the baseline that fails the run")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Settings must validate, but nothing here should connect to a database
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./startup-benchmark.db")
+    env.setdefault("SECRET_KEY", "startup-benchmark-secret-key")
+    env.setdefault("LOG_LEVEL", "WARNING")
+
+    report = {
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "targets": {
+            name: run_target(statement, forbidden, args.repeat, env, args.top)
+            for name, (statement, forbidden) in TARGETS.items()
+        },
+    }
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    for name, result in report["targets"].items():
+        previous = (baseline or {}).get("targets", {}).get(name)
+        versus = f"  (baseline {previous['best_ms']} ms)" if previous else ""
+        print(f"{name:<20}{result['best_ms']:>9.1f} ms best{result['median_ms']:>9.1f} ms median  "
+              f"{result['modules_imported']} modules{versus}")
+        for module, ms in list(result["slowest_modules_ms"].items())[:5]:
+            print(f"    {ms:>8.1f} ms  {module}")
+
+    output = args.output or Path(__file__).parent / "results" / f"startup-{datetime.utcnow():%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+    problems = check(report, baseline, args.max_regression)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
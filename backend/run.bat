@@ -1,3 +1,3 @@
 @echo off
 call venv\Scripts\activate.bat
-uvicorn app.main:app --reload
+uvicorn app.main:create_app --factory --reload
@@ -16,6 +16,5 @@ echo Next steps:
 echo 1. Create a .env file (copy from .env.example)
 echo 2. Update DATABASE_URL in .env with your PostgreSQL credentials
 echo 3. Run: venv\Scripts\activate
-echo 4. Run: alembic revision --autogenerate -m "Initial migration"
-echo 5. Run: alembic upgrade head
-echo 6. Run: uvicorn app.main:app --reload
+echo 4. Run: alembic upgrade head
+echo 5. Run: uvicorn app.main:create_app --factory --reload
@@ -0,0 +1,33 @@
+import os
+import pytest
+
+# Settings are read at import time; tests that need a database point them at their own files
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """A primary and a separate replica SQLite database, both with the schema; yields their URLs.
+
+    The replica is a copy taken when the fixture starts, so anything written afterwards
+    through the primary is missing from it, like a replica lagging behind.
+    """
+    import asyncio
+    import shutil
+    from app.core.config import settings
+    from app.db import base
+    import app.models  # noqa: F401
+
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{primary}")
+    monkeypatch.setattr(settings, "READ_DATABASE_URL", f"sqlite+aiosqlite:///{replica}")
+
+    async def create_schema():
+        async with base.get_engine().begin() as conn:
+            await conn.run_sync(base.Base.metadata.create_all)
+        await base.dispose_engines()
+
+    asyncio.run(create_schema())
+    shutil.copy(primary, replica)
+    yield settings.DATABASE_URL, settings.READ_DATABASE_URL
+    asyncio.run(base.dispose_engines())
@@ -0,0 +1,123 @@
+import asyncio
+from app.core.events import PostgresEventBroker, project_channel
+
+class FakeServer:
+    """Stands in for PostgreSQL's NOTIFY: delivers each notification to every listening connection"""
+
+    def __init__(self):
+        self.connections = []
+        self.down = False
+
+    async def connect(self, dsn):
+        if self.down:
+            raise OSError("connection refused")
+        connection = FakeConnection(self)
+        self.connections.append(connection)
+        return connection
+
+class FakeConnection:
+    def __init__(self, server: FakeServer):
+        self.server = server
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel, callback):
+        self.listeners.pop(channel, None)
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def execute(self, query, channel, payload):
+        if self.closed:
+            raise OSError("connection is closed")
+        for connection in self.server.connections:
+            callback = connection.listeners.get(channel)
+            if callback is not None and not connection.closed:
+                callback(connection, 1, channel, payload)
+
+    def terminate(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+def test_events_reach_every_worker():
+    async def run():
+        server = FakeServer()
+        brokers = [PostgresEventBroker("fake", connect=server.connect) for _ in range(2)]
+        for broker in brokers:
+            await broker.start()
+        subscription = brokers[1].subscribe([project_channel(1)])
+        await brokers[0].publish(project_channel(1), {"type": "task_created"})
+        assert await subscription.get(timeout=1) == {"type": "task_created"}
+        for broker in brokers:
+            await broker.stop()
+
+    asyncio.run(run())
+
+def test_reconnects_and_listens_again_after_the_connection_drops():
+    async def run():
+        server = FakeServer()
+        publisher = PostgresEventBroker("fake", connect=server.connect)
+        listener = PostgresEventBroker("fake", reconnect_delay=0.01, connect=server.connect)
+        await publisher.start()
+        await listener.start()
+        subscription = listener.subscribe([project_channel(1)])
+
+        # The database goes away for a while: the listener keeps retrying with backoff
+        server.down = True
+        listener._connection.terminate()
+        await asyncio.sleep(0.05)
+        try:
+            await listener.publish(project_channel(1), {"type": "lost"})
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("publish should fail while the connection is down")
+
+        server.down = False
+        for _ in range(100):
+            if listener.reconnects:
+                break
+            await asyncio.sleep(0.01)
+        assert listener.reconnects == 1
+
+        await publisher.publish(project_channel(1), {"type": "after_reconnect"})
+        assert await subscription.get(timeout=1) == {"type": "after_reconnect"}
+        await listener.publish(project_channel(1), {"type": "own"})
+        assert await subscription.get(timeout=1) == {"type": "own"}
+        await publisher.stop()
+        await listener.stop()
+
+    asyncio.run(run())
+
+def test_redis_broker_delivers_across_workers():
+    import fakeredis
+    from app.core.events import RedisEventBroker
+
+    async def run():
+        server = fakeredis.FakeServer()
+        brokers = [
+            RedisEventBroker("redis://test", client=fakeredis.aioredis.FakeRedis(server=server)) for _ in range(2)
+        ]
+        for broker in brokers:
+            await broker.start()
+        subscriptions = [broker.subscribe([project_channel(1)]) for broker in brokers]
+        other = brokers[1].subscribe([project_channel(2)])
+        await brokers[0].publish(project_channel(1), {"type": "task_moved", "task_id": 7})
+        for subscription in subscriptions:
+            assert await subscription.get(timeout=2) == {"type": "task_moved", "task_id": 7}
+        assert await other.get(timeout=0.2) is None
+        for broker in brokers:
+            await broker.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime
+from app.db.base import AsyncSessionLocal, ReadSessionLocal
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.user import User
+from app.security.project_access import ProjectAccessIndex
+
+async def add_user(db, user_id: int) -> User:
+    user = User(id=user_id, name=f"User {user_id}", email=f"user{user_id}@example.com", hashed_password="x")
+    db.add(user)
+    await db.flush()
+    return user
+
+def test_grant_made_through_another_worker_is_seen_before_the_ttl(databases):
+    # Two workers, each with its own cache; only the one making a change invalidates
+    writer, reader = ProjectAccessIndex(100, 60), ProjectAccessIndex(100, 60)
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            await add_user(db, 1)
+            await add_user(db, 2)
+            db.add(Project(id=1, title="Existing", owner_id=2))
+            await db.commit()
+        async with ReadSessionLocal() as db:
+            assert await reader.get_roles(db, 1) == {}
+
+        async with AsyncSessionLocal() as db:
+            db.add(Project(id=2, title="New", owner_id=1))
+            db.add(ProjectMember(project_id=1, user_id=1, role="member", created_at=datetime.utcnow()))
+            await db.commit()
+        writer.invalidate_user(1)
+
+        async with ReadSessionLocal() as db:
+            assert await reader.get_role(db, 1, 2) == "leader"
+            assert await reader.get_roles_for(db, 1, [1, 2, 3]) == {1: "member", 2: "leader"}
+            assert await reader.get_role(db, 1, 3) is None
+        # The grants found on the way are cached from then on
+        assert reader._roles[1][1] == {1: "member", 2: "leader"}
+
+    asyncio.run(run())
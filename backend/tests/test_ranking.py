@@ -0,0 +1,34 @@
+import random
+from app.core.config import settings
+from app.core.ranking import is_valid_rank, rank_between, ranks_after, spread_ranks
+
+def test_appends_stay_short():
+    ranks = ranks_after(None, 10_000)
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+    assert all(is_valid_rank(rank) for rank in ranks)
+    assert max(map(len, ranks)) < settings.RANK_REBALANCE_LENGTH // 2
+
+def test_append_after_a_long_rank_is_short():
+    long_rank = "V" + "3" * 30 + "x"
+    rank = rank_between(long_rank, None)
+    assert rank > long_rank
+    assert len(rank) == 1
+
+def test_append_after_spread_ranks_stays_short():
+    ranks = ranks_after(spread_ranks(5000)[-1], 10_000)
+    assert ranks == sorted(ranks)
+    assert max(map(len, ranks)) < settings.RANK_REBALANCE_LENGTH // 2
+
+def test_inserts_between_neighbours_keep_order():
+    ranks = ranks_after(None, 50)
+    generator = random.Random(0)
+    for _ in range(2000):
+        index = generator.randrange(len(ranks) + 1)
+        before = ranks[index - 1] if index else None
+        after = ranks[index] if index < len(ranks) else None
+        rank = rank_between(before, after)
+        assert is_valid_rank(rank)
+        assert (before is None or before < rank) and (after is None or rank < after)
+        ranks.insert(index, rank)
+    assert ranks == sorted(ranks)
@@ -0,0 +1,140 @@
+import asyncio
+import random
+import fakeredis
+import pytest
+from app.core.rate_limit import InMemoryRateLimitStorage, RateLimiter, RedisRateLimitStorage, parse_rate_limit
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class SharedMemoryStorage(InMemoryRateLimitStorage):
+    """One bucket store seen by several limiters, standing in for Redis"""
+
+    shared = True
+
+async def simulate(per_minute: int, limit_spec: str, workers: int = 4, minutes: int = 2, seed: int = 0):
+    """Send a client's requests evenly spaced, each to a random worker; returns (admitted, rejected)"""
+    clock = Clock()
+    storage = SharedMemoryStorage(clock=clock)
+    limit = parse_rate_limit("default", limit_spec)
+    limiters = [RateLimiter(storage, limit, clock=clock) for _ in range(workers)]
+    pick = random.Random(seed)
+    admitted = rejected = 0
+    next_sweep = 1.0
+    for i in range(per_minute * minutes):
+        clock.now = i * 60 / per_minute
+        # What each worker's background sweeper would have done by now
+        while next_sweep <= clock.now:
+            for limiter in limiters:
+                await limiter.release_expired(next_sweep)
+            next_sweep += 1.0
+        if await pick.choice(limiters).hit("default|user:1", limit):
+            rejected += 1
+        else:
+            admitted += 1
+    return admitted, rejected
+
+@pytest.mark.parametrize("per_minute", [60, 120, 300, 540, 590])
+def test_client_under_limit_is_never_rejected_across_workers(per_minute):
+    admitted, rejected = asyncio.run(simulate(per_minute, "600/minute", minutes=4))
+    assert rejected == 0
+    assert admitted == per_minute * 4
+
+def test_client_over_limit_is_held_to_it_across_workers():
+    admitted, rejected = asyncio.run(simulate(1200, "600/minute", minutes=2))
+    # The burst allowance plus two minutes of refill
+    assert rejected > 0
+    assert admitted <= 600 + 1200 + 1
+
+def test_slow_client_leases_single_tokens():
+    clock = Clock()
+    limit = parse_rate_limit("default", "600/minute")
+    limiter = RateLimiter(SharedMemoryStorage(clock=clock), limit, clock=clock)
+
+    async def run():
+        for i in range(20):
+            clock.now = i * 2.0
+            assert await limiter.hit("k", limit) == 0
+
+    asyncio.run(run())
+    assert limiter.fast_path_hits == 0
+    assert limiter.stats()["leases"] == 0
+
+def test_expired_lease_tokens_go_back_to_the_bucket():
+    clock = Clock()
+    storage = SharedMemoryStorage(clock=clock)
+    limit = parse_rate_limit("default", "100/hour")
+    limiter = RateLimiter(storage, limit, clock=clock)
+
+    async def run():
+        # A burst earns a lease of several tokens
+        for _ in range(50):
+            await limiter.hit("k", limit)
+        held = limiter._leases["k"][0]
+        assert held > 0
+        before = storage._buckets["k"][0]
+        clock.now = limiter.lease_ttl
+        assert await limiter.release_expired() == held
+        assert storage._buckets["k"][0] == pytest.approx(before + held + limit.refill_per_second * clock.now)
+        assert limiter.stats()["leases"] == 0
+
+    asyncio.run(run())
+
+def test_stop_returns_outstanding_leases():
+    clock = Clock()
+    storage = SharedMemoryStorage(clock=clock)
+    limit = parse_rate_limit("default", "100/hour")
+    limiter = RateLimiter(storage, limit, clock=clock)
+
+    async def run():
+        for _ in range(50):
+            await limiter.hit("k", limit)
+        held = limiter._leases["k"][0]
+        tokens = storage._buckets["k"][0]
+        await limiter.stop()
+        assert storage._buckets["k"][0] == tokens + held
+
+    asyncio.run(run())
+
+def redis_storage(server) -> RedisRateLimitStorage:
+    return RedisRateLimitStorage("redis://test", client=fakeredis.aioredis.FakeRedis(server=server))
+
+def test_redis_storage_takes_and_refunds():
+    limit = parse_rate_limit("default", "5/hour")
+
+    async def run():
+        storage = redis_storage(fakeredis.FakeServer())
+        await storage.start()
+        assert await storage.acquire("k", limit, 3) == (3, 0.0)
+        assert await storage.acquire("k", limit, 5) == (2, 0.0)
+        granted, wait = await storage.acquire("k", limit, 1)
+        assert granted == 0
+        assert 0 < wait <= 3600 / 5
+        # Returning two unspent tokens makes them available again
+        assert (await storage.acquire("k", limit, 0, 2))[0] == 0
+        assert (await storage.acquire("k", limit, 5))[0] == 2
+        await storage.stop()
+
+    asyncio.run(run())
+
+def test_redis_storage_is_shared_between_workers():
+    limit = parse_rate_limit("default", "30/hour")
+
+    async def run():
+        server = fakeredis.FakeServer()
+        limiters = [RateLimiter(redis_storage(server), limit) for _ in range(3)]
+        for limiter in limiters:
+            await limiter.start()
+        admitted = 0
+        for i in range(90):
+            if not await limiters[i % 3].hit("default|user:1", limit):
+                admitted += 1
+        for limiter in limiters:
+            await limiter.stop()
+        return admitted
+
+    assert asyncio.run(run()) == 30
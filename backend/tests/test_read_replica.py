@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.base import AsyncSessionLocal, ReadSessionLocal, get_read_engine
+from app.main import create_app
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.user import User
+from app.security.auth import create_access_token
+from app.security.project_access import ProjectAccessIndex
+
+def add_user(db, user_id: int = 1):
+    db.add(User(id=user_id, name=f"User {user_id}", email=f"user{user_id}@example.com", hashed_password="x"))
+
+def test_get_routes_read_from_the_replica(databases):
+    async def run():
+        # The same project under a different title on each side shows which one answered
+        async with AsyncSessionLocal() as db:
+            add_user(db)
+            db.add(Project(id=1, title="On the primary", owner_id=1))
+            db.add(ProjectMember(project_id=1, user_id=1, role="leader", created_at=datetime.utcnow()))
+            await db.commit()
+        async with AsyncSession(get_read_engine()) as db:
+            add_user(db)
+            db.add(Project(id=1, title="On the replica", owner_id=1))
+            db.add(ProjectMember(project_id=1, user_id=1, role="leader", created_at=datetime.utcnow()))
+            await db.commit()
+
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+        async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+            response = await client.get("/projects", headers=headers)
+        assert response.status_code == 200
+        assert [project["title"] for project in response.json()] == ["On the replica"]
+
+    asyncio.run(run())
+
+def test_read_only_session_refuses_writes(databases):
+    async def run():
+        async with ReadSessionLocal() as db:
+            add_user(db)
+            with pytest.raises(RuntimeError, match="read-only"):
+                await db.commit()
+        async with AsyncSession(get_read_engine()) as db:
+            assert (await db.execute(select(User))).scalars().all() == []
+
+    asyncio.run(run())
+
+def test_role_cache_miss_reads_from_the_primary(databases):
+    async def run():
+        # Created after the replica snapshot, so only the primary knows about it
+        async with AsyncSessionLocal() as db:
+            add_user(db)
+            db.add(Project(id=1, title="New", owner_id=1))
+            await db.commit()
+
+        async with ReadSessionLocal() as db:
+            assert await db.get(Project, 1) is None
+            assert await ProjectAccessIndex(100, 60).get_role(db, 1, 1) == "leader"
+
+    asyncio.run(run())
@@ -0,0 +1,14 @@
+from app.crud.search import START_MATCH, STOP_MATCH, _with_highlights
+
+def mark(word: str) -> str:
+    return f"{START_MATCH}{word}{STOP_MATCH}"
+
+def test_snippet_is_plain_text_with_match_offsets():
+    hit = _with_highlights({"snippet": f"{mark('zebra')} <img src=x onerror=alert(1)> and {mark('zebras')}..."})
+    assert hit["snippet"] == "zebra <img src=x onerror=alert(1)> and zebras..."
+    assert [hit["snippet"][start:end] for start, end in hit["highlights"]] == ["zebra", "zebras"]
+
+def test_unbalanced_markers_are_dropped():
+    hit = _with_highlights({"snippet": f"a{STOP_MATCH}b{START_MATCH}c"})
+    assert hit["snippet"] == "abc"
+    assert hit["highlights"] == []
@@ -9,8 +9,26 @@ const NotificationBell = () => {
 
   useEffect(() => {
     fetchUnreadCount()
-    const interval = setInterval(fetchUnreadCount, 30000) // Check every 30 seconds
-    return () => clearInterval(interval)
+
+    // Receive unread-count changes as server-sent events; fall back to polling if the stream fails
+    let interval = null
+    const token = localStorage.getItem('token')
+    const streamUrl = new URL('events/stream', api.defaults.baseURL)
+    streamUrl.searchParams.set('access_token', token || '')
+    const source = new EventSource(streamUrl)
+    source.addEventListener('unread_count', (event) => {
+      setUnreadCount(JSON.parse(event.data).count)
+    })
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED && !interval) {
+        interval = setInterval(fetchUnreadCount, 30000) // Check every 30 seconds
+      }
+    }
+
+    return () => {
+      source.close()
+      if (interval) clearInterval(interval)
+    }
   }, [])
 
   const fetchUnreadCount = async () => {
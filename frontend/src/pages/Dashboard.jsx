@@ -8,6 +8,8 @@ import NotificationBell from '../components/NotificationBell'
 const Dashboard = () => {
   const [projects, setProjects] = useState([])
   const [availableProjects, setAvailableProjects] = useState([])
+  const [availableCursor, setAvailableCursor] = useState(null)
+  const [loadingMoreAvailable, setLoadingMoreAvailable] = useState(false)
   const [showModal, setShowModal] = useState(false)
   const [showRequestModal, setShowRequestModal] = useState(false)
   const [showJoinModal, setShowJoinModal] = useState(false)
@@ -35,12 +37,17 @@ const Dashboard = () => {
     }
   }, [token])
 
-  const fetchAvailableProjects = async () => {
+  // Pages of 50; the X-Next-Cursor header points at the next page, if there is one
+  const fetchAvailableProjects = async (cursor = null) => {
     try {
-      const response = await api.get('/projects/available')
-      setAvailableProjects(response.data)
+      setLoadingMoreAvailable(Boolean(cursor))
+      const response = await api.get('/projects/available', { params: cursor ? { cursor } : {} })
+      setAvailableProjects(prev => (cursor ? [...prev, ...response.data] : response.data))
+      setAvailableCursor(response.headers['x-next-cursor'] || null)
     } catch (err) {
       console.error('Failed to fetch available projects:', err)
+    } finally {
+      setLoadingMoreAvailable(false)
     }
   }
 
@@ -267,7 +274,7 @@ const Dashboard = () => {
             className={`tab-button ${activeTab === 'available' ? 'active' : ''}`}
             onClick={() => setActiveTab('available')}
           >
-            Available Projects ({availableProjects.length})
+            Available Projects ({availableProjects.length}{availableCursor ? '+' : ''})
           </button>
         </div>
 
@@ -594,6 +601,19 @@ const Dashboard = () => {
           ))
           )}
         </div>
+
+        {activeTab === 'available' && availableCursor && (
+          <div style={{textAlign: 'center', marginTop: '20px'}}>
+            <button
+              className="btn btn-secondary"
+              onClick={() => fetchAvailableProjects(availableCursor)}
+              disabled={loadingMoreAvailable}
+              style={{width: 'auto', padding: '10px 24px'}}
+            >
+              {loadingMoreAvailable ? 'Loading...' : 'Load more projects'}
+            </button>
+          </div>
+        )}
       </div>
 
       {showModal && (
@@ -14,6 +14,8 @@ const KanbanBoard = () => {
   const [editingColumnName, setEditingColumnName] = useState('')
   const [selectedTask, setSelectedTask] = useState(null)
   const [comments, setComments] = useState([])
+  const [commentsCursor, setCommentsCursor] = useState(null)
+  const [loadingOlderComments, setLoadingOlderComments] = useState(false)
   const [newComment, setNewComment] = useState('')
   const [title, setTitle] = useState('')
   const [description, setDescription] = useState('')
@@ -50,7 +52,8 @@ const KanbanBoard = () => {
           status_id: Number(task.status_id),
           assigned_to: task.assigned_to ? Number(task.assigned_to) : null,
           assigned_user_name: task.assigned_user_name || null,
-          assigned_user_email: task.assigned_user_email || null
+          assigned_user_email: task.assigned_user_email || null,
+          comment_count: task.comment_count || 0
         }))
       }))
       
@@ -86,7 +89,6 @@ const KanbanBoard = () => {
     try {
       const response = await api.post('/statuses', {
         name: newColumnName,
-        position: crypto.randomUUID(),
         project_id: parseInt(projectId)
       })
       console.log('✅ Column created:', response.data)
@@ -258,16 +260,23 @@ const KanbanBoard = () => {
 
   const openCommentsModal = async (task) => {
     setSelectedTask(task)
+    setComments([])
+    setCommentsCursor(null)
     setShowCommentsModal(true)
     await fetchComments(task.id)
   }
 
-  const fetchComments = async (taskId) => {
+  // Newest first, 50 at a time; X-Next-Cursor points at the next, older page
+  const fetchComments = async (taskId, cursor = null) => {
     try {
-      const response = await api.get(`/tasks/${taskId}/comments`)
-      setComments(response.data)
+      setLoadingOlderComments(Boolean(cursor))
+      const response = await api.get(`/tasks/${taskId}/comments`, { params: cursor ? { cursor } : {} })
+      setComments(prev => (cursor ? [...prev, ...response.data] : response.data))
+      setCommentsCursor(response.headers['x-next-cursor'] || null)
     } catch (err) {
       console.error('Failed to fetch comments:', err)
+    } finally {
+      setLoadingOlderComments(false)
     }
   }
 
@@ -280,6 +289,10 @@ const KanbanBoard = () => {
         comment: newComment
       })
       setNewComment('')
+      setBoard(board.map(col => ({
+        ...col,
+        tasks: col.tasks.map(t => t.id === selectedTask.id ? { ...t, comment_count: (t.comment_count || 0) + 1 } : t)
+      })))
       await fetchComments(selectedTask.id)
     } catch (err) {
       console.error('Failed to add comment:', err)
@@ -419,7 +432,7 @@ const KanbanBoard = () => {
                             )}
                             
                             <div className="task-meta">
-                              <span className="comment-count">💬 Comments</span>
+                              <span className="comment-count">💬 {task.comment_count || 0} Comments</span>
                             </div>
                           </div>
                         )}
@@ -521,6 +534,17 @@ const KanbanBoard = () => {
                     </div>
                   ))
                 )}
+                {commentsCursor && (
+                  <button
+                    type="button"
+                    className="btn btn-secondary"
+                    onClick={() => fetchComments(selectedTask.id, commentsCursor)}
+                    disabled={loadingOlderComments}
+                    style={{width: '100%', marginTop: '8px'}}
+                  >
+                    {loadingOlderComments ? 'Loading...' : 'Load older comments'}
+                  </button>
+                )}
               </div>
 
               <form onSubmit={addComment} className="comment-form">